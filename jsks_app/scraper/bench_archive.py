@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+원본 HTML 보관소 벤치마크 - 쓰기 / 순차 읽기 / URL 하나 바로 읽기 (gzip vs zstd)
+
+    python3 bench_archive.py          # 가상 글 5,000개
+    python3 bench_archive.py 20000    # 글 수 지정
+
+testdata/posts/*.html을 서로 다른 URL로 반복해 보관소를 만들고 측정합니다.
+"""
+
+import glob
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from dhamma import archive as archive_module
+from dhamma.archive import HtmlArchive
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+RANDOM_READS = 1000
+
+
+def load_pages():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(TESTDATA_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench(path, pages, count):
+    urls = [f"http://www.dhamma.kr/wp/?p={i}" for i in range(count)]
+    raw_bytes = sum(len(pages[i % len(pages)]) for i in range(count))
+
+    started = time.perf_counter()
+    with HtmlArchive(path) as archive:
+        for i, url in enumerate(urls):
+            archive.append(url, pages[i % len(pages)])
+    write_seconds = time.perf_counter() - started
+
+    with HtmlArchive(path) as archive:
+        started = time.perf_counter()
+        streamed = sum(len(content) for _, content in archive.iter_records())
+        stream_seconds = time.perf_counter() - started
+        assert streamed == raw_bytes
+
+        sample = random.sample(urls, min(RANDOM_READS, count))
+        started = time.perf_counter()
+        for url in sample:
+            archive.get(url)
+        get_seconds = (time.perf_counter() - started) / len(sample)
+
+    size = os.path.getsize(path)
+    name = os.path.basename(path).split('.', 1)[1]
+    print(f"   {name:<9} 크기 {size / 1024 / 1024:6.1f}MB (원본의 {size / raw_bytes:5.1%}) | "
+          f"쓰기 {count / write_seconds:7.0f}개/초 | 순차 읽기 {raw_bytes / 1024 / 1024 / stream_seconds:6.0f}MB/s "
+          f"({count / stream_seconds:7.0f}개/초) | URL 읽기 {get_seconds * 1000:5.2f}ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    pages = load_pages()
+    raw_mb = sum(len(pages[i % len(pages)]) for i in range(count)) / 1024 / 1024
+    print(f"🧪 원본 보관소 벤치마크: 글 {count:,}개 (HTML {raw_mb:.0f}MB), URL 읽기 {RANDOM_READS}회 평균\n")
+
+    directory = tempfile.mkdtemp()
+    try:
+        names = ['posts.warc.gz'] + (['posts.warc.zst'] if archive_module.zstandard else [])
+        for name in names:
+            bench(os.path.join(directory, name), pages, count)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+중복 글 찾기 벤치마크 - 글 수에 따른 시간 / 후보 비교 수 / 재현율 (MinHash + LSH vs 모든 쌍 비교)
+
+    python3 bench_dedup.py                 # 글 5,000 / 10,000 / 20,000개
+    python3 bench_dedup.py 40000           # 글 수 지정
+
+texts/*.txt의 문장을 섞어 가상 글을 만들고, 그중 10%는 앞선 글을 문장부호 / 줄바꿈만
+바꿔 다시 올린 글로 만듭니다. 모든 쌍 비교는 글 2,000개에서 재서 늘려 잡습니다.
+"""
+
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+from dhamma.dedup import DuplicateIndex, minhash, similarity, THRESHOLD
+from dhamma.search import read_text_file
+
+TEXTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'texts')
+REPOST_RATIO = 0.1
+BRUTE_FORCE_SAMPLE = 2000
+
+
+def load_sentences():
+    sentences = []
+    for path in sorted(glob.glob(os.path.join(TEXTS_DIR, '*.txt'))):
+        sentences.extend(s.strip() for s in re.split(r'(?<=[.?!])\s+', read_text_file(path)['content']) if s.strip())
+    return sentences
+
+
+def make_posts(sentences, count, seed=0):
+    """가상 글 목록 + 다시 올린 글 URL → 원래 글 URL"""
+    rng = random.Random(seed)
+    posts = []
+    reposts = {}
+    for i in range(count):
+        url = f"http://www.dhamma.kr/wp/?p={i}"
+        if posts and rng.random() < REPOST_RATIO:
+            original = rng.choice(posts)
+            content = original['content'].replace('. ', '.\n').replace(',', ', ')
+            reposts[url] = reposts.get(original['url'], original['url'])
+        else:
+            content = ' '.join(rng.choice(sentences) for _ in range(rng.randint(10, 60)))
+        posts.append({'url': url, 'title': f"가상 글 {i}", 'content': content})
+    return posts, reposts
+
+
+def bench_lsh(posts, reposts):
+    started = time.perf_counter()
+    found = {}
+    with DuplicateIndex(':memory:') as index:
+        for post_data in posts:
+            canonical = index.check(post_data)
+            if canonical:
+                found[post_data['url']] = canonical['url']
+        compared = index.compared
+    seconds = time.perf_counter() - started
+
+    recall = sum(found.get(url) == original for url, original in reposts.items()) / max(1, len(reposts))
+    false = sum(url not in reposts for url in found)
+    pairs = len(posts) * (len(posts) - 1) // 2
+    print(f"   글 {len(posts):>6,}개 | {seconds:6.1f}초 ({len(posts) / seconds:5.0f}개/초) | "
+          f"후보 비교 {compared:>8,}회 (모든 쌍의 {compared / pairs:.4%}) | "
+          f"재현율 {recall:.1%} | 잘못 묶음 {false}개")
+
+
+def bench_brute_force(posts, total):
+    sample = posts[:BRUTE_FORCE_SAMPLE]
+    signatures = [minhash(post_data['content']) for post_data in sample]
+    started = time.perf_counter()
+    for i, signature in enumerate(signatures):
+        for other in signatures[:i]:
+            if similarity(signature, other) >= THRESHOLD:
+                break
+    seconds = time.perf_counter() - started
+    estimate = seconds * (total / len(sample)) ** 2
+    print(f"\n   모든 쌍 비교 (서명 계산 제외): 글 {len(sample):,}개 {seconds:.1f}초 → "
+          f"글 {total:,}개면 약 {estimate / 60:.0f}분")
+
+
+def main():
+    counts = [int(sys.argv[1])] if len(sys.argv) > 1 else [5000, 10000, 20000]
+    sentences = load_sentences()
+    print(f"🧪 중복 글 찾기 벤치마크: 다시 올린 글 {REPOST_RATIO:.0%}, 유사도 기준 {THRESHOLD}\n")
+    posts = reposts = None
+    for count in counts:
+        posts, reposts = make_posts(sentences, count)
+        bench_lsh(posts, reposts)
+    bench_brute_force(posts, counts[-1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+본문 문단 추출 벤치마크 (긴 경전 페이지) - 문단별 get_text() 2회 + decode_contents() vs 한 번 훑기
+
+    python3 bench_extract.py         # 문단 약 1,000개짜리 가상 경전 페이지
+    python3 bench_extract.py 3000    # 문단 수 지정
+
+testdata/posts/17762.html(잡아함 133)의 본문 문단을 반복해 긴 페이지를 만들고,
+이미 파싱된 트리에서 본문 추출만 따로 측정합니다.
+"""
+
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from dhamma import post_parser
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts', '17762.html')
+ROUNDS = 5
+
+
+def long_sutta_page(paragraph_count):
+    """17762.html의 본문 문단을 paragraph_count개가 되도록 반복한 HTML"""
+    with open(SAMPLE, encoding='utf-8') as f:
+        html = f.read()
+    paragraphs = re.findall(r'<p>.*?</p>', html, re.S)
+    body = '\n'.join(paragraphs[i % len(paragraphs)] for i in range(paragraph_count))
+    start = html.index('<div class="entry">') + len('<div class="entry">')
+    end = html.index('</div>', start)
+    return (html[:start] + '\n' + body + '\n' + html[end:]).encode('utf-8')
+
+
+def extract_twice(post_div):
+    """기존 방식: 문단마다 get_text를 두 번(필터 / 값) + decode_contents 한 번"""
+    paragraphs = post_div.find_all('p')
+    content_paragraphs = paragraphs[1:-1] if len(paragraphs) > 2 else paragraphs
+    content_text = '\n\n'.join([p.get_text(strip=True) for p in content_paragraphs if p.get_text(strip=True)])
+    content_html = '\n'.join([f'<p>{p.decode_contents()}</p>' for p in content_paragraphs if p.get_text(strip=True)])
+    return content_text, content_html
+
+
+def extract_single_pass(post_div):
+    """post_parser: post div를 한 번 훑어 텍스트 + HTML을 같이"""
+    record = post_parser._post_record('', '', post_parser._soup_paragraphs(post_div), '')
+    return record['content'], record['content_html']
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = func(*args)
+    return (time.perf_counter() - started) / ROUNDS, result
+
+
+def main():
+    paragraph_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    content = long_sutta_page(paragraph_count)
+    print(f"🧪 본문 추출 벤치마크: 문단 {paragraph_count:,}개 ({len(content) / 1024:.0f}KB), {ROUNDS}회 평균\n")
+
+    post_div = BeautifulSoup(content, 'html.parser').find('div', class_='post')
+
+    twice, (text_a, _) = timed(extract_twice, post_div)
+    single, (text_b, _) = timed(extract_single_pass, post_div)
+    assert text_a == text_b, "두 방식의 텍스트가 다릅니다"
+    print("   [추출만, 같은 BeautifulSoup 트리]")
+    print(f"   get_text×2 + decode_contents {twice * 1000:8.1f}ms")
+    print(f"   한 번 훑기                    {single * 1000:8.1f}ms | {twice / single:4.1f}배")
+
+    print("\n   [파싱 + 추출 전체]")
+    for backend in post_parser.available_backends():
+        seconds, _ = timed(post_parser.parse_post, 'http://www.dhamma.kr/wp/?p=17762', content, backend)
+        print(f"   {backend:<12} {seconds * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
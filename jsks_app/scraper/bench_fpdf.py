@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+빠른 PDF 처리량 벤치마크 - WeasyPrint(PdfRenderer) vs fpdf2(FastPdfRenderer), 프로세스 1개
+
+    python3 bench_fpdf.py                # texts/ 폴더의 글 50개로 측정
+    python3 bench_fpdf.py posts/ 200     # 저장된 글(JSON) 200개로 측정
+
+    fpdf       FastPdfRenderer: 글마다 새 문서 + add_font()
+    weasyprint PdfRenderer: 스타일시트 / 폰트를 미리 준비한 WeasyPrint (설치돼 있을 때만)
+
+WeasyPrint를 불러올 수 없으면 fpdf만 측정합니다 (비교 배수는 출력하지 않음).
+
+처리량은 워커 1개 기준이고, RenderEngine은 워커(프로세스) 수만큼 늘어납니다.
+"""
+
+import html
+import os
+import sys
+import tempfile
+import time
+
+from dhamma.fast_pdf import FastPdfRenderer
+from dhamma.records import load_post_records
+from dhamma.render_engine import PdfRenderer
+from dhamma.search import read_text_file
+
+TEXTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "texts")
+
+
+def load_posts(source, count):
+    if any(n.endswith('.json') for n in os.listdir(source)):
+        posts = list(load_post_records(source))
+    else:
+        posts = []
+        for name in sorted(os.listdir(source)):
+            if name.endswith('.txt'):
+                post_data = read_text_file(os.path.join(source, name))
+                paragraphs = [p.strip() for p in post_data['content'].split('\n\n') if p.strip()]
+                post_data['content_html'] = '\n'.join(f'<p>{html.escape(p)}</p>' for p in paragraphs)
+                posts.append(post_data)
+    return posts[:count]
+
+
+def measure(label, render, posts, output_dir):
+    # 첫 문서는 초기화 비용(폰트 파싱 등)이 섞이므로 측정에서 제외
+    render(posts[0], os.path.join(output_dir, 'warmup.pdf'))
+
+    started = time.perf_counter()
+    for i, post_data in enumerate(posts):
+        render(post_data, os.path.join(output_dir, f'{label}-{i}.pdf'))
+    seconds = time.perf_counter() - started
+
+    print(f"   {label:<10} 문서당 {seconds / len(posts) * 1000:7.1f}ms | 초당 {len(posts) / seconds:6.1f}개")
+    return seconds / len(posts)
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else TEXTS_DIR
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    posts = load_posts(source, count)
+    if not posts:
+        print(f"❌ {source}에서 글을 찾을 수 없습니다.")
+        return
+
+    print(f"🧪 PDF 처리량 벤치마크: 글 {len(posts)}개 ({source})\n")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        fast = measure('fpdf', FastPdfRenderer().render, posts, output_dir)
+        try:
+            weasyprint = measure('weasyprint', PdfRenderer().render, posts, output_dir)
+        except (ImportError, OSError) as e:
+            # WeasyPrint 또는 시스템 라이브러리(Pango)가 없음
+            print(f"   weasyprint 측정 불가: {e}")
+            weasyprint = None
+
+    if weasyprint:
+        print(f"\n✨ WeasyPrint 대비 문서당 {(weasyprint - fast) * 1000:.1f}ms ({weasyprint / fast:.2f}배)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+글 링크 중복 제거 벤치마크 - 리스트 `in` 검사(O(n²)) vs LinkIndex(O(n))
+
+    python3 bench_links.py           # 가상 링크 100,000개
+    python3 bench_links.py 200000
+"""
+
+import random
+import sys
+import time
+
+from dhamma.link_index import LinkIndex
+
+# 리스트 방식은 O(n²)이라 이 크기까지만 직접 측정하고 나머지는 추정
+LIST_SIZES = (5000, 10000, 20000)
+
+
+def synthetic_links(count, seed=17762):
+    """가상 글 링크: 같은 글이 http/https, www, 끝 슬래시, 추가 쿼리로 섞여 20% 정도 중복"""
+    rng = random.Random(seed)
+    variants = (
+        "http://www.dhamma.kr/wp/?p={}",
+        "https://www.dhamma.kr/wp/?p={}",
+        "http://dhamma.kr/wp/?p={}",
+        "http://www.dhamma.kr/wp?p={}",
+        "http://www.dhamma.kr/wp/?p={}&replytocom=1#comments",
+    )
+    unique = int(count * 0.8)
+    links = []
+    for i in range(count):
+        number = i if i < unique else rng.randrange(unique)
+        links.append(rng.choice(variants).format(number))
+    rng.shuffle(links)
+    return links
+
+
+def dedup_list(links):
+    """기존 방식: 리스트에 `not in` 검사 (정규화 없음)"""
+    post_links = []
+    for href in links:
+        if href not in post_links:
+            post_links.append(href)
+    return post_links
+
+
+def dedup_index(links):
+    index = LinkIndex()
+    for href in links:
+        index.add(href)
+    return index.urls()
+
+
+def timed(func, links):
+    started = time.perf_counter()
+    result = func(links)
+    return time.perf_counter() - started, len(result)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    links = synthetic_links(count)
+
+    print(f"🧪 링크 중복 제거 벤치마크: 가상 링크 {count:,}개\n")
+
+    seconds, kept = timed(dedup_index, links)
+    print(f"   LinkIndex   {count:>8,}개 → {kept:>7,}개 남음 | {seconds * 1000:9.1f}ms")
+
+    list_seconds = None
+    for size in LIST_SIZES:
+        if size > count:
+            break
+        list_seconds, kept = timed(dedup_list, links[:size])
+        print(f"   list `in`   {size:>8,}개 → {kept:>7,}개 남음 | {list_seconds * 1000:9.1f}ms")
+
+    if list_seconds:
+        # O(n²): 크기가 k배면 시간은 k²배
+        estimate = list_seconds * (count / size) ** 2
+        print(f"\n   list `in` {count:,}개 추정: 약 {estimate:.0f}초 (정규화 없이 URL 변형은 중복으로 못 잡음)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+렌더링 메모리 벤치마크 - 가장 긴 글들을 렌더링할 때 워커 1개의 최대 메모리(peak RSS)
+
+    python3 bench_memory.py                # texts/에서 가장 긴 글 10개 + 모든 글을 이은 모음 글(2MB)
+    python3 bench_memory.py posts/ 20      # 저장된 글(JSON) 중 가장 긴 글 20개
+
+    string  예전 방식: 글 데이터 dict를 워커로 보내고 build_html 문자열 → HTML(string=...)
+    stream  지금 방식: 부모가 HTML을 임시 파일에 흘려 쓰고 워커에는 경로만 (RenderEngine)
+
+방식마다 새 워커 프로세스 1개에서 재고, WeasyPrint / 폰트 준비까지 끝낸 뒤의 메모리를
+기준으로 렌더링이 늘린 양도 같이 출력합니다. 워커당 메모리로 호스트에 띄울 워커 수를 정합니다.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import html
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from dhamma.records import load_post_records
+from dhamma.render_engine import PdfRenderer, build_html, peak_rss_mb, write_html
+from dhamma.search import read_text_file
+
+TEXTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "texts")
+# 모음 글 크기 (모든 글 본문을 이만큼 될 때까지 반복해서 이어 붙임)
+COMPILATION_BYTES = 2 * 1024 * 1024
+
+# 워커 프로세스의 렌더러 (방식마다 새 프로세스)
+_renderer = None
+
+
+def load_posts(source):
+    if any(n.endswith('.json') for n in os.listdir(source)):
+        return list(load_post_records(source))
+    posts = []
+    for name in sorted(os.listdir(source)):
+        if name.endswith('.txt'):
+            post_data = read_text_file(os.path.join(source, name))
+            paragraphs = [p.strip() for p in post_data['content'].split('\n\n') if p.strip()]
+            post_data['content_html'] = '\n'.join(f'<p>{html.escape(p)}</p>' for p in paragraphs)
+            posts.append(post_data)
+    return posts
+
+
+def compilation(posts):
+    """모든 글 본문을 이어 붙인 긴 모음 글 (여러 경전을 모은 글 흉내, 약 COMPILATION_BYTES)"""
+    body = '\n'.join(post_data['content_html'] for post_data in posts)
+    repeat = max(1, COMPILATION_BYTES // max(1, len(body.encode('utf-8'))))
+    return {'title': '모음', 'date': '', 'url': '', 'content': '', 'content_html': '\n'.join([body] * repeat)}
+
+
+def _init():
+    global _renderer
+    _renderer = PdfRenderer()
+
+
+def _baseline():
+    return peak_rss_mb()
+
+
+def _render_string(post_data, filepath):
+    from weasyprint import HTML
+
+    HTML(string=build_html(post_data)).write_pdf(filepath, stylesheets=[_renderer.stylesheet],
+                                                 font_config=_renderer.font_config)
+    return peak_rss_mb()
+
+
+def _render_file(html_path, filepath):
+    _renderer.render_file(html_path, filepath)
+    return peak_rss_mb()
+
+
+def measure(label, posts, output_dir):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init) as executor:
+        baseline = executor.submit(_baseline).result()
+        started = time.perf_counter()
+        peak = baseline
+        for i, post_data in enumerate(posts):
+            filepath = os.path.join(output_dir, f'{label}-{i}.pdf')
+            if label == 'string':
+                peak = executor.submit(_render_string, post_data, filepath).result()
+            else:
+                html_path = os.path.join(output_dir, f'{label}-{i}.html')
+                with open(html_path, 'w', encoding='utf-8') as f:
+                    write_html(f, post_data)
+                peak = executor.submit(_render_file, html_path, filepath).result()
+                os.remove(html_path)
+        seconds = time.perf_counter() - started
+
+    print(f"   {label:<7} peak RSS {peak:7.1f}MB (렌더링으로 +{peak - baseline:6.1f}MB) | "
+          f"문서당 {seconds / len(posts) * 1000:7.1f}ms")
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else TEXTS_DIR
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    if peak_rss_mb() is None:
+        print("❌ 이 플랫폼에서는 peak RSS를 잴 수 없습니다 (resource 모듈 없음)")
+        return
+
+    posts = load_posts(source)
+    if not posts:
+        print(f"❌ {source}에서 글을 찾을 수 없습니다.")
+        return
+    largest = sorted(posts, key=lambda post_data: len(post_data['content_html']), reverse=True)[:count]
+    combined = compilation(posts)
+
+    for name, sample in ((f"가장 긴 글 {len(largest)}개", largest), ("모음 글 1개", [combined])):
+        size = sum(len(post_data['content_html'].encode('utf-8')) for post_data in sample) / 1024
+        print(f"\n🧪 {name} (본문 HTML {size:,.0f}KB)")
+        with tempfile.TemporaryDirectory() as output_dir:
+            measure('string', sample, output_dir)
+            measure('stream', sample, output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+글 파싱 처리량 벤치마크 - 백엔드별 (html.parser / strainer / lxml)
+
+    python3 bench_parse.py                 # testdata/posts/*.html 각각 200회
+    python3 bench_parse.py 500             # 각각 500회
+    python3 bench_parse.py 200 saved_html/ # 다른 폴더의 저장된 글 HTML
+"""
+
+import glob
+import os
+import sys
+import time
+
+from dhamma.post_parser import available_backends, parse_post
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+
+def load_pages(html_dir):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(html_dir, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append((f"http://www.dhamma.kr/wp/?p={os.path.basename(path)[:-5]}", f.read()))
+    return pages
+
+
+def bench(backend, pages, rounds):
+    """rounds번 반복 파싱 → 초당 글 수"""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for url, content in pages:
+            parse_post(url, content, backend)
+    elapsed = time.perf_counter() - started
+    return rounds * len(pages) / elapsed
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    html_dir = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DIR
+    pages = load_pages(html_dir)
+    if not pages:
+        print(f"❌ HTML 파일이 없습니다: {html_dir}")
+        return
+
+    total_kb = sum(len(content) for _, content in pages) / 1024
+    print(f"🧪 글 파싱 벤치마크: 글 {len(pages)}개 ({total_kb:.0f}KB) × {rounds}회\n")
+
+    baseline = None
+    for backend in available_backends():
+        rate = bench(backend, pages, rounds)
+        baseline = baseline or rate
+        print(f"   {backend:<12} {rate:8.0f}개/초 | html.parser 대비 {rate / baseline:4.1f}배")
+
+
+if __name__ == "__main__":
+    main()
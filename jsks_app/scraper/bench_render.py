@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+PDF 렌더링 마이크로벤치마크 - 문서마다 <style> 삽입 vs 미리 파싱한 스타일시트 재사용
+
+    python3 bench_render.py              # texts/ 폴더의 글 20개로 측정
+    python3 bench_render.py posts/ 50    # 저장된 글(JSON) 50개로 측정
+"""
+
+import html
+import os
+import sys
+import tempfile
+import time
+
+from dhamma.records import load_post_records
+from dhamma.render_engine import PdfRenderer, STYLESHEET, FONT_PATH, build_html
+
+TEXTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "texts")
+
+
+def post_from_text_file(filepath):
+    """save_as_text로 저장된 TXT → 글 데이터 (벤치마크용)"""
+    with open(filepath, encoding='utf-8') as f:
+        header, _, body = f.read().partition("=" * 80)
+
+    fields = dict(line.split(': ', 1) for line in header.strip().splitlines() if ': ' in line)
+    paragraphs = [p.strip() for p in body.split('\n\n') if p.strip()]
+    return {
+        'title': fields.get('제목', '제목 없음'),
+        'date': fields.get('날짜', ''),
+        'url': fields.get('URL', ''),
+        'content_html': '\n'.join(f'<p>{html.escape(p)}</p>' for p in paragraphs),
+    }
+
+
+def load_sample_posts(source, count):
+    if any(n.endswith('.json') for n in os.listdir(source)):
+        posts = list(load_post_records(source))
+    else:
+        names = sorted(n for n in os.listdir(source) if n.endswith('.txt'))
+        posts = [post_from_text_file(os.path.join(source, n)) for n in names]
+    return posts[:count]
+
+
+def render_inline(post_data, filepath):
+    """기존 방식: 문서마다 <style>(@font-face 포함)을 넣고 매번 새로 파싱"""
+    from weasyprint import HTML
+
+    document = build_html(post_data).replace(
+        '</head>',
+        f'<style>{STYLESHEET.format(font_path=FONT_PATH)}</style>\n</head>',
+    )
+    HTML(string=document).write_pdf(filepath)
+
+
+def measure(label, render, posts, output_dir):
+    # 첫 문서는 WeasyPrint 초기화 비용이 섞이므로 측정에서 제외
+    render(posts[0], os.path.join(output_dir, 'warmup.pdf'))
+
+    started = time.perf_counter()
+    for i, post_data in enumerate(posts):
+        render(post_data, os.path.join(output_dir, f'{label}-{i}.pdf'))
+    per_doc = (time.perf_counter() - started) / len(posts)
+
+    print(f"   {label:<8} 문서당 {per_doc * 1000:7.1f}ms")
+    return per_doc
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else TEXTS_DIR
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    posts = load_sample_posts(source, count)
+    if not posts:
+        print(f"❌ {source}에서 글을 찾을 수 없습니다.")
+        return
+
+    print(f"🧪 렌더링 벤치마크: 글 {len(posts)}개 ({source})\n")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        before = measure('before', render_inline, posts, output_dir)
+
+        renderer = PdfRenderer()
+        after = measure('after', renderer.render, posts, output_dir)
+
+    print(f"\n✨ 문서당 {(before - after) * 1000:.1f}ms 절약 ({before / after:.2f}배)")
+
+
+if __name__ == "__main__":
+    main()
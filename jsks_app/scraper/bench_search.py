@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+전문 검색 색인 벤치마크 - 색인 속도 / 크기 / 검색어별 응답 시간
+
+    python3 bench_search.py          # 가상 글 5,000개
+    python3 bench_search.py 20000    # 글 수 지정
+
+texts/*.txt의 문장을 섞어 서로 다른 가상 글을 만들고, 색인을 만든 뒤
+바뀐 글 1%만 다시 색인하는 증분 색인과 검색 응답 시간을 측정합니다.
+"""
+
+import glob
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from dhamma.search import SearchIndex, read_text_file
+
+TEXTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'texts')
+QUERIES = ['부처님', '"이와 같이 나는 들었다"', '자비 마음', '무상 OR 무아', '비구 -세존', '법', '열반에 이르는 길']
+REPEAT = 20
+
+
+def load_sentences():
+    sentences = []
+    for path in sorted(glob.glob(os.path.join(TEXTS_DIR, '*.txt'))):
+        sentences.extend(s.strip() for s in re.split(r'(?<=[.?!])\s+', read_text_file(path)['content']) if s.strip())
+    return sentences
+
+
+def make_posts(sentences, count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {'url': f"http://www.dhamma.kr/wp/?p={i}", 'title': f"가상 글 {i}",
+               'content': ' '.join(rng.choice(sentences) for _ in range(rng.randint(10, 60)))}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    sentences = load_sentences()
+    posts = list(make_posts(sentences, count))
+    raw_mb = sum(len(post_data['content'].encode('utf-8')) for post_data in posts) / 1024 / 1024
+    print(f"🧪 검색 색인 벤치마크: 글 {count:,}개 (본문 {raw_mb:.1f}MB), 검색어별 {REPEAT}회 평균\n")
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'index.db')
+    try:
+        started = time.perf_counter()
+        with SearchIndex(path) as index:
+            for post_data in posts:
+                index.add(post_data['url'], post_data)
+        seconds = time.perf_counter() - started
+        print(f"   색인       {count / seconds:7.0f}개/초 | 파일 {os.path.getsize(path) / 1024 / 1024:.1f}MB")
+
+        changed = list(make_posts(sentences, count // 100, seed=1))
+        started = time.perf_counter()
+        with SearchIndex(path) as index:
+            for post_data in posts:
+                index.add(post_data['url'], post_data)
+            for post_data in changed:
+                index.add(post_data['url'], post_data)
+        print(f"   증분 색인  바뀐 글 {len(changed)}개 / 전체 {count:,}개 {time.perf_counter() - started:.1f}초")
+
+        with SearchIndex(path) as index:
+            index.compact()
+            print(f"   합친 뒤   파일 {os.path.getsize(path) / 1024 / 1024:.1f}MB\n")
+            for query in QUERIES:
+                hits = index.search(query)
+                started = time.perf_counter()
+                for _ in range(REPEAT):
+                    index.search(query)
+                elapsed = (time.perf_counter() - started) / REPEAT
+                print(f"   {query:<24} {elapsed * 1000:6.1f}ms  (상위 {len(hits)}개)")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+Dhamma.kr 크롤러 패키지 - 목록 수집 / 본문 다운로드 / 파싱 / 저장 엔진과 CLI
+
+    python3 -m dhamma --help
+"""
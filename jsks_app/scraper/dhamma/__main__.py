@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""python3 -m dhamma ... → CLI 실행"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 원본 HTML 보관소 - 추가 전용(append-only) WARC 형식 파일 + 오프셋 색인
+
+받은 글 HTML을 WARC/1.1 레코드로 만들어 파일 끝에 붙입니다. 받은 응답이 있으면 실제 응답 코드 /
+헤더를 담은 response 레코드, 응답 없이 본문만 있으면(304 뒤 캐시 본문 등) resource 레코드입니다. 레코드마다
+따로 압축하므로(gzip 멤버 / zstd 프레임) 파일 전체는 일반 .warc.gz / .warc.zst와
+같고, 색인의 오프셋으로 레코드 하나만 바로 읽을 수 있습니다.
+
+    raw/posts.warc.gz       레코드 (gzip, 표준 라이브러리)
+    raw/posts.warc.zst      레코드 (zstd, pip3 install zstandard)
+    raw/posts.warc.gz.idx   색인: URL 해시 → (오프셋, 길이), 해시 순 정렬
+
+색인은 mmap으로 열어 이진 탐색하므로 글 수와 관계없이 메모리를 거의 쓰지 않습니다.
+이번 실행에서 추가한 레코드는 메모리에 두었다가 close()에서 색인에 합칩니다.
+중간에 종료돼 색인이 파일 끝까지 닿지 않으면, 다음에 열 때 남은 레코드를 읽어
+색인을 복구하고 잘린 마지막 레코드는 잘라냅니다.
+
+파서 / 템플릿을 바꾼 뒤에는 iter_records()로 파일을 처음부터 순서대로 읽어
+재크롤링 없이 다시 파싱할 수 있습니다.
+"""
+
+from datetime import datetime, timezone
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import uuid
+import zlib
+
+from .link_index import normalize_url
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 압축 해제 오류 (파일 끝의 쓰다 만 레코드)
+_DECOMPRESS_ERRORS = (zlib.error, zstandard.ZstdError) if zstandard else (zlib.error,)
+
+# 색인 헤더: 매직, 버전, 예약, 색인이 반영한 데이터 파일 크기, 항목 수
+_HEADER = struct.Struct('<4sHHQQ')
+_MAGIC = b'DHIX'
+_VERSION = 1
+
+# 색인 항목: URL 해시, 오프셋, 압축 레코드 길이
+_ENTRY = struct.Struct('<QQI4x')
+
+# 색인 복구 시 읽기 단위 (레코드 경계를 찾을 때 남은 데이터가 복사되므로 작게)
+SCAN_CHUNK = 64 * 1024
+
+
+def url_key(url):
+    """색인 키: 정규화 URL의 64비트 해시 (같은 글의 다른 URL 형태도 같은 키)"""
+    digest = hashlib.blake2b(normalize_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+# 저장하는 본문은 requests가 압축을 푼 것이므로 원래 전송 방식 / 길이 헤더는 빼고 길이를 다시 씀
+_TRANSFER_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+
+
+def build_record(url, content, response=None):
+    """WARC/1.1 레코드 (압축 전)
+
+    response(requests.Response 등 status_code / reason / headers)가 있으면 실제 응답 코드와
+    헤더를 담은 response 레코드, 없으면 본문만 담은 resource 레코드입니다.
+    """
+    if response is not None:
+        block = f"HTTP/1.1 {response.status_code} {response.reason or ''}".rstrip().encode('latin-1', 'replace')
+        block += b'\r\n'
+        for name, value in response.headers.items():
+            if name.lower() not in _TRANSFER_HEADERS:
+                block += f"{name}: {value}\r\n".encode('latin-1', 'replace')
+        block += f"Content-Length: {len(content)}\r\n\r\n".encode('ascii') + content
+        record_type, content_type = 'response', 'application/http; msgtype=response'
+    else:
+        block = content
+        record_type, content_type = 'resource', 'text/html; charset=UTF-8'
+
+    warc = (
+        "WARC/1.1\r\n"
+        f"WARC-Type: {record_type}\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(block)}\r\n"
+        "\r\n"
+    ).encode('utf-8')
+    return warc + block + b'\r\n\r\n'
+
+
+def parse_http(data):
+    """WARC 레코드 → (URL, 응답 코드 또는 None, 헤더 dict, 본문 bytes)
+
+    resource 레코드(응답 없이 저장한 본문)는 응답 코드 None, 헤더 {}입니다.
+    """
+    head, _, rest = data.partition(b'\r\n\r\n')
+    fields = {}
+    for line in head.decode('utf-8').split('\r\n')[1:]:
+        name, _, value = line.partition(': ')
+        fields[name] = value
+    block = rest[:int(fields['Content-Length'])]
+    if fields.get('WARC-Type') != 'response':
+        return fields['WARC-Target-URI'], None, {}, block
+
+    http, _, body = block.partition(b'\r\n\r\n')
+    status_line, *lines = http.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(': ')
+        headers[name] = value
+    return fields['WARC-Target-URI'], int(status_line.split()[1]), headers, body
+
+
+def parse_record(data):
+    """WARC 레코드 → (URL, 본문 bytes)"""
+    url, _, _, body = parse_http(data)
+    return url, body
+
+
+class HtmlArchive:
+    """원본 HTML 보관소 (여러 워커 스레드에서 공유, with로 사용)"""
+
+    def __init__(self, path, level=None):
+        self.path = path
+        self.index_path = path + '.idx'
+        self.zstd = path.endswith('.zst')
+        if self.zstd and zstandard is None:
+            raise RuntimeError("zstandard가 설치되어 있지 않습니다: pip3 install zstandard (또는 .warc.gz 사용)")
+        self.level = level if level is not None else (3 if self.zstd else 6)
+        self.appended = 0
+        self._lock = threading.Lock()
+        self._pending = {}    # 이번 실행에서 추가: 키 → (오프셋, 길이)
+        self._map = None
+        self._count = 0
+        self._local = threading.local()   # 스레드별 zstd 압축 / 해제 컨텍스트 (재사용)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'ab')
+        self._reader = os.open(path, os.O_RDONLY)
+        self._open_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- 압축 ---
+
+    def _zstd(self):
+        if not hasattr(self._local, 'compressor'):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local
+
+    def _compress(self, data):
+        if self.zstd:
+            return self._zstd().compressor.compress(data)
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)  # gzip 멤버 1개
+        return compressor.compress(data) + compressor.flush()
+
+    def _decompressobj(self):
+        if self.zstd:
+            return zstandard.ZstdDecompressor().decompressobj()
+        return zlib.decompressobj(31)
+
+    def _decompress(self, data):
+        if self.zstd:
+            # 프레임 헤더에 원본 크기가 있으므로 한 번에 해제
+            return self._zstd().decompressor.decompress(data)
+        return zlib.decompress(data, 31)
+
+    # --- 색인 ---
+
+    def _open_index(self):
+        """색인 mmap + 색인 뒤에 추가된 레코드 복구"""
+        data_size = os.path.getsize(self.path)
+        indexed_size = 0
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as f:
+                header = f.read(_HEADER.size)
+            if len(header) == _HEADER.size:
+                magic, version, _, indexed_size, _ = _HEADER.unpack(header)
+                if magic != _MAGIC or version != _VERSION or indexed_size > data_size:
+                    indexed_size = 0
+            if indexed_size:
+                self._map_index()
+
+        if indexed_size < data_size:
+            self._recover(indexed_size, data_size)
+
+    def _map_index(self):
+        if self._map is not None:
+            self._map.close()
+        with open(self.index_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = _HEADER.unpack_from(self._map)[4]
+
+    def _recover(self, start, data_size):
+        """색인에 없는 레코드를 읽어 색인에 추가, 잘린 마지막 레코드는 삭제"""
+        end = start
+        recovered = 0
+        for offset, length, data in self._scan(start):
+            self._pending[url_key(parse_record(data)[0])] = (offset, length)
+            end = offset + length
+            recovered += 1
+
+        if end < data_size:
+            print(f"⚠️  원본 보관소 끝의 잘린 레코드 삭제 ({data_size - end}바이트)")
+            self._file.truncate(end)
+            self._file.seek(end)
+        if recovered:
+            print(f"♻️  원본 보관소 색인 복구: 레코드 {recovered}개")
+            self.flush_index()
+
+    def _entries(self):
+        """현재 색인 항목 (키 순서, _lock을 잡은 상태 또는 단일 스레드에서 호출)"""
+        for i in range(self._count):
+            yield _ENTRY.unpack_from(self._map, _HEADER.size + i * _ENTRY.size)
+
+    def _find(self, key):
+        """mmap 색인 이진 탐색 → (오프셋, 길이) 또는 None (_lock을 잡은 상태에서 호출)"""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (mid_key,) = struct.unpack_from('<Q', self._map, _HEADER.size + mid * _ENTRY.size)
+            if mid_key < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            found_key, offset, length = _ENTRY.unpack_from(self._map, _HEADER.size + lo * _ENTRY.size)
+            if found_key == key:
+                return offset, length
+        return None
+
+    def flush_index(self):
+        """이번 실행에서 추가한 레코드를 색인 파일에 합침 (같은 글은 마지막 레코드)"""
+        with self._lock:
+            self._file.flush()
+            if not self._pending and self._map is not None:
+                return
+
+            entries = {key: (offset, length) for key, offset, length in self._entries()} if self._map else {}
+            entries.update(self._pending)
+
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, 0, self._file.tell(), len(entries)))
+                for key in sorted(entries):
+                    f.write(_ENTRY.pack(key, *entries[key]))
+            os.replace(tmp_path, self.index_path)
+
+            self._map_index()
+            self._pending.clear()
+
+    def close(self):
+        self.flush_index()
+        self._file.close()
+        os.close(self._reader)
+        if self._map is not None:
+            self._map.close()
+
+    # --- 쓰기 / 읽기 ---
+
+    def append(self, url, content, response=None):
+        """글 HTML 1개를 파일 끝에 추가 → 오프셋 (response가 있으면 응답 코드 / 헤더도 저장)"""
+        data = self._compress(build_record(url, content, response))
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(data)
+            self._file.flush()
+            self._pending[url_key(url)] = (offset, len(data))
+            self.appended += 1
+        return offset
+
+    def locate(self, url):
+        """URL → (오프셋, 길이) 또는 None"""
+        key = url_key(url)
+        # flush_index가 mmap을 다시 만들 수 있으므로 색인 탐색도 잠금 안에서
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            return self._find(key) if self._map is not None else None
+
+    def get(self, url):
+        """URL의 가장 최근 HTML (없으면 None)"""
+        location = self.locate(url)
+        if location is None:
+            return None
+        offset, length = location
+        record_url, content = parse_record(self._decompress(os.pread(self._reader, length, offset)))
+        # 해시 충돌이면 다른 글의 레코드이므로 없는 것으로 처리
+        if normalize_url(record_url) != normalize_url(url):
+            return None
+        return content
+
+    def __contains__(self, url):
+        return self.locate(url) is not None
+
+    def __len__(self):
+        with self._lock:
+            pending = [key for key in self._pending if self._map is None or self._find(key) is None]
+        return self._count + len(pending)
+
+    def _scan(self, start=0):
+        """start부터 순서대로 (오프셋, 압축 길이, 레코드) - 잘린 마지막 레코드는 제외"""
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            buffer = b''
+            while True:
+                if not buffer:
+                    buffer = f.read(SCAN_CHUNK)
+                    if not buffer:
+                        return
+
+                decompressor = self._decompressobj()
+                parts = []
+                consumed = 0
+                while True:
+                    try:
+                        parts.append(decompressor.decompress(buffer))
+                    except _DECOMPRESS_ERRORS:
+                        return
+                    if decompressor.eof:
+                        consumed += len(buffer) - len(decompressor.unused_data)
+                        buffer = decompressor.unused_data
+                        break
+                    consumed += len(buffer)
+                    buffer = f.read(SCAN_CHUNK)
+                    if not buffer:
+                        return
+
+                yield offset, consumed, b''.join(parts)
+                offset += consumed
+
+    def iter_records(self, latest_only=True):
+        """파일을 처음부터 순서대로 읽어 (URL, HTML) - 디스크 순차 읽기 속도
+
+        latest_only=True면 색인의 레코드만 오프셋 순서로 읽고, 같은 글의 예전
+        레코드(다시 받기 전 버전)는 건너뜁니다. False면 모든 레코드를 읽습니다.
+        """
+        if not latest_only:
+            for _, _, data in self._scan():
+                yield parse_record(data)
+            return
+
+        self.flush_index()
+        with self._lock:
+            locations = sorted((offset, length) for _, offset, length in self._entries())
+        with open(self.path, 'rb') as f:
+            for offset, length in locations:
+                if f.tell() != offset:
+                    f.seek(offset)
+                yield parse_record(self._decompress(f.read(length)))
+
+    def print_stats(self):
+        """보관소 크기 출력"""
+        size = os.path.getsize(self.path)
+        print(f"\n🗄️  원본 보관소: 글 {len(self)}개 | {size / 1024 / 1024:.1f}MB | 이번 실행 추가 {self.appended}개")
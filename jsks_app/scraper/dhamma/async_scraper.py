@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 비동기 크롤러 - asyncio + aiohttp, 스레드 없이 프로세스 하나에서 수백 개 동시 요청
+
+- 동시 요청 수는 세마포어(CONCURRENCY), 서버 부하는 토큰 버킷(RPS, BURST)으로 제어
+- 토큰 버킷 속도는 동기 크롤러와 같은 조절기(AdaptiveRateLimiter)가 응답을 보고 올리고 내림
+- metrics(Metrics)가 있으면 동기 크롤러와 같은 이름으로 요청 / fetch·parse·write 스테이지 지표를 남김
+- 목록 파싱(parse_listing_page) / 글 파싱(parse_post)은 동기 크롤러와 같은 함수를 사용하므로
+  글 데이터가 동일합니다 → 같은 출력 형식 플러그인(outputs)에 그대로 넘길 수 있음
+
+    python3 -m dhamma fetch --async                 # TXT (texts/)
+    python3 -m dhamma fetch --async --format pdf    # PDF (pdfs/, 렌더링은 프로세스 풀)
+    python3 -m dhamma fetch --async --pages 10      # 앞 10페이지만
+
+aiohttp는 선택 패키지입니다: pip3 install aiohttp
+"""
+
+import asyncio
+import random
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .http_client import DEFAULT_RETRIES, DEFAULT_BACKOFF, DEFAULT_TIMEOUT, RETRY_STATUSES, USER_AGENT
+from .link_index import LinkIndex
+from .listing_crawler import is_listing_end, last_page_search, page_url, parse_listing_page
+from .post_parser import parse_post
+from .rate_control import AdaptiveRateLimiter
+from .records import save_post_record
+from .settings import MAX_PAGES
+
+# 동시에 열어둘 요청 수 / 서버 부하 예산 (초당 요청 수, 순간 허용량)
+CONCURRENCY = 200
+RPS = 5.0
+BURST = 10
+
+# 동시에 진행할 저장 작업 수 (렌더링이 느려도 글 데이터가 메모리에 쌓이지 않도록)
+MAX_WRITES = 64
+
+# Retry-After 최대 대기 (http_client와 동일)
+MAX_RETRY_AFTER = 60
+
+
+class TokenBucket:
+    """비동기 토큰 버킷 - 초당 rate개씩 채워지고 최대 capacity개까지 쌓임
+
+    이벤트 루프 하나에서만 사용하므로 잠금이 필요 없습니다.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        if not self.rate or self.rate <= 0:
+            return
+
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncScraper:
+    """aiohttp 세션 + 세마포어 + 토큰 버킷 (async with로 사용)
+
+    limiter(AdaptiveRateLimiter)가 없으면 초당 rps회로 시작하는 조절기를 만들고,
+    응답마다 조절기가 정한 초당 요청 수를 토큰 버킷에 반영합니다.
+    """
+
+    def __init__(self, concurrency=CONCURRENCY, rps=RPS, burst=BURST, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, timeout=DEFAULT_TIMEOUT, limiter=None, metrics=None):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp가 설치되어 있지 않습니다: pip3 install aiohttp")
+
+        self.concurrency = concurrency
+        self.rps = rps
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = limiter or AdaptiveRateLimiter(rps)
+        self.bucket = TokenBucket(self.limiter.rate, burst)
+        self.metrics = metrics
+        self.session = None
+        self._slots = None
+
+    async def __aenter__(self):
+        # 연결 수 = 동시 요청 수 (keep-alive로 재사용), 인증서 검증은 동기 크롤러처럼 생략
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ssl=False)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'User-Agent': USER_AGENT},
+        )
+        self._slots = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    def _retry_delay(self, attempt, response=None):
+        """지수 백오프 (+지터), 429 / 503은 Retry-After를 따름"""
+        if response is not None and response.status in (429, 503):
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(int(retry_after), MAX_RETRY_AFTER)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def fetch(self, url):
+        """GET → (status, 본문 bytes), 5xx / 429 / 연결 오류 / 타임아웃은 재시도
+
+        재시도 후에도 실패 응답이면 마지막 status를 그대로 반환하고,
+        연결 오류가 계속되면 마지막 예외를 던집니다.
+        """
+        async with self._slots:
+            for attempt in range(self.retries + 1):
+                await self.bucket.acquire()
+                started = time.monotonic()
+                try:
+                    async with self.session.get(url) as response:
+                        body = await response.read()
+                        self._observe(started, response.status, len(body))
+                        if response.status not in RETRY_STATUSES or attempt == self.retries:
+                            return response.status, body
+                        delay = self._retry_delay(attempt, response)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self._observe(started, None, error=e)
+                    if attempt == self.retries:
+                        raise
+                    delay = self._retry_delay(attempt)
+                await asyncio.sleep(delay)
+
+    def _observe(self, started, status, size=0, error=None):
+        """응답 1개를 조절기에 반영하고 토큰 버킷 속도를 맞춤 (Retry-After는 _retry_delay가 따름)"""
+        seconds = time.monotonic() - started
+        self.limiter.observe(seconds, status)
+        self.bucket.rate = self.limiter.rate
+
+        if self.metrics is None:
+            return
+        if status is None:
+            self.metrics.inc('http_errors_total', kind='timeout' if isinstance(error, asyncio.TimeoutError) else 'connection')
+            return
+        self.metrics.observe('http_request_seconds', seconds)
+        self.metrics.inc('http_responses_total', status=str(status))
+        self.metrics.inc('http_bytes_total', size)
+
+    async def fetch_listing_page(self, base_url, page):
+        """목록 페이지 1개 → (status, links)"""
+        status, body = await self.fetch(page_url(base_url, page))
+        if status != 200:
+            return status, None
+        return status, parse_listing_page(body)
+
+    async def find_last_page(self, base_url, hint=MAX_PAGES):
+        """마지막 목록 페이지 번호 찾기 (동기 find_last_page와 같은 탐색, 실패하면 None)"""
+        search = last_page_search(hint)
+        probes = 0
+        started = time.monotonic()
+
+        try:
+            page = next(search)
+            while True:
+                probes += 1
+                status, links = await self.fetch_listing_page(base_url, page)
+                if is_listing_end(status, links):
+                    page = search.send(False)
+                    continue
+                if status != 200:
+                    raise RuntimeError(f"페이지 {page} 접근 실패 (status: {status})")
+                page = search.send(True)
+        except StopIteration as done:
+            last_page = done.value
+        except Exception as e:
+            print(f"   ⚠️  마지막 페이지를 찾지 못했습니다: {e}")
+            return None
+
+        elapsed = time.monotonic() - started
+        print(f"   🔎 마지막 목록 페이지: {last_page:,} (예상 {hint:,}, 요청 {probes}회, {elapsed:.1f}초)")
+        return last_page
+
+    async def get_all_post_links(self, base_url, max_pages=None):
+        """모든 글의 링크 수집 (동기 get_all_post_links와 같은 결과)
+
+        max_pages가 None이면 마지막 페이지를 먼저 찾고, 페이지를 CONCURRENCY개씩
+        묶어 요청합니다. 글이 없는 페이지나 404가 나오면 그 뒤 묶음은 요청하지 않고,
+        그 밖의 실패(5xx 등)는 그 페이지만 건너뜁니다.
+        결과는 페이지 순서로 병합합니다.
+        """
+        print(f"📡 글 목록 수집 중... (동시 요청 {self.concurrency}개, 시작 속도 {self.limiter.status()})")
+
+        page_links = {}
+        last_page = max_pages
+        if last_page is None:
+            last_page = await self.find_last_page(base_url) or MAX_PAGES
+        failed = []
+        started = time.monotonic()
+
+        for start in range(1, last_page + 1, self.concurrency):
+            if start > last_page:
+                break
+            pages = range(start, min(start + self.concurrency, last_page + 1))
+            results = await asyncio.gather(
+                *(self.fetch_listing_page(base_url, page) for page in pages),
+                return_exceptions=True,
+            )
+
+            for page, result in zip(pages, results):
+                if isinstance(result, Exception):
+                    print(f"   ⚠️  페이지 {page} 오류: {result}")
+                    failed.append(page)
+                    continue
+                status, links = result
+                if is_listing_end(status, links):
+                    if page <= last_page:
+                        if status == 404:
+                            print(f"   ⚠️  페이지 {page} 없음 (status: 404)")
+                        else:
+                            print(f"   ⚠️  페이지 {page}에서 글을 찾을 수 없습니다.")
+                    last_page = min(last_page, page - 1)
+                    continue
+                if status != 200:
+                    # 일시적인 서버 오류를 끝으로 보지 않음 (그 페이지만 빠지고 계속)
+                    print(f"   ⚠️  페이지 {page} 접근 실패 (status: {status}), 건너뜀")
+                    failed.append(page)
+                    continue
+                page_links[page] = links
+
+            elapsed = time.monotonic() - started
+            print(f"   ✅ {len(page_links)}/{last_page} 페이지 완료 ({elapsed:.0f}초, {self.limiter.status()})")
+
+        index = LinkIndex()
+        for page in sorted(page_links):
+            if page > last_page:
+                continue
+            for href in page_links[page]:
+                index.add(href)
+        post_links = index.urls()
+
+        elapsed = time.monotonic() - started
+        print(f"\n✅ 총 {len(post_links)}개의 글을 찾았습니다. ({elapsed:.0f}초)")
+        failed = [page for page in failed if page <= last_page]
+        if failed:
+            print(f"   ⚠️  받지 못한 목록 페이지 {len(failed)}개: "
+                  f"{', '.join(map(str, sorted(failed)[:10]))}{' …' if len(failed) > 10 else ''}")
+        return post_links
+
+    async def scrape_post_content(self, url):
+        """개별 글 내용 크롤링 (동기 scrape_post_content와 같은 글 데이터, 실패 시 None)"""
+        started = time.monotonic()
+        try:
+            status, body = await self.fetch(url)
+        except Exception as e:
+            print(f"⚠️  크롤링 오류 ({url}): {e}")
+            self.span('fetch', started, url, e)
+            return None
+        if status != 200:
+            print(f"⚠️  크롤링 오류 ({url}): status {status}")
+            self.span('fetch', started, url, f"http_{status}")
+            return None
+        self.span('fetch', started, url)
+
+        started = time.monotonic()
+        try:
+            post_data = parse_post(url, body)
+        except Exception as e:
+            print(f"⚠️  크롤링 오류 ({url}): {e}")
+            self.span('parse', started, url, e)
+            return None
+        self.span('parse', started, url, None if post_data else 'no_result')
+        return post_data
+
+    def span(self, stage, started, url, error=None):
+        """스테이지 1개 처리 기록 (error: 예외 또는 분류 이름, None이면 성공)"""
+        if self.metrics is None:
+            return
+        kind = self.metrics.error(stage, error) if error else None
+        self.metrics.span(stage, time.monotonic() - started, 'failed' if error else 'ok', url, kind)
+
+    async def scrape_posts(self, urls):
+        """글 여러 개를 동시에 크롤링 → 끝나는 순서대로 글 데이터 (실패는 None)
+
+        작업은 한꺼번에 만들되 실제 요청 수는 세마포어 / 토큰 버킷이 제한합니다.
+        """
+        tasks = [asyncio.ensure_future(self.scrape_post_content(url)) for url in urls]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def scrape_to_outputs(post_links, outputs, posts_dir, concurrency=CONCURRENCY, rps=RPS,
+                            base_url=None, max_pages=None, limiter=None, metrics=None, max_writes=MAX_WRITES):
+    """본문 크롤링 → 글 데이터(JSON) 보관 → 출력 형식별 저장 → 성공 개수
+
+    post_links가 None이면 base_url 목록 페이지부터 수집합니다. 스레드는 쓰지 않습니다:
+    작은 파일(글 데이터 / TXT / JSONL / 색인)은 이벤트 루프에서 바로 쓰고, PDF 렌더링은
+    Output.submit()이 돌려주는 프로세스 풀 Future를 asyncio.wrap_future로 기다립니다.
+    저장 작업은 max_writes개까지만 동시에 진행하고, 자리가 빌 때까지 다음 글을 넘기지 않습니다.
+    """
+    started = time.monotonic()
+    success_count = 0
+    fail_count = 0
+    write_slots = asyncio.Semaphore(max_writes)
+
+    async def write(post_data):
+        """글 1개 저장 (성공 / 실패 개수를 세고 자리 반납)"""
+        nonlocal success_count, fail_count
+        write_started = time.monotonic()
+        try:
+            save_post_record(post_data, posts_dir)
+            results = await asyncio.gather(*(asyncio.wrap_future(output.submit(post_data)) for output in outputs),
+                                           return_exceptions=True)
+            saved = all(result and not isinstance(result, Exception) for result in results)
+            scraper.span('write', write_started, post_data['url'], None if saved else 'no_result')
+        except Exception as e:
+            print(f"⚠️  저장 오류: {e}")
+            saved = False
+        finally:
+            write_slots.release()
+
+        if saved:
+            success_count += 1
+        else:
+            fail_count += 1
+
+    async with AsyncScraper(concurrency=concurrency, rps=rps, limiter=limiter, metrics=metrics) as scraper:
+        if post_links is None:
+            post_links = await scraper.get_all_post_links(base_url, max_pages)
+        if not post_links:
+            print("❌ 글을 찾을 수 없습니다.")
+            return 0
+
+        print(f"\n📄 {', '.join(output.label for output in outputs)} 생성 시작...\n")
+
+        writes = set()
+        done = 0
+        async for post_data in scraper.scrape_posts(post_links):
+            done += 1
+            if post_data is None:
+                fail_count += 1
+            else:
+                # 저장 자리가 빌 때까지 대기 (진행 중인 저장은 max_writes개까지)
+                await write_slots.acquire()
+                task = asyncio.ensure_future(write(post_data))
+                writes.add(task)
+                task.add_done_callback(writes.discard)
+
+            if done % 100 == 0:
+                print(f"📊 진행 상황: {done}/{len(post_links)} ({scraper.limiter.status()})")
+
+        await asyncio.gather(*writes)
+        scraper.limiter.print_stats("비동기 크롤링")
+
+    elapsed = time.monotonic() - started
+    print(f"\n✨ 완료! {success_count}/{len(post_links)}개 저장 (실패 {fail_count}개, {elapsed:.0f}초)")
+    return success_count
@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 크롤러 CLI - 모든 출력 형식이 같은 수집 / 파싱 엔진을 사용
+
+    python3 -m dhamma discover                          # 글 목록만 수집 (crawl_state.db)
+    python3 -m dhamma fetch                             # 전체 → PDF (중단된 크롤링은 이어서)
+    python3 -m dhamma fetch --format txt --format pdf   # TXT + PDF 같이
+    python3 -m dhamma fetch --new-only                  # 새 글만
+    python3 -m dhamma fetch --refresh                   # 바뀐 글만 다시 저장
+    python3 -m dhamma fetch --duplicates skip           # 본문이 거의 같은 글은 저장 안 함 (기본 link)
+    python3 -m dhamma fetch --url "http://www.dhamma.kr/wp/?p=17762"   # 글 1개만
+    python3 -m dhamma fetch --async --format txt        # asyncio 크롤러 (aiohttp)
+    python3 -m dhamma fetch --metrics logs/metrics.jsonl --metrics-port 9464   # 지표 JSON lines + /metrics
+    python3 -m dhamma render-pdf posts/ pdfs/           # 저장된 글 데이터 → PDF (재크롤링 없음)
+    python3 -m dhamma render-pdf --dry-run              # 템플릿 / 내용이 바뀐 PDF 수 + 예상 시간만
+    python3 -m dhamma render-pdf --fast                 # fpdf2 단순 레이아웃 PDF (WeasyPrint 불필요)
+    python3 -m dhamma export-txt posts/ texts/          # 저장된 글 데이터 → TXT
+    python3 -m dhamma render-volumes --series 잡아함     # 시리즈별 묶음 PDF 1개 (책갈피, 폰트 1벌)
+    python3 -m dhamma export-txt --from-archive         # 원본 보관소 HTML을 다시 파싱 → TXT
+    python3 -m dhamma export-jsonl --parquet            # 저장된 글 데이터 → corpus/dhamma.jsonl (+ .parquet)
+    python3 -m dhamma search-index texts/               # 텍스트 파일 → 전문 검색 색인 (바뀐 파일만)
+    python3 -m dhamma search '"자비로운 마음" -분노'      # 검색 (BM25 순위)
+
+모든 동작은 옵션으로만 정해지므로 (입력 대기 없음) cron 등에서 그대로 실행할 수 있습니다.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import time
+
+import urllib3
+
+from . import settings
+from .archive import HtmlArchive
+from .corpus import jsonl_to_parquet
+from .crawl_state import CrawlState
+from .dedup import KEEP, LINK, MODES, DuplicateIndex
+from .http_cache import HttpCache
+from .http_client import DEFAULT_RETRIES, FetchClient
+from .link_index import LinkIndex
+from .listing_crawler import get_all_post_links, get_new_post_links
+from .metrics import Metrics
+from .outputs import OUTPUTS, get_output, plan_changes
+from .pipeline import run_post_pipeline
+from .post_parser import parse_post
+from .rate_control import AdaptiveRateLimiter
+from .records import load_post_records, save_post_record
+from .search import SearchIndex
+from .volumes import VolumeBuilder
+
+
+def add_listing_options(parser):
+    """글 목록 수집 옵션 (discover / fetch 공용)"""
+    parser.add_argument('--base-url', default=settings.BASE_URL, help="사이트 주소")
+    parser.add_argument('--pages', type=int, default=None,
+                        help="목록 페이지 수 (기본: 마지막 페이지를 찾아서 전부)")
+    parser.add_argument('--new-only', action='store_true', help="지난 실행 이후 올라온 새 글만")
+    parser.add_argument('--listing-workers', type=int, default=settings.LISTING_WORKERS,
+                        help="목록 페이지 동시 요청 수")
+    parser.add_argument('--listing-rps', type=float, default=settings.LISTING_RPS,
+                        help="목록 페이지 초당 요청 수 시작 값 (0이면 제한 없음)")
+    parser.add_argument('--max-rps', type=float, default=settings.MAX_RPS,
+                        help=f"응답이 빠를 때 올라갈 수 있는 최대 초당 요청 수 (기본 {settings.MAX_RPS:g})")
+    parser.add_argument('--fixed-rate', action='store_true',
+                        help="초당 요청 수를 응답에 맞춰 조절하지 않고 고정")
+    parser.add_argument('--state', default=settings.STATE_DB, help="크롤링 상태 DB")
+
+
+def add_archive_source(parser):
+    """render-pdf / export-txt: 글 데이터 대신 원본 보관소에서 다시 파싱"""
+    parser.add_argument('--from-archive', nargs='?', const=settings.ARCHIVE_PATH, metavar='ARCHIVE',
+                        help="원본 보관소 HTML을 다시 파싱해 저장 (글 데이터 JSON도 갱신, "
+                             f"기본 {os.path.relpath(settings.ARCHIVE_PATH, settings.SCRAPER_DIR)})")
+
+
+def add_duplicate_options(parser):
+    """fetch / render-pdf / export-*: 본문이 거의 같은 글(MinHash) 처리"""
+    parser.add_argument('--duplicates', choices=MODES, default=LINK,
+                        help="먼저 저장한 글과 본문이 거의 같은 글: link=대표 글 PDF에 하드 링크 (기본), "
+                             "skip=저장 안 함, keep=그대로 저장")
+    parser.add_argument('--dedup-db', default=settings.DEDUP_DB, help="중복 글 서명 DB")
+
+
+def add_dry_run(parser):
+    """render-pdf / export-txt: 저장하지 않고 다시 저장할 글 수만"""
+    parser.add_argument('--dry-run', action='store_true',
+                        help="저장하지 않고 새 글 / 내용 변경 / 템플릿 변경으로 다시 저장할 글 수와 예상 시간만 출력 "
+                             "(중복 글 링크도 저장으로 셈)")
+
+
+def open_duplicates(args, persistent=True):
+    """--duplicates keep이면 None"""
+    if args.duplicates == KEEP:
+        return None
+    return DuplicateIndex(args.dedup_db if persistent else ':memory:')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='dhamma', description="Dhamma.kr 크롤러")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    discover = commands.add_parser('discover', help="글 목록만 수집해 상태 DB에 저장")
+    add_listing_options(discover)
+
+    fetch = commands.add_parser('fetch', help="글 본문 수집 → 출력 형식별 저장")
+    add_listing_options(fetch)
+    fetch.add_argument('--format', dest='formats', action='append', choices=list(OUTPUTS),
+                       help="출력 형식 (여러 번 지정 가능, 기본 pdf)")
+    fetch.add_argument('--output', help="저장 폴더 (형식이 여러 개면 그 아래 형식별 폴더)")
+    fetch.add_argument('--url', dest='urls', action='append',
+                       help="이 글만 수집 (여러 번 지정 가능, 목록 수집 생략)")
+    fetch.add_argument('--refresh', action='store_true', help="저장한 글도 다시 확인해 바뀐 글만 새로 저장")
+    fetch.add_argument('--no-state', action='store_true',
+                       help="상태 DB / HTTP 캐시 / 원본 보관소 없이 매번 새로 받기")
+    fetch.add_argument('--async', dest='use_async', action='store_true',
+                       help="asyncio 크롤러 사용 (aiohttp 필요, 상태 DB 미사용)")
+    fetch.add_argument('--concurrency', type=int, default=200, help="--async 동시 요청 수")
+    fetch.add_argument('--rps', type=float, default=settings.POST_RPS, help="본문 초당 요청 수 시작 값 (0이면 제한 없음)")
+    fetch.add_argument('--fetch-workers', type=int, default=settings.FETCH_WORKERS, help="본문 다운로드 워커 수")
+    fetch.add_argument('--parse-workers', type=int, default=settings.PARSE_WORKERS, help="파싱 워커 수")
+    fetch.add_argument('--workers', type=int, default=settings.RENDER_WORKERS,
+                       help="저장(렌더링) 워커 수 (기본: CPU 코어 수)")
+    fetch.add_argument('--posts', default=settings.POSTS_DIR, help="글 데이터(JSON) 폴더")
+    fetch.add_argument('--cache', default=settings.CACHE_DB, help="HTTP 캐시 DB")
+    fetch.add_argument('--archive', default=settings.ARCHIVE_PATH,
+                       help="받은 HTML 원본 보관소 (.warc.gz 또는 .warc.zst)")
+    add_duplicate_options(fetch)
+    fetch.add_argument('--metrics', metavar='FILE',
+                       help="스테이지별 지표 / 글마다 스팬을 JSON lines로 이 파일에 추가")
+    fetch.add_argument('--metrics-port', type=int, metavar='PORT',
+                       help="Prometheus 형식 지표를 http://127.0.0.1:PORT/metrics 로 제공")
+
+    render_pdf = commands.add_parser('render-pdf', help="저장된 글 데이터(JSON) → PDF (재크롤링 없음)")
+    render_pdf.add_argument('posts_dir', nargs='?', default=settings.POSTS_DIR, help="글 데이터 JSON 폴더")
+    render_pdf.add_argument('output_dir', nargs='?', help="PDF 저장 폴더 (기본 pdfs/)")
+    render_pdf.add_argument('--workers', type=int, default=settings.RENDER_WORKERS,
+                            help="렌더링 프로세스 수 (기본: CPU 코어 수)")
+    render_pdf.add_argument('--fast', dest='format', action='store_const', const='fpdf',
+                            help="fpdf2 빠른 렌더링: 단순 레이아웃 (= --format fpdf, 바꾸면 모든 PDF를 다시 렌더링)")
+    add_archive_source(render_pdf)
+    add_duplicate_options(render_pdf)
+    add_dry_run(render_pdf)
+    render_pdf.set_defaults(format='pdf')
+
+    export_txt = commands.add_parser('export-txt', help="저장된 글 데이터(JSON) → TXT (재크롤링 없음)")
+    export_txt.add_argument('posts_dir', nargs='?', default=settings.POSTS_DIR, help="글 데이터 JSON 폴더")
+    export_txt.add_argument('output_dir', nargs='?', help="TXT 저장 폴더 (기본 texts/)")
+    add_archive_source(export_txt)
+    add_duplicate_options(export_txt)
+    add_dry_run(export_txt)
+    export_txt.set_defaults(format='txt', workers=1)
+
+    export_jsonl = commands.add_parser('export-jsonl', help="저장된 글 데이터(JSON) → JSONL 묶음 파일 1개")
+    export_jsonl.add_argument('posts_dir', nargs='?', default=settings.POSTS_DIR, help="글 데이터 JSON 폴더")
+    export_jsonl.add_argument('output_dir', nargs='?', help="묶음 저장 폴더 (기본 corpus/)")
+    export_jsonl.add_argument('--parquet', action='store_true',
+                              help="같은 폴더에 Parquet 파일도 저장 (pyarrow 필요)")
+    add_archive_source(export_jsonl)
+    add_duplicate_options(export_jsonl)
+    export_jsonl.set_defaults(format='jsonl', workers=1)
+
+    render_volumes = commands.add_parser('render-volumes', help="저장된 글 데이터(JSON) → 시리즈별 묶음 PDF")
+    render_volumes.add_argument('posts_dir', nargs='?', default=settings.POSTS_DIR, help="글 데이터 JSON 폴더")
+    render_volumes.add_argument('output_dir', nargs='?', default=settings.VOLUMES_DIR,
+                                help="묶음 PDF 저장 폴더 (기본 volumes/)")
+    render_volumes.add_argument('--series', action='append',
+                                help="이 시리즈만 (제목의 번호 앞부분, 예: 잡아함 / 오늘의 법구, 여러 번 지정 가능)")
+    render_volumes.add_argument('--workers', type=int, default=settings.RENDER_WORKERS,
+                                help="렌더링 프로세스 수 (묶음 1개 = 프로세스 1개)")
+    add_archive_source(render_volumes)
+    add_duplicate_options(render_volumes)
+
+    search_index = commands.add_parser('search-index', help="텍스트 파일 폴더 → 전문 검색 색인 (바뀐 파일만)")
+    search_index.add_argument('texts_dir', nargs='?', default=os.path.join(settings.SCRAPER_DIR, 'texts'),
+                              help="텍스트 파일 폴더 (기본 texts/)")
+    search_index.add_argument('--index', default=settings.SEARCH_DB, help="검색 색인 DB")
+    search_index.add_argument('--compact', action='store_true', help="세그먼트를 하나로 합침")
+
+    search = commands.add_parser('search', help="전문 검색 (AND / \"구\" / OR / -제외)")
+    search.add_argument('query', nargs='+', help="검색어")
+    search.add_argument('--index', default=settings.SEARCH_DB, help="검색 색인 DB")
+    search.add_argument('--limit', type=int, default=10, help="결과 수")
+
+    return parser
+
+
+def output_dirs(formats, output):
+    """형식별 저장 폴더 (기본: scraper/ 아래 형식별 기본 폴더, pdf + fpdf처럼 겹치면 그 아래 형식별 폴더)"""
+    if not output:
+        dirs = {}
+        defaults = [get_output(name).default_dir for name in formats]
+        for name, default_dir in zip(formats, defaults):
+            dirs[name] = os.path.join(settings.SCRAPER_DIR, default_dir)
+            if defaults.count(default_dir) > 1:
+                dirs[name] = os.path.join(dirs[name], name)
+        return dirs
+    if len(formats) == 1:
+        return {formats[0]: output}
+    return {name: os.path.join(output, name) for name in formats}
+
+
+def rate_limiter(args, rps):
+    """초당 rps회로 시작하는 요청 속도 조절기 (--fixed-rate면 고정, --max-rps까지)
+
+    429 / 5xx / 연결 오류 재시도는 조절기가 맡습니다 (FetchClient는 retries=0).
+    """
+    if args.fixed_rate:
+        return AdaptiveRateLimiter(rps, min_rps=rps, max_rps=rps, retries=DEFAULT_RETRIES)
+    return AdaptiveRateLimiter(rps, max_rps=args.max_rps, retries=DEFAULT_RETRIES)
+
+
+def watch_limiter(metrics, limiter, name):
+    """지표 스냅숏마다 조절기의 지금 초당 요청 수를 게이지로 (rate_limit_rps{limiter=name})"""
+    metrics.add_collector(lambda m: m.set('rate_limit_rps', limiter.rate, limiter=name))
+
+
+def collect_links(args, client, state):
+    """글 링크 수집: --url > --new-only > 전체 목록"""
+    if args.urls:
+        post_links = LinkIndex(args.urls).urls()
+        if state:
+            state.add_posts(post_links)
+        return post_links
+
+    if args.new_only and state and state.known_urls():
+        print("🚀 Dhamma.kr 새 글 크롤링 시작\n")
+        post_links = get_new_post_links(args.base_url, state.known_urls(), args.pages,
+                                        client=client, limiter=rate_limiter(args, args.listing_rps))
+        state.add_posts(post_links)
+        return post_links
+
+    print("🚀 Dhamma.kr 전체 크롤링 시작\n")
+    if args.pages:
+        print(f"📌 {args.pages:,} 페이지 크롤링\n")
+    return get_all_post_links(args.base_url, args.pages, args.listing_workers, state=state, client=client,
+                              limiter=rate_limiter(args, args.listing_rps))
+
+
+def cmd_discover(args):
+    # 상태 DB / 연결 풀은 어떻게 끝나든(예외가 나도) 닫힘
+    with contextlib.ExitStack() as stack:
+        state = stack.enter_context(contextlib.closing(CrawlState(args.state)))
+        client = stack.enter_context(contextlib.closing(FetchClient(pool_size=args.listing_workers, retries=0)))
+        if args.new_only and state.known_urls():
+            post_links = get_new_post_links(args.base_url, state.known_urls(), args.pages,
+                                            client=client, limiter=rate_limiter(args, args.listing_rps))
+            state.add_posts(post_links)
+        else:
+            post_links = get_all_post_links(args.base_url, args.pages, args.listing_workers, state=state,
+                                            client=client, limiter=rate_limiter(args, args.listing_rps))
+
+        print(f"   상태별 글 수: {state.counts()}")
+    return 0 if post_links else 1
+
+
+def cmd_fetch(args):
+    formats = list(dict.fromkeys(args.formats or ['pdf']))
+    dirs = output_dirs(formats, args.output)
+    os.makedirs(args.posts, exist_ok=True)
+
+    if args.use_async:
+        return fetch_async(args, formats, dirs)
+
+    # 상태 DB / HTTP 캐시 / 원본 보관소 / 중복 색인 / 지표는 어떻게 끝나든(일찍 return해도) 닫힘
+    with contextlib.ExitStack() as stack:
+        metrics = stack.enter_context(Metrics(args.metrics, args.metrics_port))
+        # 목록 / 본문 요청이 같이 쓰는 연결 풀 (keep-alive, 재시도는 요청 속도 조절기가)
+        client = FetchClient(pool_size=max(args.listing_workers, args.fetch_workers), retries=0, metrics=metrics)
+        stack.callback(client.close)
+        post_limiter = rate_limiter(args, args.rps)
+        watch_limiter(metrics, post_limiter, 'post')
+        state = None
+        archive = None
+        if not args.no_state:
+            # 중단된 크롤링이 있으면 이어서 실행
+            state = stack.enter_context(contextlib.closing(CrawlState(args.state)))
+            # 글 본문은 조건부 GET (지난번과 같으면 304 → 파싱 / 저장 생략)
+            client.cache = stack.enter_context(contextlib.closing(HttpCache(args.cache)))
+            # 받은 HTML은 원본 보관소에 (템플릿 / 파서를 바꿔도 재크롤링 없이 다시 파싱)
+            archive = stack.enter_context(HtmlArchive(args.archive))
+
+        def fetch_post_html(url):
+            """개별 글 HTML 다운로드 (네트워크 스테이지, 응답을 보고 속도 조절)"""
+            response = post_limiter.call(client.fetch, url)
+            return url, response.content, response
+
+        def parse_post_html(url, content):
+            """개별 글 HTML 파싱 (파싱 스테이지)"""
+            try:
+                return parse_post(url, content)
+            except Exception as e:
+                print(f"⚠️  파싱 오류 ({url}): {e}")
+                return None
+
+        duplicates = open_duplicates(args, persistent=not args.no_state)
+        if duplicates is not None:
+            stack.enter_context(duplicates)
+
+        post_links = collect_links(args, client, state)
+        if not post_links and args.new_only:
+            print("✨ 새 글이 없습니다.")
+            return 0
+        if not post_links:
+            print("❌ 글을 찾을 수 없습니다.")
+            return 1
+
+        with contextlib.ExitStack() as output_stack:
+            outputs = [output_stack.enter_context(get_output(name)(dirs[name], args.workers)) for name in formats]
+            print(f"\n📄 {', '.join(output.label for output in outputs)} 생성 시작...\n")
+            done_count = run_post_pipeline(
+                post_links, fetch_post_html, parse_post_html, outputs, args.posts, state,
+                args.fetch_workers, args.parse_workers, refresh=args.refresh, archive=archive,
+                duplicates=duplicates, duplicate_mode=args.duplicates, limiter=post_limiter, metrics=metrics,
+            )
+        post_limiter.print_stats("글 본문")
+        metrics.print_stats()
+        for output in outputs:
+            output.print_stats()
+        if duplicates is not None:
+            duplicates.print_stats()
+        if state:
+            client.cache.print_stats()
+            archive.print_stats()
+
+    print(f"\n✨ 완료! {done_count}/{len(post_links)}개 저장됨")
+    for name in formats:
+        print(f"📁 저장 위치 ({name}): {dirs[name]}")
+    return 0
+
+
+def fetch_async(args, formats, dirs):
+    from .async_scraper import scrape_to_outputs
+
+    if args.new_only or args.refresh:
+        print("❌ --async는 --new-only / --refresh를 지원하지 않습니다 (상태 DB 미사용)")
+        return 2
+
+    print("🚀 Dhamma.kr 비동기 크롤링 시작\n")
+    post_links = LinkIndex(args.urls).urls() if args.urls else None
+
+    limiter = rate_limiter(args, args.rps)
+    with contextlib.ExitStack() as stack:
+        metrics = stack.enter_context(Metrics(args.metrics, args.metrics_port))
+        watch_limiter(metrics, limiter, 'async')
+        outputs = [stack.enter_context(get_output(name)(dirs[name], args.workers)) for name in formats]
+        asyncio.run(scrape_to_outputs(post_links, outputs, args.posts, args.concurrency, args.rps,
+                                      args.base_url, args.pages, limiter=limiter, metrics=metrics))
+        metrics.print_stats()
+    for output in outputs:
+        output.print_stats()
+
+    for name in formats:
+        print(f"📁 저장 위치 ({name}): {dirs[name]}")
+    return 0
+
+
+def archived_posts(archive, posts_dir, save=True):
+    """원본 보관소를 순서대로 읽어 다시 파싱 → 글 데이터 (save면 JSON도 새 결과로 갱신)"""
+    if save:
+        os.makedirs(posts_dir, exist_ok=True)
+    for url, content in archive.iter_records():
+        try:
+            post_data = parse_post(url, content)
+        except Exception as e:
+            print(f"⚠️  파싱 오류 ({url}): {e}")
+            continue
+        if save:
+            save_post_record(post_data, posts_dir)
+        yield post_data
+
+
+def format_duration(seconds):
+    """초 → 1시간 5분 / 4분 12초 / 3.2초"""
+    if seconds >= 3600:
+        return f"{int(seconds // 3600)}시간 {int(seconds % 3600 // 60)}분"
+    if seconds >= 60:
+        return f"{int(seconds // 60)}분 {int(seconds % 60)}초"
+    return f"{seconds:.1f}초"
+
+
+def print_plan(output_cls, output_dir, posts, workers):
+    """--dry-run: 다시 저장할 글 수 / 예상 시간 출력 (저장하지 않음)"""
+    changes, total, seconds = plan_changes(output_cls, output_dir, posts)
+    count = sum(changes.values())
+    reasons = ', '.join(f"{reason} {n}" for reason, n in changes.most_common())
+    print(f"🔍 {output_cls.label}: 전체 {total}개 중 {count}개를 다시 저장합니다" + (f" ({reasons})" if reasons else ""))
+    if count and seconds is not None:
+        workers = max(1, min(workers, count))
+        print(f"   예상 시간 {format_duration(count * seconds / workers)} "
+              f"(지난 실행 문서당 {seconds:.2f}초, 워커 {workers}개)")
+    elif count:
+        print("   예상 시간: 이 폴더에 저장한 기록이 없어 알 수 없음")
+    return 0
+
+
+def unique_posts(posts, duplicates, mode, linked):
+    """중복 글을 빼고 넘김 (link면 linked에 (글, 대표 글)을 모아 둠)"""
+    for post_data in posts:
+        canonical = duplicates.check(post_data)
+        if canonical is None:
+            yield post_data
+        elif mode == LINK:
+            linked.append((post_data, canonical))
+
+
+def cmd_export(args):
+    """저장된 글 데이터(JSON) 폴더 또는 원본 보관소 → 출력 형식 1개 (render-pdf / export-txt / export-jsonl)"""
+    output_cls = get_output(args.format)
+    output_dir = args.output_dir or os.path.join(settings.SCRAPER_DIR, output_cls.default_dir)
+
+    dry_run = getattr(args, 'dry_run', False)
+    archive = None
+    if args.from_archive:
+        archive = HtmlArchive(args.from_archive)
+        source = args.from_archive
+        posts = archived_posts(archive, args.posts_dir, save=not dry_run)
+    else:
+        source = args.posts_dir
+        posts = load_post_records(args.posts_dir)
+
+    if dry_run:
+        try:
+            return print_plan(output_cls, output_dir, posts, args.workers)
+        finally:
+            if archive is not None:
+                archive.close()
+
+    duplicates = open_duplicates(args)
+    linked = []
+    if duplicates is not None:
+        posts = unique_posts(posts, duplicates, args.duplicates, linked)
+
+    print(f"🖨️  {output_cls.label} 다시 저장: {source} → {output_dir}\n")
+    started = time.perf_counter()
+    failed = 0
+
+    with output_cls(output_dir, args.workers) as output:
+        for i, (post_data, filepath) in enumerate(output.write_all(posts), 1):
+            if filepath:
+                print(f"[{i}] ✅ {post_data['title'][:40]}")
+            else:
+                failed += 1
+                print(f"[{i}] ❌ {post_data['url']}")
+        # 대표 글을 모두 저장한 뒤 중복 글 링크
+        for post_data, canonical in linked:
+            if output.link(post_data, canonical):
+                print(f"🔗 {post_data['title'][:30]} → {canonical['title'][:30]}")
+            else:
+                failed += 1
+                print(f"❌ {post_data['url']}")
+    output.print_stats()
+    if duplicates is not None:
+        duplicates.print_stats()
+        duplicates.close()
+    if archive is not None:
+        archive.close()
+
+    if getattr(args, 'parquet', False):
+        parquet_path = os.path.splitext(output.corpus_path)[0] + '.parquet'
+        try:
+            count = jsonl_to_parquet(output.corpus_path, parquet_path)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"📊 Parquet: {count}개 → {parquet_path}")
+
+    print(f"\n✨ 완료! 총 {time.perf_counter() - started:.1f}초")
+    return 1 if failed else 0
+
+
+def cmd_render_volumes(args):
+    """저장된 글 데이터 → 시리즈별 묶음 PDF (중복 글은 link / skip 모두 묶음에서 뺌)"""
+    archive = None
+    if args.from_archive:
+        archive = HtmlArchive(args.from_archive)
+        posts = archived_posts(archive, args.posts_dir)
+    else:
+        posts = load_post_records(args.posts_dir)
+
+    duplicates = open_duplicates(args)
+    if duplicates is not None:
+        posts = unique_posts(posts, duplicates, args.duplicates, [])
+
+    started = time.perf_counter()
+    failed = 0
+    with VolumeBuilder(args.output_dir, args.workers) as builder:
+        for post_data in posts:
+            builder.add(post_data)
+        series = builder.series()
+        print(f"📚 시리즈 {len(series)}개, 글 {sum(series.values()):,}개 → {args.output_dir}\n")
+
+        for name, filepath, count, rendered in builder.build(args.series):
+            if not filepath:
+                failed += 1
+                print(f"❌ {name} ({count}편)")
+            else:
+                print(f"{'✅' if rendered else '♻️ '} {name} ({count}편) → {filepath}")
+        if builder.unchanged:
+            print(f"♻️  내용 / 템플릿이 같아 건너뜀 {builder.unchanged}개")
+    if duplicates is not None:
+        duplicates.print_stats()
+        duplicates.close()
+    if archive is not None:
+        archive.close()
+
+    print(f"\n✨ 완료! 총 {time.perf_counter() - started:.1f}초")
+    return 1 if failed else 0
+
+
+def cmd_search_index(args):
+    started = time.perf_counter()
+    with SearchIndex(args.index) as index:
+        added = index.index_text_files(args.texts_dir)
+        if args.compact:
+            index.compact()
+        index.print_stats()
+    print(f"\n✨ 완료! {added}개 색인, {time.perf_counter() - started:.1f}초")
+    return 0
+
+
+def cmd_search(args):
+    query = ' '.join(args.query)
+    with SearchIndex(args.index) as index:
+        started = time.perf_counter()
+        hits = index.search(query, args.limit)
+        elapsed = time.perf_counter() - started
+
+        print(f"🔎 {query}: {len(hits)}개 ({elapsed * 1000:.1f}ms)\n")
+        for rank, hit in enumerate(hits, 1):
+            print(f"[{rank}] {hit.score:5.2f}  {hit.title}  {hit.url or hit.path}")
+            snippet = hit.snippet()
+            if snippet:
+                print(f"      {snippet}")
+    return 0 if hits else 1
+
+
+COMMANDS = {
+    'discover': cmd_discover,
+    'fetch': cmd_fetch,
+    'render-pdf': cmd_export,
+    'export-txt': cmd_export,
+    'export-jsonl': cmd_export,
+    'render-volumes': cmd_render_volumes,
+    'search-index': cmd_search_index,
+    'search': cmd_search,
+}
+
+
+def main(argv=None):
+    """CLI 실행 → 종료 코드"""
+    # SSL 경고 무시
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command](args)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 글 묶음(corpus) - 모든 글을 JSONL 파일 1개로 (선택: Parquet)
+
+글마다 작은 TXT 파일을 만드는 대신 한 줄에 글 1개(JSON)를 이어 씁니다.
+검색 / 분석 쪽에서는 파일 하나를 처음부터 순서대로 읽으면 전체 글을 훑을 수 있습니다.
+
+    corpus/dhamma.jsonl     {"id": "17762", "url": ..., "title": ..., "date": ..., "content": ..., "content_html": ...}
+    corpus/dhamma.parquet   같은 열 (pyarrow 필요, zstd 압축)
+
+id는 글 데이터 파일명과 같은 records.stable_id (?p= 번호, 없으면 정규화 URL 해시)라서 제목이 바뀌거나
+다시 받아도 그대로입니다. 같은 글이 여러 번 기록되면(--refresh 등) 정리(compact) 시 마지막 줄만 남기고
+?p= 번호 순으로 정렬합니다 (번호 없는 글은 뒤에).
+"""
+
+import json
+import os
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from .link_index import post_id
+from .records import stable_id
+
+# 한 줄에 기록하는 필드 (순서 유지)
+FIELDS = ('id', 'url', 'title', 'date', 'content', 'content_html')
+
+# Parquet row group 크기 (글 수)
+PARQUET_BATCH = 1000
+
+
+def corpus_row(post_data):
+    """글 데이터 → 묶음 한 줄 (dict, 안정적인 id 포함)"""
+    row = {'id': stable_id(post_data['url'])}
+    for field in FIELDS[1:]:
+        row[field] = post_data.get(field, '')
+    return row
+
+
+def iter_corpus(path):
+    """JSONL 묶음을 순서대로 읽기 → 글 dict"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _row_key(row):
+    """정렬 / 중복 판단 키: ?p= 번호가 있는 글은 번호 순, 없으면 URL 해시 순으로 뒤에"""
+    number = post_id(row['url'])
+    return (0, number, '') if number is not None else (1, 0, stable_id(row['url']))
+
+
+def compact_jsonl(path):
+    """같은 글은 마지막 줄만 남기고 ?p= 번호 순으로 다시 씀 → 글 수
+
+    한 줄씩 읽어 글별 마지막 위치만 기억하므로 메모리는 글 수에 비례합니다 (본문 제외).
+    """
+    latest = {}
+    with open(path, 'rb') as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                row = json.loads(line)
+                latest[_row_key(row)] = offset
+
+    tmp_path = path + '.tmp'
+    with open(path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        for key in sorted(latest):
+            src.seek(latest[key])
+            dst.write(src.readline())
+    os.replace(tmp_path, path)
+    return len(latest)
+
+
+def jsonl_to_parquet(jsonl_path, parquet_path, batch_size=PARQUET_BATCH):
+    """JSONL 묶음 → Parquet (batch_size개씩 row group으로 나눠 써서 메모리 일정) → 글 수"""
+    if pyarrow is None:
+        raise RuntimeError("pyarrow가 설치되어 있지 않습니다: pip3 install pyarrow")
+
+    schema = pyarrow.schema([
+        ('id', pyarrow.string()),
+        ('url', pyarrow.string()),
+        ('title', pyarrow.string()),
+        ('date', pyarrow.string()),
+        ('content', pyarrow.string()),
+        ('content_html', pyarrow.string()),
+    ])
+
+    count = 0
+    batch = []
+    with pyarrow.parquet.ParquetWriter(parquet_path, schema, compression='zstd') as writer:
+        for row in iter_corpus(jsonl_path):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 크롤링 상태 저장소 (SQLite) - 중단된 크롤링 이어서 실행
+
+저장 내용:
+- pages: 이미 받은 목록 페이지와 그 페이지의 글 링크 (목록 수집이 끝나면 비움)
+- posts: 발견한 글 URL(발견 순서)과 글별 상태
+  discovered → fetched → parsed → rendered (실패 시 failed)
+- meta: 끝 페이지 번호, 마지막 출력 형식 등
+
+다시 실행하면 받은 목록 페이지는 요청하지 않고, 이미 받은 글 HTML은
+DB에서 꺼내 쓰므로 끝난 네트워크 작업을 반복하지 않습니다.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+DISCOVERED = 'discovered'
+FETCHED = 'fetched'
+PARSED = 'parsed'
+RENDERED = 'rendered'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page INTEGER PRIMARY KEY,
+    links TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS posts (
+    url TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    html BLOB,
+    record_path TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_status ON posts (status);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class CrawlState:
+    """크롤링 진행 상태 (여러 워커 스레드에서 공유)"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            self.conn.execute(sql, params)
+            self.conn.commit()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    # --- 목록 페이지 ---
+
+    def page_links(self):
+        """이미 받은 목록 페이지 → 글 링크"""
+        return {page: json.loads(links) for page, links in self._query("SELECT page, links FROM pages")}
+
+    def save_page(self, page, links):
+        """목록 페이지 결과 저장 + 새 글 URL 등록"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (page, links, fetched_at) VALUES (?, ?, ?)",
+                (page, json.dumps(links), time.time()),
+            )
+            now = time.time()
+            for i, url in enumerate(links):
+                # 발견 순서: 페이지 번호 + 페이지 안 순서
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO posts (url, seq, status, updated_at) VALUES (?, ?, ?, ?)",
+                    (url, page * 1000 + i, DISCOVERED, now),
+                )
+            self.conn.commit()
+
+    def clear_pages(self):
+        """받은 목록 페이지 비우기 (글 URL과 글별 상태는 그대로)"""
+        self._execute("DELETE FROM pages")
+
+    def known_urls(self):
+        """지금까지 발견한 모든 글 URL"""
+        return {url for (url,) in self._query("SELECT url FROM posts")}
+
+    def add_posts(self, urls):
+        """목록 페이지와 무관하게 새 글 URL 등록 (증분 모드)"""
+        with self._lock:
+            (max_seq,) = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM posts").fetchone()
+            now = time.time()
+            for i, url in enumerate(urls, 1):
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO posts (url, seq, status, updated_at) VALUES (?, ?, ?, ?)",
+                    (url, max_seq + i, DISCOVERED, now),
+                )
+            self.conn.commit()
+
+    def get_meta(self, key, default=None):
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else default
+
+    def set_meta(self, key, value):
+        self._execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    # --- 글 상태 ---
+
+    def status(self, url):
+        rows = self._query("SELECT status FROM posts WHERE url = ?", (url,))
+        return rows[0][0] if rows else None
+
+    def counts(self):
+        """상태별 글 개수"""
+        return dict(self._query("SELECT status, COUNT(*) FROM posts GROUP BY status"))
+
+    def mark_fetched(self, url, html=None):
+        """받은 HTML 저장 (압축) - 파싱 전에 중단돼도 다시 받지 않음
+
+        원본 보관소(HtmlArchive)에 따로 저장하는 경우 html=None으로 상태만 기록합니다.
+        """
+        self._execute(
+            "UPDATE posts SET status = ?, html = ?, error = NULL, updated_at = ? WHERE url = ?",
+            (FETCHED, zlib.compress(html) if html is not None else None, time.time(), url),
+        )
+
+    def load_html(self, url):
+        """저장된 HTML (없으면 None)"""
+        rows = self._query("SELECT html FROM posts WHERE url = ?", (url,))
+        return zlib.decompress(rows[0][0]) if rows and rows[0][0] else None
+
+    def mark_parsed(self, url, record_path):
+        """파싱 완료: 글 데이터 JSON 경로 기록, HTML은 더 필요 없으므로 삭제"""
+        self._execute(
+            "UPDATE posts SET status = ?, html = NULL, record_path = ?, error = NULL, updated_at = ? WHERE url = ?",
+            (PARSED, record_path, time.time(), url),
+        )
+
+    def record_path(self, url):
+        rows = self._query("SELECT record_path FROM posts WHERE url = ?", (url,))
+        return rows[0][0] if rows else None
+
+    def mark_rendered(self, url):
+        self._execute(
+            "UPDATE posts SET status = ?, error = NULL, updated_at = ? WHERE url = ?",
+            (RENDERED, time.time(), url),
+        )
+
+    def reset_rendered(self):
+        """저장 완료 표시 지우기 (출력 형식이 바뀐 경우) → 지운 글 수
+
+        글 데이터(JSON)가 있는 글은 parsed로 돌려 네트워크 없이 다시 저장합니다.
+        """
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE posts SET status = CASE WHEN record_path IS NULL THEN ? ELSE ? END, updated_at = ? "
+                "WHERE status = ?",
+                (DISCOVERED, PARSED, time.time(), RENDERED),
+            )
+            self.conn.commit()
+            return cursor.rowcount
+
+    def mark_failed(self, url, error):
+        """실패 기록 (받은 HTML / 글 데이터는 그대로 두어 재시도 시 재사용)"""
+        self._execute(
+            "UPDATE posts SET status = ?, error = ?, updated_at = ? WHERE url = ?",
+            (FAILED, str(error), time.time(), url),
+        )
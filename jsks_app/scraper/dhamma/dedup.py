@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 중복 글 찾기 - MinHash + LSH (글 수가 늘어도 모든 쌍을 비교하지 않음)
+
+dhamma.kr에는 같은 경전 본문이 제목만 조금 바뀌어 다시 올라옵니다
+("잡아함 11 인연경 1" / "… 2"). 본문을 5글자 조각(shingle)으로 자르고 MinHash
+서명(128칸)을 만든 뒤, 서명을 16개 띠(band, 8칸씩)로 나눠 띠 하나라도 같은 글만
+후보로 비교합니다. 후보의 추정 유사도(같은 칸 비율)가 THRESHOLD 이상이면 같은 묶음입니다.
+
+    - 서명: 조각마다 해시 1번만 계산하고 칸(bin) 128개에 나눠 최솟값을 남기는 방식
+      (one permutation hashing, 빈 칸은 오른쪽 칸 값으로 채움) → 글 1개 O(글자 수)
+    - 후보 찾기: 띠별 해시 테이블 조회 → 글 1개 O(띠 수 + 후보 수), 전체 O(n)
+    - 유사도 0.8인 두 글이 후보가 될 확률 ≈ 1 - (1 - 0.8^8)^16 ≈ 0.95,
+      0.5인 두 글은 ≈ 0.06 (후보가 되어도 유사도 확인에서 걸러짐)
+
+묶음의 대표 글은 먼저 들어온 글이고, 서명은 SQLite에 저장해 다음 실행에서 새 글을
+지난번 글들과도 비교합니다.
+"""
+
+import sqlite3
+import threading
+import zlib
+from array import array
+
+from .search import normalize_text
+
+SHINGLE = 5
+NUM_BINS = 128
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+THRESHOLD = 0.8
+# 조각이 이보다 적은 짧은 글(한 줄 법구, 본문을 못 찾은 글 등)은 비교하지 않음
+MIN_SHINGLES = 20
+# 서명을 몇 개마다 커밋할지
+COMMIT_EVERY = 100
+
+# 중복 글 처리 방식 (CLI --duplicates)
+KEEP = 'keep'   # 중복이어도 그대로 저장
+LINK = 'link'   # 대표 글의 파일에 하드 링크 (렌더링 / 디스크 사용 없음)
+SKIP = 'skip'   # 저장하지 않음
+MODES = (LINK, SKIP, KEEP)
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_EMPTY = 0xFFFFFFFF
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    url TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    canonical TEXT NOT NULL
+);
+"""
+
+
+def minhash(text):
+    """본문 → MinHash 서명 (array('I'), NUM_BINS칸) / MIN_SHINGLES보다 짧으면 None"""
+    normalized = normalize_text(text).encode('utf-8')
+    # 한글은 UTF-8 3바이트라 바이트 15개 ≈ 5글자 조각
+    width = SHINGLE * 3
+    shingles = {normalized[i:i + width] for i in range(len(normalized) - width + 1)}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+
+    bins = [_EMPTY] * NUM_BINS
+    for shingle in shingles:
+        h = (zlib.crc32(shingle) * _GOLDEN) & _MASK64
+        h ^= h >> 29
+        slot = h & (NUM_BINS - 1)
+        value = h >> 32
+        if value < bins[slot]:
+            bins[slot] = value
+
+    # 빈 칸은 오른쪽(원형)으로 가장 가까운 칸 값 + 거리로 채움 (densification)
+    if _EMPTY in bins:
+        filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+        for i in range(NUM_BINS):
+            if bins[i] == _EMPTY:
+                distance = min((j - i) % NUM_BINS for j in filled)
+                bins[i] = (bins[(i + distance) % NUM_BINS] + distance) & _EMPTY
+    return array('I', bins)
+
+
+def similarity(a, b):
+    """두 서명의 추정 Jaccard 유사도 (같은 칸 비율)"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+
+def band_keys(signature):
+    """서명 → 띠별 키 (띠 번호, 8칸 바이트)"""
+    raw = signature.tobytes()
+    width = ROWS * signature.itemsize
+    return [(band, raw[band * width:(band + 1) * width]) for band in range(BANDS)]
+
+
+class DuplicateIndex:
+    """글 URL → 서명 / 대표 글 (여러 워커 스레드에서 공유, with로 사용)
+
+    db_path가 ':memory:'이면 이번 실행 안에서만 비교합니다.
+    """
+
+    def __init__(self, db_path, threshold=THRESHOLD):
+        self.db_path = db_path
+        self.threshold = threshold
+        self.duplicates = 0
+        self.compared = 0
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+        self._signatures = {}
+        self._titles = {}
+        self._canonical = {}
+        # 대표 글 → 그 묶음의 글 (들어온 순서, 값은 쓰지 않음 - 순서 있는 집합)
+        self._members = {}
+        self._buckets = {}
+        for url, title, raw, canonical in self.conn.execute(
+                "SELECT url, title, signature, canonical FROM signatures ORDER BY rowid"):
+            signature = array('I')
+            signature.frombytes(raw)
+            self._remember(url, title, signature, canonical)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _remember(self, url, title, signature, canonical):
+        self._signatures[url] = signature
+        self._titles[url] = title
+        self._canonical[url] = canonical
+        self._members.setdefault(canonical, {})[url] = None
+        for key in band_keys(signature):
+            self._buckets.setdefault(key, []).append(url)
+
+    def _forget(self, url):
+        for key in band_keys(self._signatures.pop(url)):
+            self._buckets[key].remove(url)
+        del self._titles[url]
+        self._leave(url, self._canonical.pop(url))
+
+    def _leave(self, url, canonical):
+        members = self._members[canonical]
+        del members[url]
+        if not members:
+            del self._members[canonical]
+
+    def candidates(self, signature):
+        """띠가 하나라도 같은 글 URL"""
+        found = set()
+        for key in band_keys(signature):
+            found.update(self._buckets.get(key, ()))
+        return found
+
+    def _best_match(self, signature, exclude=()):
+        """유사도가 threshold 이상인 후보 중 가장 비슷한 글 URL (없으면 None)"""
+        best, best_score = None, self.threshold
+        for other in self.candidates(signature):
+            if other in exclude:
+                continue
+            self.compared += 1
+            score = similarity(signature, self._signatures[other])
+            if score >= best_score:
+                best, best_score = other, score
+        return best
+
+    def _regroup(self, urls):
+        """대표 글의 내용이 바뀐 묶음: 남은 글을 들어온 순서대로 다시 비교해 대표 글을 새로 정함
+
+        아직 다시 비교하지 않은 글은 후보에서 빼므로, 서로 비슷하면 먼저 들어온 글이 대표가 됩니다.
+        """
+        waiting = set(urls)
+        for url in urls:
+            best = self._best_match(self._signatures[url], exclude=waiting)
+            waiting.discard(url)
+            canonical = self._canonical[best] if best else url
+            self._leave(url, self._canonical[url])
+            self._canonical[url] = canonical
+            self._members.setdefault(canonical, {})[url] = None
+            self.conn.execute("UPDATE signatures SET canonical = ? WHERE url = ?", (canonical, url))
+            self._unsaved += 1
+
+    def check(self, post_data):
+        """글 등록 → 먼저 들어온 비슷한 글(대표)이 있으면 {'url', 'title'}, 없으면 None"""
+        signature = minhash(post_data['content'])
+        if signature is None:
+            return None
+        url = post_data['url']
+
+        with self._lock:
+            if url in self._signatures:
+                if self._signatures[url] == signature:
+                    canonical = self._canonical[url]
+                    if canonical != url and canonical in self._titles:
+                        self.duplicates += 1
+                        return {'url': canonical, 'title': self._titles[canonical]}
+                    if canonical == url:
+                        return None
+                # 내용이 바뀌었거나 대표 글이 지워짐 → 다시 비교
+                self._forget(url)
+
+            # 이 글을 대표로 둔 글 (들어온 순서) - 이 글의 내용이 바뀌면 더 이상 중복이 아닐 수 있음
+            followers = list(self._members.get(url, ()))
+            best = self._best_match(signature, exclude=set(followers))
+            canonical = self._canonical[best] if best else url
+            self._remember(url, post_data['title'], signature, canonical)
+            self.conn.execute("INSERT OR REPLACE INTO signatures (url, title, signature, canonical) VALUES (?, ?, ?, ?)",
+                              (url, post_data['title'], signature.tobytes(), canonical))
+            self._unsaved += 1
+            if followers:
+                self._regroup(followers)
+            if self._unsaved >= COMMIT_EVERY:
+                self.conn.commit()
+                self._unsaved = 0
+            if canonical == url:
+                return None
+            self.duplicates += 1
+            return {'url': canonical, 'title': self._titles[canonical]}
+
+    def clusters(self):
+        """대표 글 URL → 묶음의 글 URL 목록 (2개 이상인 묶음만)"""
+        return {canonical: list(urls) for canonical, urls in self._members.items() if len(urls) > 1}
+
+    def print_stats(self):
+        print(f"🧬 중복 글: 이번 실행 {self.duplicates}개 | 묶음 {len(self.clusters())}개 | "
+              f"글 {len(self):,}개 | 후보 비교 {self.compared:,}회")
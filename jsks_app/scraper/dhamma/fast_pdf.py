@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 빠른 PDF (fpdf2) - WeasyPrint 없이 단순한 레이아웃으로 바로 PDF
+
+WeasyPrint는 HTML / CSS 레이아웃에 Pango 등 시스템 라이브러리가 필요합니다. 여기서는
+제목 / 날짜·출처 / 본문 문단 / 쪽 번호만 fpdf2로 바로 찍습니다 (본문은 content_html 대신
+텍스트 content 사용, 표 / 그림 / 강조는 없음).
+
+    - 번들 폰트 fonts/NanumGothic.ttf 사용 (시스템 폰트 불필요)
+    - 폰트는 fpdf2 공개 API(add_font)로 문서마다 등록 (문서 1개 = FPDF 1개)
+      워커당 한 번만 읽는 캐시는 없음: 공개 API로는 읽어 둔 폰트를 넘길 수 없고, FPDF를 복사하면
+      폰트가 공유된 채 output()이 부분집합을 제자리에서 잘라내 다음 문서가 깨짐
+    - 색 / 크기는 render_engine.STYLESHEET와 같게, LAYOUT을 바꾸면 지문이 바뀌어 다시 렌더링
+
+RenderEngine 워커에서 PdfRenderer 대신 쓰입니다 (fetch --format fpdf, render-pdf --fast):
+    python3 -m dhamma render-pdf posts/ pdfs/ --fast
+"""
+
+import json
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from .render_engine import fingerprint
+from .settings import FONT_PATH
+
+# DhammaPDF 코드를 바꾸면 올림 (LAYOUT / 폰트는 지문에 자동 포함)
+LAYOUT_VERSION = '1'
+
+FONT_FAMILY = 'NanumGothic'
+
+# 크기는 pt, 여백은 mm, 색은 RGB (STYLESHEET와 같은 값)
+LAYOUT = {
+    'margin': 20,
+    'title_size': 24,
+    'title_color': (0x2c, 0x3e, 0x50),
+    'rule_color': (0x34, 0x98, 0xdb),
+    'meta_size': 10,
+    'meta_color': (0x7f, 0x8c, 0x8d),
+    'meta_fill': (0xec, 0xf0, 0xf1),
+    'body_size': 12,
+    'body_color': (0x33, 0x33, 0x33),
+    'line_height': 1.8,
+    'footer_size': 9,
+    'footer_color': (0x95, 0xa5, 0xa6),
+}
+
+FOOTER_TEXT = "본 문서는 dhamma.kr에서 수집한 내용입니다."
+
+# 워커로 넘기는 글 데이터 필드 (본문 HTML은 쓰지 않음)
+FIELDS = ('title', 'date', 'url', 'content')
+
+
+def layout_fingerprint(font_path=FONT_PATH):
+    """레이아웃 지문: LAYOUT_VERSION + LAYOUT + 폰트 파일 내용 해시"""
+    return fingerprint(f"fpdf{LAYOUT_VERSION}", (json.dumps(LAYOUT, sort_keys=True), FOOTER_TEXT), font_path)
+
+
+def _pt(size):
+    """pt → mm"""
+    return size * 25.4 / 72
+
+
+def paragraphs(content):
+    """본문 텍스트 → 빈 줄을 뺀 문단 목록"""
+    return [line.strip() for line in content.split('\n') if line.strip()]
+
+
+class DhammaPDF(FPDF):
+    """한글(NanumGothic) 단순 레이아웃 PDF - 글마다 write_post()"""
+
+    def __init__(self, font_path=FONT_PATH):
+        super().__init__(format='A4')
+        margin = LAYOUT['margin']
+        self.set_margins(margin, margin, margin)
+        self.set_auto_page_break(True, margin=margin)
+        self.add_font(FONT_FAMILY, '', font_path)
+
+    def footer(self):
+        # 쪽 번호: 오른쪽 아래 "3 / 12"
+        self.set_y(-LAYOUT['margin'] * 0.75)
+        self.set_font(FONT_FAMILY, size=LAYOUT['footer_size'])
+        self.set_text_color(*LAYOUT['meta_color'])
+        self.cell(0, _pt(LAYOUT['footer_size']), f"{self.page_no()} / {{nb}}", align='R')
+
+    def _block(self, size, color, text, line_height=1.4, **options):
+        self.set_font(FONT_FAMILY, size=size)
+        self.set_text_color(*color)
+        self.multi_cell(0, _pt(size * line_height), text, new_x=XPos.LMARGIN, new_y=YPos.NEXT, **options)
+
+    def write_post(self, post_data):
+        """글 1개를 새 페이지부터: 제목 + 밑줄 / 날짜·출처 상자 / 본문 문단 / 출처 안내"""
+        self.add_page()
+        self._block(LAYOUT['title_size'], LAYOUT['title_color'], post_data['title'])
+
+        y = self.get_y() + 1
+        self.set_draw_color(*LAYOUT['rule_color'])
+        self.set_line_width(1)
+        self.line(self.l_margin, y, self.w - self.r_margin, y)
+        self.set_y(y + 6)
+
+        self.set_fill_color(*LAYOUT['meta_fill'])
+        self._block(LAYOUT['meta_size'], LAYOUT['meta_color'],
+                    f"날짜: {post_data['date']}\n출처: {post_data['url']}", fill=True, padding=(2, 3))
+        self.ln(8)
+
+        body = _pt(LAYOUT['body_size'])
+        for paragraph in paragraphs(post_data['content']):
+            self._block(LAYOUT['body_size'], LAYOUT['body_color'], paragraph,
+                        line_height=LAYOUT['line_height'], align='J')
+            self.ln(body * 0.5)
+
+        self.ln(10)
+        self._block(LAYOUT['footer_size'], LAYOUT['footer_color'], FOOTER_TEXT, align='C')
+
+
+class FastPdfRenderer:
+    """fpdf2 렌더러 (PdfRenderer와 같은 인터페이스, RenderEngine 워커에서 사용)
+
+    워커로는 HTML 대신 글 데이터 JSON 파일(FIELDS만)을 넘깁니다.
+    """
+
+    suffix = '.json'
+
+    def __init__(self, font_path=FONT_PATH):
+        self.font_path = font_path
+
+    @staticmethod
+    def write_document(f, post_data):
+        json.dump({field: post_data.get(field, '') for field in FIELDS}, f, ensure_ascii=False)
+
+    def render(self, post_data, filepath):
+        """글 1개를 PDF 파일로"""
+        pdf = DhammaPDF(self.font_path)
+        pdf.write_post(post_data)
+        pdf.output(filepath)
+        return filepath
+
+    def render_file(self, document_path, filepath, volume=False):
+        """write_document로 쓴 JSON 파일 → PDF"""
+        if volume:
+            raise ValueError("fpdf 렌더러는 묶음 PDF를 만들지 않습니다 (render-volumes는 WeasyPrint)")
+        with open(document_path, encoding='utf-8') as f:
+            return self.render(json.load(f), filepath)
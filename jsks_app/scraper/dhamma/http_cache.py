@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr HTTP 응답 캐시 (SQLite) - 재크롤링 시 조건부 GET
+
+글 URL별로 ETag / Last-Modified와 압축한 본문을 저장해 두고, 다음 실행에서
+If-None-Match / If-Modified-Since를 보냅니다. 서버가 304를 돌려주면 본문을
+다시 받지 않고, 호출하는 쪽은 파싱 / 렌더링을 건너뜁니다.
+
+캐시 크기는 max_bytes(압축 후 본문 합계)로 제한하며, 넘으면 가장 오래 사용하지
+않은 항목부터 지웁니다 (LRU).
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+
+# 기본 캐시 크기 제한 (압축된 본문 기준)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# LRU 정리 시 한 번에 지우는 항목 수
+EVICT_BATCH = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+
+class HttpCache:
+    """URL → (ETag, Last-Modified, 압축 본문) 캐시 (여러 워커 스레드에서 공유)"""
+
+    def __init__(self, db_path, max_bytes=DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0       # 304 (본문 재사용)
+        self.misses = 0     # 200 (본문 새로 받음)
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        (self.total_bytes,) = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def conditional_headers(self, url):
+        """조건부 GET 헤더 (캐시에 없으면 빈 dict)"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return {}
+
+        etag, last_modified = row
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def not_modified(self, url):
+        """304 응답 처리: 사용 시각 갱신 후 캐시된 본문 반환 (없으면 None)"""
+        with self._lock:
+            row = self.conn.execute("SELECT body FROM responses WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+            self.hits += 1
+        return zlib.decompress(row[0])
+
+    def store(self, url, headers, content):
+        """200 응답 저장 (검증 헤더가 없으면 다음에 조건부 GET을 할 수 없으므로 저장하지 않음)"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+
+        with self._lock:
+            self.misses += 1
+            old = self.conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            if old:
+                self.total_bytes -= old[0]
+
+            if not etag and not last_modified:
+                if old:
+                    self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                    self.conn.commit()
+                return
+
+            body = zlib.compress(content)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, last_modified, body, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, len(body), time.time()),
+            )
+            self.total_bytes += len(body)
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """max_bytes를 넘으면 오래 사용하지 않은 항목부터 삭제 (잠금 안에서 호출)"""
+        while self.total_bytes > self.max_bytes:
+            rows = self.conn.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at LIMIT ?", (EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            for url, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self.total_bytes -= size
+                self.evicted += 1
+
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def print_stats(self):
+        """캐시 적중률 출력"""
+        print(f"\n💾 HTTP 캐시: 304 {self.hits}개 / 200 {self.misses}개 | 적중률 {self.hit_ratio():.1%} | "
+              f"저장 {len(self)}개 ({self.total_bytes / 1024 / 1024:.1f}MB, LRU 삭제 {self.evicted}개)")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 공용 HTTP 클라이언트 - 연결 재사용(keep-alive) + 재시도 정책
+
+- requests.Session 하나를 모든 워커 스레드가 공유 (연결 풀 크기 = 동시성)
+- 5xx / 429 / 연결 오류 / 타임아웃은 지수 백오프로 재시도
+- 429 / 503의 Retry-After 헤더를 따름 (최대 MAX_RETRY_AFTER초)
+- cache(HttpCache)가 있으면 fetch / get_content는 조건부 GET, 304면 NotModified
+  (304인데 캐시 항목이 지워졌으면 CacheMiss: 다시 요청은 호출한 쪽 조절기가)
+- metrics(Metrics)가 있으면 요청마다 지연 시간 / 응답 코드 / 받은 바이트 / 연결 오류 분류를 집계
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import time
+import urllib3
+
+from .metrics import error_kind
+
+# SSL 경고 무시
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 10
+
+# 재시도할 응답 코드
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+USER_AGENT = "Mozilla/5.0 (compatible; dhamma-scraper)"
+
+
+class _CappedRetry(Retry):
+    """Retry-After가 너무 길면 MAX_RETRY_AFTER초까지만 대기"""
+
+    MAX_RETRY_AFTER = 60
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.MAX_RETRY_AFTER)
+
+
+class NotModified(Exception):
+    """조건부 GET 결과 304 - 지난번에 받은 본문(content)이 그대로 유효"""
+
+    def __init__(self, url, content):
+        super().__init__(f"304 Not Modified: {url}")
+        self.url = url
+        self.content = content
+
+
+class CacheMiss(Exception):
+    """조건부 GET 결과 304인데 그 사이 캐시 항목이 지워짐 - 조건 없이 다시 요청해야 함"""
+
+    def __init__(self, url):
+        super().__init__(f"304 Not Modified, 캐시 항목 없음: {url}")
+        self.url = url
+
+
+class FetchClient:
+    """연결 풀 + 재시도가 적용된 GET 클라이언트 (스레드 간 공유)"""
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, timeout=DEFAULT_TIMEOUT, verify=False, cache=None, metrics=None):
+        self.timeout = timeout
+        self.verify = verify
+        self.cache = cache
+        self.metrics = metrics
+
+        retry = _CappedRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # pool_block: 동시 요청이 풀 크기를 넘으면 새 연결을 만들지 않고 대기
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, pool_block=True, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, **kwargs):
+        """GET 요청 (재시도 후에도 5xx면 마지막 응답을 그대로 반환)"""
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('verify', self.verify)
+        if self.metrics is None:
+            return self.session.get(url, **kwargs)
+
+        started = time.monotonic()
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.RequestException as e:
+            self.metrics.inc('http_errors_total', kind=error_kind(e))
+            raise
+        self.metrics.observe('http_request_seconds', time.monotonic() - started)
+        self.metrics.inc('http_responses_total', status=str(response.status_code))
+        self.metrics.inc('http_bytes_total', len(response.content))
+        return response
+
+    def fetch(self, url):
+        """GET 후 200이 아니면 예외, 200이면 응답 (응답 코드 / 헤더가 필요할 때, 예: 원본 보관소)
+
+        cache가 있으면 저장된 ETag / Last-Modified로 조건부 요청을 보내고,
+        304면 캐시된 본문을 담아 NotModified를 던집니다. 304인데 캐시 항목이 그 사이 LRU로
+        지워졌으면 CacheMiss를 던집니다: 여기서 바로 다시 요청하면 속도 조절을 거치지 않으므로
+        호출한 쪽(AdaptiveRateLimiter.call)이 슬롯을 기다려 다시 부릅니다 (캐시에 없으니 조건 없는 GET).
+        """
+        if self.cache is None:
+            response = self.get(url)
+            response.raise_for_status()
+            return response
+
+        response = self.get(url, headers=self.cache.conditional_headers(url))
+        if response.status_code == 304:
+            content = self.cache.not_modified(url)
+            if content is not None:
+                raise NotModified(url, content)
+            raise CacheMiss(url)
+
+        response.raise_for_status()
+        self.cache.store(url, response.headers, response.content)
+        return response
+
+    def get_content(self, url):
+        """fetch()의 본문 bytes"""
+        return self.fetch(url).content
+
+    def close(self):
+        self.session.close()
+
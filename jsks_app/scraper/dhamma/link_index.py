@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 글 링크 색인 - 발견 순서를 유지하는 O(1) 중복 제거 + URL 정규화
+
+같은 글이 여러 형태의 URL로 나타나도 하나로 취급합니다:
+    http://www.dhamma.kr/wp/?p=17762
+    https://dhamma.kr/wp/?p=17762
+    http://www.dhamma.kr/wp?p=17762&replytocom=5#comments
+"""
+
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import re
+
+# 쿼리 문자열 안의 p=번호
+_POST_ID = re.compile(r'(?:^|&)p=(\d+)(?:&|$)')
+
+
+def post_id(url):
+    """글 URL의 ?p= 번호 (없으면 None)"""
+    match = _POST_ID.search(urlsplit(url).query)
+    return int(match.group(1)) if match else None
+
+
+def normalize_url(url):
+    """중복 판단용 정규화 URL
+
+    - http/https 구분 없음, 호스트 소문자 + www. 제거
+    - 경로 끝 슬래시 제거, #fragment 제거
+    - ?p=번호 글은 다른 쿼리 파라미터를 무시
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/')
+
+    match = _POST_ID.search(parts.query)
+    if match:
+        query = f"p={int(match.group(1))}"
+    else:
+        query = urlencode(sorted(parse_qsl(parts.query)))
+
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+class LinkIndex:
+    """발견 순서를 유지하는 글 링크 집합 (dict 기반, 추가/검사 O(1))
+
+    처음 발견한 원래 URL을 그대로 돌려주므로 기존 파일명 / 상태 DB 키가 바뀌지 않습니다.
+    """
+
+    def __init__(self, urls=()):
+        self._links = {}
+        for url in urls:
+            self.add(url)
+
+    def add(self, url):
+        """새 글이면 추가하고 True, 이미 있으면 False"""
+        key = normalize_url(url)
+        if key in self._links:
+            return False
+        self._links[key] = url
+        return True
+
+    def __contains__(self, url):
+        return normalize_url(url) in self._links
+
+    def __len__(self):
+        return len(self._links)
+
+    def __iter__(self):
+        return iter(self._links.values())
+
+    def urls(self):
+        """발견 순서대로 원래 URL 리스트"""
+        return list(self._links.values())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 글 목록 병렬 수집기 - 동시 요청 수 + 초당 요청 수 조절기(AdaptiveRateLimiter)로 제어
+
+전체 수집은 먼저 마지막 목록 페이지를 찾고(지수 탐색 + 이진 탐색, 요청 O(log n)회)
+1 ~ 마지막 페이지를 워커들이 나눠 받습니다. 오래된 페이지 수 상수를 믿거나
+빈 페이지까지 가 봐야 끝을 아는 대신, 처음부터 정확한 범위로 시작합니다.
+"""
+
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import time
+
+from .http_client import DEFAULT_RETRIES, FetchClient
+from .link_index import LinkIndex
+from .rate_control import AdaptiveRateLimiter
+from .settings import MAX_PAGES
+
+# 기본 동시성 / 서버 부하 예산 (초당 요청 수)
+DEFAULT_WORKERS = 8
+DEFAULT_RPS = 5.0
+
+
+def page_url(base_url, page):
+    """목록 페이지 URL 생성"""
+    return f"{base_url}?paged={page}" if page > 1 else base_url
+
+
+def parse_listing_page(content):
+    """목록 페이지에서 글 링크 추출 (글 목록이 없으면 None)"""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    # dhamma.kr 전용: <div class="post"> 안의 <a class="title"> 찾기
+    posts = soup.find_all('div', class_='post')
+    if not posts:
+        return None
+
+    links = []
+    for post in posts:
+        title_link = post.find('a', class_='title')
+        if title_link and title_link.get('href'):
+            links.append(title_link['href'])
+    return links
+
+
+def is_listing_end(status, links):
+    """목록의 끝인지: 글이 없는 200 페이지 또는 404만 (그 밖의 실패는 일시적일 수 있음)"""
+    return status == 404 or (status == 200 and links is None)
+
+
+def fetch_listing_page(base_url, page, limiter, client):
+    """목록 페이지 1개 요청 → (status, links) (limiter가 응답을 보고 속도 조절)"""
+    response = limiter.call(client.get, page_url(base_url, page))
+    if response.status_code != 200:
+        return response.status_code, None
+    return response.status_code, parse_listing_page(response.content)
+
+
+def last_page_search(hint=None):
+    """마지막 목록 페이지 탐색 (제너레이터)
+
+    확인할 페이지 번호를 yield하고, send(그 페이지에 글이 있는지)로 결과를 받습니다.
+    끝나면 마지막 페이지 번호를 돌려줍니다 (StopIteration.value, 글이 하나도 없으면 0).
+    hint(예상 마지막 페이지)부터 확인해서, 글이 있으면 1, 2, 4, 8... 칸씩 뒤로 가며
+    빈 페이지를 찾고, 없으면 1 ~ hint 사이에서 이진 탐색합니다.
+    hint가 실제와 d만큼 차이 나면 요청 약 2·log2(d)회 (hint가 없으면 2·log2(n)회).
+    """
+    hint = max(1, hint or 1)
+
+    if (yield hint):
+        # 지수 탐색: lo는 글이 있는 페이지, hi는 빈 페이지
+        lo, step = hint, 1
+        while (yield lo + step):
+            lo += step
+            step *= 2
+        hi = lo + step
+    else:
+        # 0페이지는 "글이 있다"고 보고 시작 (1페이지도 비었으면 0)
+        lo, hi = 0, hint
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if (yield mid):
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def probe_listing_page(base_url, page, limiter, client):
+    """목록 페이지에 글이 있는지 (빈 페이지 / 404면 False, 그 밖의 실패는 RuntimeError)"""
+    status, links = fetch_listing_page(base_url, page, limiter, client)
+    if is_listing_end(status, links):
+        return False
+    if status != 200:
+        # 일시적인 서버 오류를 끝으로 착각하면 뒤쪽 페이지를 통째로 잃음
+        raise RuntimeError(f"페이지 {page} 접근 실패 (status: {status})")
+    return True
+
+
+def find_last_page(base_url, hint=MAX_PAGES, client=None, limiter=None):
+    """마지막 목록 페이지 번호 찾기 (last_page_search를 요청으로 진행)"""
+    limiter = limiter or AdaptiveRateLimiter(DEFAULT_RPS, retries=DEFAULT_RETRIES)
+    client = client or FetchClient(retries=0)
+    search = last_page_search(hint)
+    probes = 0
+    started = time.monotonic()
+
+    try:
+        page = next(search)
+        while True:
+            probes += 1
+            page = search.send(probe_listing_page(base_url, page, limiter, client))
+    except StopIteration as done:
+        last_page = done.value
+
+    elapsed = time.monotonic() - started
+    print(f"   🔎 마지막 목록 페이지: {last_page:,} (예상 {hint:,}, 요청 {probes}회, {elapsed:.1f}초)")
+    return last_page
+
+
+def discover_last_page(base_url, state=None, client=None, limiter=None):
+    """마지막 목록 페이지 찾기 - 지난 실행 값(상태 DB)이 있으면 그 근처부터 (실패하면 None)"""
+    hint = MAX_PAGES
+    if state and state.get_meta('last_page'):
+        hint = int(state.get_meta('last_page'))
+
+    try:
+        last_page = find_last_page(base_url, hint, client, limiter)
+    except Exception as e:
+        print(f"   ⚠️  마지막 페이지를 찾지 못했습니다: {e}")
+        return None
+
+    if state:
+        state.set_meta('last_page', last_page)
+    return last_page
+
+
+def get_all_post_links(base_url, max_pages=None, workers=DEFAULT_WORKERS, rps=DEFAULT_RPS, state=None,
+                       client=None, limiter=None):
+    """모든 글의 링크 수집 (페이지는 순서 없이 받고, 결과는 페이지 순서로 병합)
+
+    state(CrawlState)를 넘기면 이미 받은 페이지는 다시 요청하지 않고,
+    새로 받은 페이지는 바로 저장합니다. client(FetchClient)가 없으면
+    워커 수만큼 연결을 유지하는 클라이언트를 새로 만듭니다. limiter(AdaptiveRateLimiter)가
+    없으면 초당 rps회로 시작하는 조절기를 새로 만듭니다 (재시도는 조절기가, 클라이언트는 retries=0).
+    max_pages가 None이면 마지막 페이지를 먼저 찾습니다 (못 찾으면 MAX_PAGES까지 가며 빈 페이지로 판단).
+    찾은 마지막 페이지는 상태 DB에 남겨, 수집이 중간에 끊긴 뒤 다시 실행하면 탐색 없이 그대로 씁니다.
+    1 ~ 마지막 페이지를 빠짐없이 받으면 저장한 페이지를 비웁니다 (새 글이 올라오면 글이 뒤 페이지로
+    밀리므로, 다음 실행은 1페이지부터 다시 받음).
+    글이 없는 페이지나 404만 목록의 끝으로 보고, 그 밖의 실패(5xx 등)는 그 페이지만 저장하지 않고
+    건너뜁니다 (다음 실행에서 다시 요청).
+    """
+    limiter = limiter or AdaptiveRateLimiter(rps, retries=DEFAULT_RETRIES)
+    print(f"📡 글 목록 수집 중... (워커 {workers}개, 시작 속도 {limiter.status()})")
+
+    client = client or FetchClient(pool_size=workers, retries=0)
+    page_links = state.page_links() if state else {}
+    saved_last_page = int(state.get_meta('last_page')) if state and state.get_meta('last_page') else None
+    if max_pages is None and saved_last_page and page_links and any(page not in page_links
+                                                                    for page in range(1, saved_last_page + 1)):
+        # 중단된 수집 이어서 (끝난 수집은 페이지를 비움): 지난번 찾은 마지막 페이지를 그대로 (탐색 요청 없음)
+        last_page = saved_last_page
+        print(f"   ♻️  지난번 찾은 마지막 목록 페이지 {last_page:,} 재사용")
+    elif max_pages is None:
+        last_page = discover_last_page(base_url, state, client, limiter) or MAX_PAGES
+    else:
+        last_page = max_pages
+        if saved_last_page:
+            last_page = min(max_pages, saved_last_page)
+    if page_links:
+        print(f"   ♻️  저장된 페이지 {len(page_links)}개 재사용")
+    next_page = 1
+    failed = []
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = {}
+
+        while in_flight or next_page <= last_page:
+            # 워커 수의 2배까지만 미리 제출 (끝 페이지를 넘어서는 요청 최소화)
+            while next_page <= last_page and len(in_flight) < workers * 2:
+                if next_page in page_links:
+                    next_page += 1
+                    continue
+                future = executor.submit(fetch_listing_page, base_url, next_page, limiter, client)
+                in_flight[future] = next_page
+                next_page += 1
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = in_flight.pop(future)
+                if page > last_page:
+                    continue
+
+                try:
+                    status, links = future.result()
+                except Exception as e:
+                    print(f"   ⚠️  페이지 {page} 오류: {e}")
+                    failed.append(page)
+                    continue
+
+                if is_listing_end(status, links):
+                    if status == 404:
+                        print(f"   ⚠️  페이지 {page} 없음 (status: 404)")
+                    else:
+                        print(f"   ⚠️  페이지 {page}에서 글을 찾을 수 없습니다.")
+                    # 끝 페이지 확정: 이후 페이지는 더 이상 요청하지 않음
+                    last_page = min(last_page, page - 1)
+                    if state:
+                        state.set_meta('last_page', last_page)
+                    for pending, pending_page in in_flight.items():
+                        if pending_page > last_page:
+                            pending.cancel()
+                    continue
+                if status != 200:
+                    # 일시적인 서버 오류를 끝으로 보지 않음: 저장하지 않고 다음 실행에서 다시 요청
+                    print(f"   ⚠️  페이지 {page} 접근 실패 (status: {status}), 건너뜀")
+                    failed.append(page)
+                    continue
+
+                page_links[page] = links
+                if state:
+                    state.save_page(page, links)
+                if len(page_links) % 50 == 0:
+                    elapsed = time.monotonic() - started
+                    print(f"   ✅ {len(page_links)}/{last_page} 페이지 완료 ({elapsed:.0f}초, {limiter.status()})")
+
+    # 페이지 순서대로 병합 (정규화 URL 기준 중복 제거)
+    index = LinkIndex()
+    for page in sorted(page_links):
+        if page > last_page:
+            continue
+        for href in page_links[page]:
+            index.add(href)
+    post_links = index.urls()
+
+    elapsed = time.monotonic() - started
+    print(f"\n✅ 총 {len(post_links)}개의 글을 찾았습니다. ({elapsed:.0f}초)")
+    failed = [page for page in failed if page <= last_page]
+    if failed:
+        print(f"   ⚠️  받지 못한 목록 페이지 {len(failed)}개 (다음 실행에서 다시 요청): "
+              f"{', '.join(map(str, sorted(failed)[:10]))}{' …' if len(failed) > 10 else ''}")
+    elif state and all(page in page_links for page in range(1, last_page + 1)):
+        # 목록 수집 완료: 저장한 페이지는 이번 실행에서만 유효 (다음 실행은 처음부터)
+        state.clear_pages()
+        print(f"   🧹 목록 페이지 {last_page:,}개를 모두 받아 저장한 페이지를 비웠습니다.")
+    limiter.print_stats("글 목록")
+    return post_links
+
+
+def get_new_post_links(base_url, known_urls, max_pages=None, workers=2, rps=DEFAULT_RPS, client=None,
+                       limiter=None):
+    """새 글 링크만 수집 (증분 모드)
+
+    dhamma.kr은 최신 글이 1페이지에 오므로 1페이지부터 차례로 확인하다가
+    전부 이미 아는 글로만 된 페이지를 만나면 멈춥니다 (max_pages가 None이면 빈 페이지까지).
+    """
+    print(f"📡 새 글 확인 중... (이미 아는 글 {len(known_urls)}개)")
+
+    limiter = limiter or AdaptiveRateLimiter(rps, retries=DEFAULT_RETRIES)
+    client = client or FetchClient(pool_size=workers, retries=0)
+    new_links = []
+    seen = LinkIndex(known_urls)
+    page = 1
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while max_pages is None or page <= max_pages:
+            # 워커 수만큼 페이지를 한 번에 요청하고 페이지 순서대로 확인
+            stop = page + workers if max_pages is None else min(page + workers, max_pages + 1)
+            batch = list(range(page, stop))
+            futures = [executor.submit(fetch_listing_page, base_url, p, limiter, client) for p in batch]
+
+            for p, future in zip(batch, futures):
+                try:
+                    status, links = future.result()
+                except Exception as e:
+                    # 어디까지 새 글인지 알 수 없으므로 여기서 중단
+                    print(f"   ⚠️  페이지 {p} 오류: {e}")
+                    return new_links
+
+                if status == 404:
+                    print(f"   ⚠️  페이지 {p} 없음 (status: 404)")
+                    return new_links
+                if status != 200:
+                    print(f"   ⚠️  페이지 {p} 접근 실패 (status: {status}), 중단")
+                    return new_links
+                if links is None:
+                    print(f"   ⚠️  페이지 {p}에서 글을 찾을 수 없습니다.")
+                    return new_links
+
+                fresh = [href for href in links if seen.add(href)]
+                if not fresh:
+                    elapsed = time.monotonic() - started
+                    print(f"   ✅ 페이지 {p}: 모두 이미 받은 글 → 중단 ({elapsed:.1f}초)")
+                    print(f"\n✅ 새 글 {len(new_links)}개를 찾았습니다.")
+                    return new_links
+
+                new_links.extend(fresh)
+                print(f"   ✅ 페이지 {p}: 새 글 {len(fresh)}개")
+
+            page = batch[-1] + 1
+
+    print(f"\n✅ 새 글 {len(new_links)}개를 찾았습니다.")
+    return new_links
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 출력 매니페스트 (SQLite) - 저장 폴더마다 어떤 글을 어떤 내용으로 저장했는지
+
+    pdfs/.manifest.db   (출력 형식, 글 ID) → 제목, 파일 경로, 내용 해시, 템플릿 버전
+
+파일명은 "제목 (글 ID).pdf"라서 제목이 같은 글도 서로 덮어쓰지 않고, 다시 실행할 때
+내용 해시와 템플릿 버전이 같고 파일이 남아 있는 글은 렌더링하지 않습니다.
+제목이 바뀌어 파일명이 달라지면 예전 파일은 지웁니다.
+
+meta 테이블에는 형식별 문서당 평균 저장 시간을 남겨 --dry-run 예상 시간에 씁니다.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+FILENAME = '.manifest.db'
+
+# 다시 저장해야 하는 이유 (change)
+NEW = '새 글'
+MISSING = '파일 없음'
+CONTENT = '내용 변경'
+TEMPLATE = '템플릿 변경'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    output TEXT NOT NULL,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    path TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    template TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (output, id)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class Manifest:
+    """저장 폴더 1개의 매니페스트 (여러 워커 스레드에서 공유)
+
+    경로는 폴더 기준 상대 경로로 저장하므로 폴더를 옮겨도 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.db_path = os.path.join(output_dir, FILENAME)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _absolute(self, path):
+        return os.path.join(self.output_dir, path)
+
+    def get(self, output, post_id):
+        """(제목, 절대 경로, 내용 해시, 템플릿 버전) 또는 None"""
+        with self._lock:
+            row = self.conn.execute("SELECT title, path, hash, template FROM entries WHERE output = ? AND id = ?",
+                                    (output, post_id)).fetchone()
+        if row is None:
+            return None
+        title, path, digest, template = row
+        return title, self._absolute(path), digest, template
+
+    def change(self, output, post_id, digest, template):
+        """다시 저장해야 하는 이유 (NEW / MISSING / CONTENT / TEMPLATE), 최신이면 None"""
+        return _change(self.get(output, post_id), digest, template)
+
+    def current_path(self, output, post_id, digest, template):
+        """내용 해시 / 템플릿 버전이 같고 파일이 남아 있으면 그 경로, 아니면 None"""
+        entry = self.get(output, post_id)
+        return entry[1] if _change(entry, digest, template) is None else None
+
+    def record(self, output, post_id, title, path, digest, template):
+        """저장 완료 기록 (경로가 바뀌었으면 예전 파일 삭제)"""
+        relative = os.path.relpath(path, self.output_dir)
+        with self._lock:
+            row = self.conn.execute("SELECT path FROM entries WHERE output = ? AND id = ?",
+                                    (output, post_id)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (output, id, title, path, hash, template, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (output, post_id, title, relative, digest, template, time.time()),
+            )
+            self.conn.commit()
+            if row and row[0] != relative:
+                still_used = self.conn.execute("SELECT 1 FROM entries WHERE path = ?", (row[0],)).fetchone()
+                if not still_used and os.path.exists(self._absolute(row[0])):
+                    os.remove(self._absolute(row[0]))
+
+    def entries(self, output):
+        """형식별 전체 항목 → [(글 ID, 제목, 절대 경로, 내용 해시, 템플릿 버전)]"""
+        with self._lock:
+            rows = self.conn.execute("SELECT id, title, path, hash, template FROM entries WHERE output = ? ORDER BY id",
+                                     (output,)).fetchall()
+        return [(post_id, title, self._absolute(path), digest, template) for post_id, title, path, digest, template in rows]
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+            self.conn.commit()
+
+
+def _change(entry, digest, template):
+    if entry is None:
+        return NEW
+    if not os.path.exists(entry[1]):
+        return MISSING
+    if entry[2] != digest:
+        return CONTENT
+    if entry[3] != template:
+        return TEMPLATE
+    return None
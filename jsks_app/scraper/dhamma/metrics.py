@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 크롤링 계측 - 스테이지별 카운터 / 지연 시간 히스토그램 / 받은 바이트 / 큐 깊이 / 오류 분류
+
+print로 찍던 진행 상황 대신, 어디에 시간이 드는지 기계가 읽을 수 있게 남깁니다:
+    - JSON lines 파일 (--metrics): interval초마다 전체 지표 스냅숏 1줄 + 글 1개의 스테이지마다 스팬 1줄
+    - Prometheus 텍스트 형식 (--metrics-port): http://127.0.0.1:포트/metrics
+
+    python3 -m dhamma fetch --metrics logs/metrics.jsonl --metrics-port 9464
+
+지표 이름 (Prometheus에서는 앞에 dhamma_가 붙음):
+    http_request_seconds              요청 1개 지연 시간 (재시도 포함) 히스토그램
+    http_responses_total{status}      응답 코드별 개수
+    http_bytes_total                  받은 본문 바이트
+    http_errors_total{kind}           연결 오류 / 타임아웃 (응답 없음, 재시도마다 1번)
+    stage_seconds{stage}              fetch / parse / write(렌더링) 항목 1개 처리 시간 히스토그램
+    stage_items_total{stage,outcome}  ok / failed / skipped
+    stage_errors_total{stage,kind}    실패 분류: http_404, http_503, timeout, connection, no_result ...
+    queue_depth{stage}                스테이지 입력 큐 대기 개수
+    rate_limit_rps{limiter}           요청 속도 조절기의 지금 초당 요청 수
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import bisect
+import json
+import os
+import threading
+import time
+
+import requests
+
+from .settings import METRICS_INTERVAL
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PREFIX = 'dhamma_'
+
+
+def error_kind(error):
+    """실패 분류 이름 (예외 → http_404 / http_503 / timeout / connection / io / 예외 이름)"""
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        return f"http_{response.status_code}" if response is not None else 'http'
+    if isinstance(error, (requests.Timeout, TimeoutError)):
+        return 'timeout'
+    if isinstance(error, (requests.ConnectionError, ConnectionError)):
+        return 'connection'
+    if isinstance(error, OSError) and not isinstance(error, requests.RequestException):
+        return 'io'
+    return type(error).__name__.lower()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus histogram과 같은 의미)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """[(상한, 그 이하 개수)] (마지막은 +Inf)"""
+        total = 0
+        result = []
+        for bound, count in zip(list(self.buckets) + [float('inf')], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """구간 상한으로 어림한 분위수 (값이 없으면 None)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, total in self.cumulative():
+            if total >= target:
+                return bound if bound != float('inf') else self.buckets[-1]
+        return None
+
+
+class Metrics:
+    """크롤러 지표 모음 (모든 워커 스레드가 공유, with로 사용)
+
+    path를 주면 JSON lines 파일에 interval초마다 스냅숏을, span()마다 스팬을 추가하고,
+    port를 주면 127.0.0.1:port/metrics에서 Prometheus 텍스트 형식으로 보여줍니다.
+    둘 다 없어도 집계와 print_stats()는 동작합니다.
+    """
+
+    def __init__(self, path=None, port=None, interval=METRICS_INTERVAL):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.started = time.time()
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._file = None
+        self._server = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._file = open(path, 'a', encoding='utf-8')
+            self._thread = threading.Thread(target=self._write_loop, args=(interval,), daemon=True)
+            self._thread.start()
+        if port is not None:
+            self._server = self._serve(port)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def inc(self, name, value=1, **labels):
+        """카운터 증가"""
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """게이지 값 설정"""
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name, seconds, **labels):
+        """히스토그램에 값 1개 추가"""
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def error(self, stage, error):
+        """스테이지 실패 1개를 분류해서 집계 (error는 예외 또는 분류 이름)"""
+        kind = error if isinstance(error, str) else error_kind(error)
+        self.inc('stage_errors_total', stage=stage, kind=kind)
+        return kind
+
+    def add_collector(self, func):
+        """스냅숏 / 스크레이프 직전마다 func(metrics) 호출 (큐 깊이 같은 게이지 갱신용)"""
+        self._collectors.append(func)
+
+    def _collect(self):
+        for func in list(self._collectors):
+            try:
+                func(self)
+            except Exception:
+                pass
+
+    def span(self, stage, seconds, outcome, url=None, error=None):
+        """항목 1개의 스테이지 처리 기록 → 히스토그램 / 카운터 + JSON lines 스팬"""
+        self.observe('stage_seconds', seconds, stage=stage)
+        self.inc('stage_items_total', stage=stage, outcome=outcome)
+        if self._file is None:
+            return
+        record = {'type': 'span', 'time': round(time.time(), 3), 'stage': stage, 'url': url,
+                  'seconds': round(seconds, 4), 'outcome': outcome}
+        if error:
+            record['error'] = error
+        self._write(record)
+
+    def snapshot(self):
+        """전체 지표 dict (JSON lines 스냅숏 1줄)"""
+        self._collect()
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            gauges = [{'name': name, 'labels': dict(labels), 'value': value}
+                      for (name, labels), value in sorted(self.gauges.items())]
+            histograms = [{'name': name, 'labels': dict(labels), 'count': h.count, 'sum': round(h.sum, 4),
+                           'p50': h.quantile(0.5), 'p95': h.quantile(0.95),
+                           'buckets': {str(bound): total for bound, total in h.cumulative()}}
+                          for (name, labels), h in sorted(self.histograms.items())]
+        return {'type': 'snapshot', 'time': round(time.time(), 3), 'elapsed': round(time.time() - self.started, 1),
+                'counters': counters, 'gauges': gauges, 'histograms': histograms}
+
+    def prometheus(self):
+        """Prometheus 텍스트 형식 (exposition format 0.0.4)"""
+        self._collect()
+        lines = []
+        typed = set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name, 'counter')
+                lines.append(f"{PREFIX}{name}{_label_text(labels)} {value}")
+            for (name, labels), value in sorted(self.gauges.items()):
+                header(name, 'gauge')
+                lines.append(f"{PREFIX}{name}{_label_text(labels)} {value}")
+            for (name, labels), h in sorted(self.histograms.items()):
+                header(name, 'histogram')
+                for bound, total in h.cumulative():
+                    le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                    lines.append(f"{PREFIX}{name}_bucket{_label_text(labels, [('le', le)])} {total}")
+                lines.append(f"{PREFIX}{name}_sum{_label_text(labels)} {h.sum}")
+                lines.append(f"{PREFIX}{name}_count{_label_text(labels)} {h.count}")
+        return '\n'.join(lines) + '\n'
+
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + '\n')
+
+    def _write_loop(self, interval):
+        while not self._stop.wait(interval):
+            self._write(self.snapshot())
+            with self._lock:
+                if self._file is not None:
+                    self._file.flush()
+
+    def _serve(self, port):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"📈 지표: http://127.0.0.1:{server.server_port}/metrics")
+        return server
+
+    @property
+    def port(self):
+        return self._server.server_port if self._server else None
+
+    def close(self):
+        """마지막 스냅숏을 쓰고 파일 / 서버를 닫음"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self._file is not None:
+            self._write(self.snapshot())
+            with self._lock:
+                self._file.close()
+                self._file = None
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def print_stats(self):
+        """스테이지별 시간 합계 / 받은 바이트 / 오류 분류 출력"""
+        with self._lock:
+            stages = {dict(labels)['stage']: h for (name, labels), h in self.histograms.items()
+                      if name == 'stage_seconds'}
+            requests_seconds = self.histograms.get(('http_request_seconds', ()))
+            downloaded = sum(value for (name, _), value in self.counters.items() if name == 'http_bytes_total')
+            # 스테이지 실패(항목 1개당 1번)와 요청 오류(재시도마다)는 같은 실패를 두 번 셀 수 있어 따로 출력
+            errors = {}
+            request_errors = {}
+            for (name, labels), value in self.counters.items():
+                target = {'stage_errors_total': errors, 'http_errors_total': request_errors}.get(name)
+                if target is not None:
+                    kind = dict(labels)['kind']
+                    target[kind] = target.get(kind, 0) + value
+        if not stages and not downloaded:
+            return
+        print(f"\n📈 지표 (받은 데이터 {downloaded / 1024 / 1024:.1f}MB)")
+        # fetch 스테이지 시간 - 요청 시간 ≈ 속도 조절기 대기
+        if requests_seconds is not None and requests_seconds.count:
+            stages = {'request': requests_seconds, **stages}
+        for stage, h in stages.items():
+            p95 = h.quantile(0.95)
+            print(f"   {stage:<8} {h.count:>6}개 | 합계 {h.sum:8.1f}초 | 평균 {h.sum / h.count:.3f}초 | p95 ≤ {p95:g}초")
+        if errors:
+            print(f"   오류 분류: {', '.join(f'{kind} {count}' for kind, count in sorted(errors.items()))}")
+        if request_errors:
+            print(f"   요청 오류 (재시도 포함): "
+                  f"{', '.join(f'{kind} {count}' for kind, count in sorted(request_errors.items()))}")
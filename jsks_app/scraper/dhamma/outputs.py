@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 출력 형식 플러그인 - 수집한 글 데이터(dict)를 파일로 저장
+
+모든 형식이 같은 목록 수집 / 본문 다운로드 / 파싱 엔진을 쓰고, 마지막
+저장 단계만 다릅니다. 새 형식은 Output을 상속하고 @register_output으로
+등록하면 CLI의 --format에 바로 나타납니다.
+
+    txt   텍스트 파일 (texts/)
+    pdf   WeasyPrint PDF, 프로세스 풀 렌더링 (pdfs/)
+    fpdf  fpdf2 빠른 PDF, 단순 레이아웃 + 프로세스 풀 렌더링 (pdfs/)
+    jsonl 글 묶음 파일 1개, 한 줄에 글 1개 (corpus/dhamma.jsonl)
+    index 전문 검색 색인에 바로 추가 (search/index.db)
+
+글마다 파일 1개를 만드는 형식(txt / pdf / fpdf)은 파일명이 "제목 (글 ID).확장자"이고,
+저장 폴더의 매니페스트(.manifest.db)에 글 ID → 제목 / 경로 / 내용 해시 / 템플릿 버전을
+기록합니다. 다시 실행할 때 내용 해시와 템플릿 버전이 같은 글은 저장하지 않습니다.
+plan_changes()는 저장하지 않고 다시 저장할 글 수만 셉니다 (--dry-run).
+"""
+
+from collections import Counter
+from concurrent.futures import Future
+import json
+import os
+import shutil
+import threading
+import time
+
+from .manifest import FILENAME as MANIFEST_FILENAME, NEW, Manifest
+from .records import content_hash, output_filename, safe_filename, stable_id
+
+# 형식 이름 → Output 클래스 (등록 순서 유지)
+OUTPUTS = {}
+
+
+def register_output(cls):
+    """출력 형식 등록 데코레이터"""
+    OUTPUTS[cls.name] = cls
+    return cls
+
+
+def get_output(name):
+    """형식 이름 → Output 클래스 (없으면 ValueError)"""
+    try:
+        return OUTPUTS[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 출력 형식: {name} (사용 가능: {', '.join(OUTPUTS)})")
+
+
+class Output:
+    """출력 형식 1개 (with로 사용)
+
+    write(post_data)는 여러 스레드에서 동시에 호출될 수 있고, 저장 경로 또는
+    실패 시 None을 반환합니다. workers는 파이프라인 저장 스테이지 워커 수입니다.
+    submit(post_data)는 같은 저장을 Future로 돌려줍니다 (비동기 크롤러용, 스레드를 쓰지 않음).
+
+    글마다 파일 1개를 만드는 형식은 save(post_data, filepath)만 구현하면 되고,
+    content_addressed = True면 write()가 매니페스트로 바뀌지 않은 글을 건너뜁니다.
+    link_duplicates = True면 중복 글은 대표 글 파일에 하드 링크합니다.
+    템플릿 버전은 fingerprint()로 정하고, 템플릿 / 폰트 등을 해시하는 형식은 이를 재정의합니다.
+    같은 파일을 만드는 형식끼리는 manifest_name을 같게 해서, 형식을 바꾸면 다시 저장되게 합니다.
+    """
+
+    name = None
+    label = None
+    default_dir = None
+    extension = None
+    content_addressed = False
+    link_duplicates = False
+    # 매니페스트 항목 이름 (기본 name)
+    manifest_name = None
+    # 출력 모양(템플릿)을 바꾸면 올림 → 모든 글을 다시 저장
+    template_version = '1'
+
+    def __init__(self, output_dir, workers=1):
+        self.output_dir = output_dir
+        self.workers = workers
+        self.unchanged = 0
+        self.saved = 0
+        self.save_seconds = 0.0
+        self._stats_lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+        self.template_version = self.fingerprint()
+        self.manifest = Manifest(output_dir) if self.content_addressed else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @classmethod
+    def fingerprint(cls):
+        """지금 템플릿 버전 (매니페스트에 기록된 값과 다르면 다시 저장)"""
+        return cls.template_version
+
+    @classmethod
+    def manifest_key(cls):
+        """매니페스트 항목 이름 (manifest_name, 없으면 name)"""
+        return cls.manifest_name or cls.name
+
+    def path(self, post_data):
+        """글 ID 기반 저장 경로 ("제목 (글 ID).확장자")"""
+        return os.path.join(self.output_dir, output_filename(post_data, self.extension))
+
+    def current_path(self, post_data):
+        """매니페스트상 내용 / 템플릿이 같은 파일이 있으면 그 경로 (건너뛴 수 집계)"""
+        if self.manifest is None:
+            return None
+        filepath = self.manifest.current_path(self.manifest_key(), stable_id(post_data['url']),
+                                              content_hash(post_data), self.template_version)
+        if filepath:
+            with self._stats_lock:
+                self.unchanged += 1
+        return filepath
+
+    def record(self, post_data, filepath):
+        """저장 완료를 매니페스트에 기록 (제목이 바뀌어 경로가 달라졌으면 예전 파일 삭제)"""
+        if self.manifest is not None:
+            self.manifest.record(self.manifest_key(), stable_id(post_data['url']), post_data['title'], filepath,
+                                 content_hash(post_data), self.template_version)
+
+    def write(self, post_data):
+        if not post_data:
+            return None
+        filepath = self.current_path(post_data)
+        if filepath:
+            return filepath
+        started = time.perf_counter()
+        filepath = self.save(post_data, self.path(post_data))
+        if filepath:
+            with self._stats_lock:
+                self.saved += 1
+                self.save_seconds += time.perf_counter() - started
+            self.record(post_data, filepath)
+        return filepath
+
+    def submit(self, post_data):
+        """저장 → Future[경로 또는 None]
+
+        기본은 그 자리에서 write()하고 끝난 Future를 돌려줍니다 (작은 파일 / 색인은 이벤트 루프에서 바로).
+        오래 걸리는 형식(PDF)은 프로세스 풀 작업의 Future를 돌려주도록 재정의합니다.
+        """
+        future = Future()
+        try:
+            future.set_result(self.write(post_data))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def save(self, post_data, filepath):
+        """글 1개를 filepath에 저장 → 경로 (실패 시 None)"""
+        raise NotImplementedError
+
+    def link(self, post_data, canonical):
+        """중복 글 저장 - link_duplicates 형식만 대표 글 파일에 링크, 나머지는 그냥 write"""
+        if not self.link_duplicates:
+            return self.write(post_data)
+        filepath = self.current_path(post_data)
+        if filepath:
+            return filepath
+
+        source = None
+        if self.manifest is not None:
+            entry = self.manifest.get(self.manifest_key(), stable_id(canonical['url']))
+            source = entry[1] if entry else None
+        filepath = link_file(source or self.path(canonical), self.path(post_data))
+        if not filepath:
+            return self.write(post_data)
+        self.record(post_data, filepath)
+        return filepath
+
+    def write_all(self, posts):
+        """여러 글 저장 → (글, 경로 또는 None) 순서대로"""
+        for post_data in posts:
+            yield post_data, self.write(post_data)
+
+    def average_seconds(self):
+        """이번 실행의 문서당 평균 저장 시간 (저장한 글이 없으면 None)"""
+        return self.save_seconds / self.saved if self.saved else None
+
+    def close(self):
+        if self.manifest is not None:
+            average = self.average_seconds()
+            if average is not None:
+                # 다음 --dry-run 예상 시간용
+                self.manifest.set_meta(f"{self.name}.seconds", average)
+            self.manifest.close()
+
+    def print_stats(self):
+        if self.unchanged:
+            print(f"♻️  {self.label}: 내용 / 템플릿이 같아 건너뜀 {self.unchanged}개")
+
+
+@register_output
+class TextOutput(Output):
+    """텍스트 파일 (제목 / 날짜 / URL 헤더 + 본문)"""
+
+    name = 'txt'
+    label = '텍스트 파일'
+    default_dir = 'texts'
+    extension = '.txt'
+    content_addressed = True
+
+    def save(self, post_data, filepath):
+        filepath = write_text_file(post_data, filepath)
+        if filepath:
+            remove_legacy_text(post_data, self.output_dir)
+        return filepath
+
+
+def write_text_file(post_data, filepath):
+    """텍스트 파일로 저장 → 경로 (실패 시 None)"""
+    if not post_data:
+        return None
+
+    try:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(f"제목: {post_data['title']}\n")
+            f.write(f"날짜: {post_data['date']}\n")
+            f.write(f"URL: {post_data['url']}\n")
+            f.write("\n" + "="*80 + "\n\n")
+            f.write(post_data['content'])
+
+        return filepath
+
+    except Exception as e:
+        print(f"⚠️  TXT 저장 오류 ({post_data.get('url')}): {e}")
+        return None
+
+
+def save_as_text(post_data, output_dir):
+    """텍스트 파일로 저장 ("제목 (글 ID).txt", 매니페스트 없이) → 경로 (실패 시 None)"""
+    if not post_data:
+        return None
+    return write_text_file(post_data, os.path.join(output_dir, output_filename(post_data, '.txt')))
+
+
+def text_file_url(filepath):
+    """텍스트 파일 헤더의 URL (없으면 None)"""
+    with open(filepath, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('URL: '):
+                return line[5:].strip()
+    return None
+
+
+def remove_legacy_text(post_data, output_dir):
+    """예전 제목 파일명("제목.txt")이 같은 글이면 삭제 (다른 글이면 그대로 둠)"""
+    legacy = os.path.join(output_dir, f"{safe_filename(post_data['title'])}.txt")
+    if os.path.exists(legacy) and text_file_url(legacy) == post_data['url']:
+        os.remove(legacy)
+
+
+def plan_changes(output_cls, output_dir, posts):
+    """저장하지 않고 다시 저장할 글 세기 (--dry-run) → (이유별 글 수, 전체 글 수, 문서당 저장 시간 또는 None)
+
+    매니페스트가 없는 폴더는 모든 글이 새 글이고, 폴더 / 매니페스트를 만들지 않습니다.
+    """
+    manifest = None
+    if output_cls.content_addressed and os.path.exists(os.path.join(output_dir, MANIFEST_FILENAME)):
+        manifest = Manifest(output_dir)
+    template = output_cls.fingerprint()
+    changes = Counter()
+    total = 0
+    for post_data in posts:
+        total += 1
+        reason = NEW
+        if manifest is not None:
+            reason = manifest.change(output_cls.manifest_key(), stable_id(post_data['url']), content_hash(post_data), template)
+        if reason:
+            changes[reason] += 1
+
+    seconds = None
+    if manifest is not None:
+        seconds = manifest.get_meta(f"{output_cls.name}.seconds")
+        seconds = float(seconds) if seconds is not None else None
+        manifest.close()
+    return changes, total, seconds
+
+
+def link_file(source, target):
+    """target을 source의 하드 링크로 (안 되면 복사) → target, source가 없으면 None"""
+    if not os.path.exists(source):
+        return None
+    if os.path.abspath(source) == os.path.abspath(target):
+        return target
+    if os.path.lexists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+    return target
+
+
+@register_output
+class PdfOutput(Output):
+    """WeasyPrint PDF - 렌더링은 RenderEngine 프로세스 풀에서 (워커 1개당 프로세스 1개)"""
+
+    name = 'pdf'
+    label = 'PDF'
+    default_dir = 'pdfs'
+    extension = '.pdf'
+    content_addressed = True
+    link_duplicates = True
+    manifest_name = 'pdf'
+    # RenderEngine 렌더링 백엔드
+    backend = 'weasyprint'
+
+    def __init__(self, output_dir, workers=1):
+        from .render_engine import RenderEngine
+
+        super().__init__(output_dir, workers)
+        self.engine = RenderEngine(output_dir, workers, path=self.path, backend=self.backend)
+
+    @classmethod
+    def fingerprint(cls):
+        """STYLESHEET + HTML_TEMPLATE + 폰트 파일 지문 (CSS / 폰트가 바뀐 PDF만 다시 렌더링)"""
+        from .render_engine import template_fingerprint
+
+        return template_fingerprint()
+
+    def save(self, post_data, filepath):
+        return self.engine.render(post_data, filepath)
+
+    def submit(self, post_data):
+        """렌더링을 프로세스 풀에 제출 → Future[경로 또는 None] (바뀌지 않은 글은 끝난 Future)"""
+        filepath = self.current_path(post_data) if post_data else None
+        if filepath or not post_data:
+            future = Future()
+            future.set_result(filepath)
+            return future
+
+        future = self.engine.render_async(post_data, self.path(post_data))
+        # 기다리는 쪽(asyncio.wrap_future)보다 먼저 등록되므로 완료 전에 매니페스트에 기록됨
+        future.add_done_callback(lambda done: done.result() and self.record(post_data, done.result()))
+        return future
+
+    def write_all(self, posts):
+        """여러 글을 프로세스 풀에서 병렬 렌더링 → (글, 경로 또는 None) 순서대로
+
+        매니페스트상 바뀌지 않은 글은 렌더링하지 않고 기존 경로를 그대로 돌려줍니다.
+        """
+        for post_data, filepath, rendered in self.engine.render_all(posts, current=self.current_path):
+            if rendered:
+                self.record(post_data, filepath)
+            yield post_data, filepath
+
+    def average_seconds(self):
+        latencies = self.engine.latencies
+        return sum(latencies) / len(latencies) if latencies else None
+
+    def close(self):
+        self.engine.close()
+        super().close()
+
+    def print_stats(self):
+        super().print_stats()
+        self.engine.print_stats()
+
+
+@register_output
+class FpdfOutput(PdfOutput):
+    """fpdf2 빠른 PDF - 제목 / 날짜·출처 / 본문 문단만, 번들 NanumGothic (dhamma/fast_pdf.py)
+
+    pdf 형식과 같은 폴더 / 파일명 / 매니페스트 항목을 써서, 형식을 바꿔 실행하면
+    지문이 달라 모든 PDF를 그 형식으로 다시 렌더링합니다.
+    """
+
+    name = 'fpdf'
+    label = 'PDF (fpdf2 빠른 렌더링)'
+    backend = 'fpdf'
+
+    @classmethod
+    def fingerprint(cls):
+        """LAYOUT + 폰트 파일 지문"""
+        from .fast_pdf import layout_fingerprint
+
+        return layout_fingerprint()
+
+
+@register_output
+class JsonlOutput(Output):
+    """글 묶음 JSONL - 모든 글을 파일 1개에 한 줄씩 (id = ?p= 번호)
+
+    쓰는 동안은 뒤에 이어 붙이기만 하고, close()에서 같은 글의 중복 줄을
+    정리하며 id 순으로 정렬합니다.
+    """
+
+    name = 'jsonl'
+    label = 'JSONL 묶음'
+    default_dir = 'corpus'
+    extension = '.jsonl'
+    filename = 'dhamma.jsonl'
+
+    def __init__(self, output_dir, workers=1):
+        super().__init__(output_dir, workers)
+        self.corpus_path = os.path.join(output_dir, self.filename)
+        self._lock = threading.Lock()
+        self._file = None
+        self.written = 0
+        self.total = None
+
+    def path(self, post_data):
+        return self.corpus_path
+
+    def write(self, post_data):
+        from .corpus import corpus_row
+
+        if not post_data:
+            return None
+        line = json.dumps(corpus_row(post_data), ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.corpus_path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self.written += 1
+        return self.corpus_path
+
+    def close(self):
+        from .corpus import compact_jsonl
+
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self.total = compact_jsonl(self.corpus_path)
+
+    def print_stats(self):
+        if self.written:
+            print(f"📊 JSONL 묶음: 이번에 {self.written}개 기록, 전체 {self.total}개 → {self.corpus_path}")
+
+
+@register_output
+class SearchOutput(Output):
+    """전문 검색 색인 - 받은 글을 바로 색인 (내용이 같은 글은 건너뜀)"""
+
+    name = 'index'
+    label = '검색 색인'
+    default_dir = 'search'
+    extension = '.db'
+    filename = 'index.db'
+
+    def __init__(self, output_dir, workers=1):
+        from .search import SearchIndex
+
+        super().__init__(output_dir, workers)
+        self.index = SearchIndex(os.path.join(output_dir, self.filename))
+
+    def path(self, post_data):
+        return self.index.path
+
+    def write(self, post_data):
+        if not post_data:
+            return None
+        self.index.add(post_data['url'], post_data)
+        return self.index.path
+
+    def close(self):
+        self.index.close()
+
+    def print_stats(self):
+        self.index.print_stats()
+
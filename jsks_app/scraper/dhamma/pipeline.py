@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 스테이지 파이프라인 - 네트워크 / 파싱 / 저장(렌더링)을 겹쳐서 실행
+
+각 스테이지는 자기 워커 스레드를 갖고, 스테이지 사이는 크기가 제한된 큐로
+연결됩니다. 뒤 스테이지가 느리면 큐가 차서 앞 스테이지가 자동으로 멈추므로
+(backpressure) 메모리에 쌓이는 글 수가 제한됩니다.
+
+metrics(Metrics)를 넘기면 항목마다 스테이지 처리 시간 / 결과 / 실패 분류를 스팬으로 남기고,
+스테이지 입력 큐 대기 개수를 게이지(queue_depth)로 보여줍니다.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+from .crawl_state import RENDERED
+from .dedup import LINK, SKIP
+from .http_client import NotModified
+from .records import save_post_record
+
+# 스테이지 종료 신호
+_DONE = object()
+
+# 처리할 필요가 없는 항목 (실패로 집계하지 않고 다음 스테이지로 넘기지 않음)
+SKIPPED = object()
+
+# 스테이지 사이 큐 기본 크기
+DEFAULT_QUEUE_SIZE = 32
+
+
+class Stage:
+    """파이프라인 스테이지 1개 (처리 함수 + 워커 수 + 처리량 카운터)
+
+    func(item)이 None을 반환하거나 예외를 던지면 해당 항목은 실패로 집계되고
+    다음 스테이지로 넘어가지 않습니다. SKIPPED를 반환하면 건너뜀으로 집계됩니다.
+    """
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, result, seconds):
+        with self._lock:
+            if result is SKIPPED:
+                self.skipped += 1
+            elif result is not None:
+                self.processed += 1
+            else:
+                self.failed += 1
+            self.busy_seconds += seconds
+
+    def summary(self, elapsed):
+        """처리량 요약 문자열"""
+        total = self.processed + self.failed + self.skipped
+        rate = total / elapsed if elapsed > 0 else 0.0
+        # 워커들이 실제로 일한 시간 비율 (1.0에 가까울수록 병목 스테이지)
+        utilization = self.busy_seconds / (elapsed * self.workers) if elapsed > 0 else 0.0
+        return (f"{self.name:<8} 워커 {self.workers:>2}개 | 성공 {self.processed:>6} | 실패 {self.failed:>4} | "
+                f"건너뜀 {self.skipped:>6} | {rate:6.2f}개/초 | 가동률 {utilization:5.1%}")
+
+
+class Pipeline:
+    """스테이지들을 크기 제한 큐로 연결해 동시에 실행
+
+    trace_key(item)는 스팬에 남길 항목 이름 (예: 글 URL)입니다.
+    """
+
+    def __init__(self, stages, queue_size=DEFAULT_QUEUE_SIZE, metrics=None, trace_key=None):
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.output = queue.Queue(maxsize=queue_size)
+        self.started = None
+        self.metrics = metrics
+        self.trace_key = trace_key
+
+    def _worker(self, index, remaining):
+        stage = self.stages[index]
+        in_q = self.queues[index]
+        out_q = self.queues[index + 1] if index + 1 < len(self.stages) else self.output
+
+        while True:
+            item = in_q.get()
+            if item is _DONE:
+                break
+
+            started = time.monotonic()
+            error = None
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                print(f"   ⚠️  [{stage.name}] 오류: {e}")
+                result = None
+                error = e
+            seconds = time.monotonic() - started
+            stage.record(result, seconds)
+            if self.metrics is not None:
+                self._trace(stage, item, result, seconds, error)
+
+            if result is not None and result is not SKIPPED:
+                # 다음 큐가 가득 차면 여기서 대기 (backpressure)
+                out_q.put(result)
+
+        # 스테이지의 마지막 워커가 다음 스테이지에 종료 신호 전달
+        with remaining['lock']:
+            remaining['count'] -= 1
+            last = remaining['count'] == 0
+        if last:
+            next_workers = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            for _ in range(next_workers):
+                out_q.put(_DONE)
+
+    def _trace(self, stage, item, result, seconds, error):
+        kind = None
+        if result is SKIPPED:
+            outcome = 'skipped'
+        elif result is not None:
+            outcome = 'ok'
+        else:
+            outcome = 'failed'
+            # 예외 없이 None이면 처리 함수가 실패를 직접 판단한 경우 (예: 파싱 결과 없음)
+            kind = self.metrics.error(stage.name, error or 'no_result')
+        key = self.trace_key(item) if self.trace_key else None
+        self.metrics.span(stage.name, seconds, outcome, key, kind)
+
+    def _record_depths(self, metrics):
+        for name, depth in self.queue_depths().items():
+            metrics.set('queue_depth', depth, stage=name)
+
+    def _feed(self, items):
+        for item in items:
+            self.queues[0].put(item)
+        for _ in range(self.stages[0].workers):
+            self.queues[0].put(_DONE)
+
+    def queue_depths(self):
+        """스테이지별 입력 큐 대기 개수"""
+        return {stage.name: q.qsize() for stage, q in zip(self.stages, self.queues)}
+
+    def run(self, items, on_result=None):
+        """items를 파이프라인에 흘려보내고 마지막 스테이지 결과마다 on_result 호출"""
+        self.started = time.monotonic()
+        if self.metrics is not None:
+            self.metrics.add_collector(self._record_depths)
+        threads = [threading.Thread(target=self._feed, args=(items,), daemon=True)]
+
+        for index, stage in enumerate(self.stages):
+            remaining = {'count': stage.workers, 'lock': threading.Lock()}
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(target=self._worker, args=(index, remaining), daemon=True))
+
+        for thread in threads:
+            thread.start()
+
+        while True:
+            result = self.output.get()
+            if result is _DONE:
+                break
+            if on_result:
+                on_result(result)
+
+        for thread in threads:
+            thread.join()
+
+    def elapsed(self):
+        return time.monotonic() - self.started if self.started else 0.0
+
+    def print_stats(self):
+        """스테이지별 처리량 출력"""
+        elapsed = self.elapsed()
+        print(f"\n⏱️  스테이지별 처리량 (경과 {elapsed:.0f}초)")
+        for stage in self.stages:
+            print(f"   {stage.summary(elapsed)}")
+
+
+def item_url(item):
+    """스팬에 남길 글 URL (fetch: URL, parse: (URL, HTML), write: 글 데이터)"""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, tuple):
+        return item[0]
+    if isinstance(item, dict):
+        return item.get('url')
+    return None
+
+
+def output_key(outputs):
+    """출력 형식 + 저장 폴더 조합 (바뀌면 이전 실행의 저장 완료 표시는 무효)"""
+    return ';'.join(sorted(f"{output.name}={output.output_dir}" for output in outputs))
+
+
+def run_post_pipeline(post_links, fetch_html, parse_html, outputs, posts_dir, state=None,
+                      fetch_workers=4, parse_workers=2, refresh=False, archive=None,
+                      duplicates=None, duplicate_mode=LINK, limiter=None, metrics=None):
+    """글 본문 다운로드 → 파싱 → 출력 형식별 저장 파이프라인 실행 → 성공 개수
+
+    outputs는 Output 목록이고, 글 1개는 모든 형식으로 저장돼야 성공입니다.
+    저장 스테이지 워커 수는 출력 형식 중 가장 큰 workers를 따릅니다.
+
+    state(CrawlState)가 있으면 단계별 결과를 기록하고, 다시 실행할 때
+    저장이 끝난 글은 건너뛰며 받아 둔 HTML / 글 데이터는 네트워크 없이 재사용합니다.
+    지난 실행과 출력 형식(또는 폴더)이 다르면 저장 완료 표시를 지우고 다시 저장합니다.
+
+    archive(HtmlArchive)가 있으면 받은 HTML을 원본 보관소에 추가하고, 보관소에 있는
+    글은 네트워크 대신 디스크에서 읽습니다 (refresh=True일 때는 다시 요청).
+    fetch_html은 (URL, HTML) 또는 (URL, HTML, 응답)을 돌려주고, 응답이 있으면 응답 코드 / 헤더도 보관합니다.
+
+    duplicates(DuplicateIndex)가 있으면 저장 직전에 먼저 저장한 글과 본문이 거의 같은지 확인해
+    duplicate_mode에 따라 건너뛰거나(skip) 파이프라인이 끝난 뒤 대표 글 파일에 링크합니다(link).
+
+    limiter(AdaptiveRateLimiter)를 넘기면 진행 상황에 지금 초당 요청 수 / 지연 시간을 같이 출력합니다.
+    metrics(Metrics)를 넘기면 글마다 fetch / parse / write 스테이지 스팬을 남깁니다.
+
+    refresh=True면 저장이 끝난 글도 다시 요청해 바뀐 글만 새로 저장합니다.
+    fetch_html이 NotModified(304)를 던지면 이미 저장된 글은 파싱 / 저장을 건너뜁니다.
+    """
+    if state:
+        key = output_key(outputs)
+        previous = state.get_meta('outputs')
+        if previous is not None and previous != key:
+            print(f"♻️  출력 형식이 바뀌어 저장 완료 표시 {state.reset_rendered()}개를 지웁니다")
+        state.set_meta('outputs', key)
+
+    if state and not refresh:
+        rendered = len(post_links)
+        post_links = [url for url in post_links if state.status(url) != RENDERED]
+        rendered -= len(post_links)
+        if rendered:
+            print(f"♻️  이미 저장된 글 {rendered}개 건너뜀")
+
+    def fetch(url):
+        if state and not refresh:
+            # 파싱까지 끝난 글 → 저장된 글 데이터 사용
+            record_path = state.record_path(url)
+            if record_path and os.path.exists(record_path):
+                return url, None
+            # 받아 둔 HTML → 파싱부터 다시
+            html = state.load_html(url)
+            if html:
+                return url, html
+        if archive is not None and not refresh:
+            # 원본 보관소에 있는 글 → 디스크에서 읽어 파싱부터
+            html = archive.get(url)
+            if html:
+                if state:
+                    state.mark_fetched(url)
+                return url, html
+
+        response = None
+        try:
+            result = fetch_html(url)
+            url, html = result[:2]
+            if len(result) > 2:
+                response = result[2]
+        except NotModified as e:
+            if state and state.status(url) == RENDERED:
+                if archive is not None and url not in archive:
+                    archive.append(url, e.content)
+                return SKIPPED
+            # 지난번 저장이 끝나지 않은 글 → 캐시된 본문으로 계속
+            html = e.content
+        except Exception as e:
+            if state:
+                state.mark_failed(url, e)
+            raise
+
+        if archive is not None:
+            archive.append(url, html, response)
+        if state:
+            # 보관소가 있으면 HTML은 보관소에만 (상태 DB에는 단계만 기록)
+            state.mark_fetched(url, html if archive is None else None)
+        return url, html
+
+    def parse(item):
+        url, html = item
+        if html is None:
+            with open(state.record_path(url), encoding='utf-8') as f:
+                return json.load(f)
+
+        post_data = parse_html(url, html)
+        if not post_data:
+            if state:
+                state.mark_failed(url, '파싱 실패')
+            return None
+
+        # 재크롤링 없이 다시 저장할 수 있도록 글 데이터 보관
+        record_path = save_post_record(post_data, posts_dir)
+        if state:
+            state.mark_parsed(url, record_path)
+        return post_data
+
+    # 대표 글이 저장된 뒤에 링크할 중복 글: [(글, 대표 글)]
+    linked = []
+
+    def write(post_data):
+        if duplicates is not None:
+            canonical = duplicates.check(post_data)
+            if canonical:
+                if duplicate_mode == SKIP:
+                    if state:
+                        state.mark_rendered(post_data['url'])
+                else:
+                    linked.append((post_data, canonical))
+                return SKIPPED
+        return save(post_data)
+
+    def save(post_data, canonical=None):
+        failed = [output.name for output in outputs
+                  if not (output.link(post_data, canonical) if canonical else output.write(post_data))]
+        if failed:
+            if state:
+                state.mark_failed(post_data['url'], f"저장 실패: {', '.join(failed)}")
+            return None
+
+        if state:
+            state.mark_rendered(post_data['url'])
+        return post_data
+
+    # 네트워크 → 파싱 → 저장을 큐로 연결해 동시에 실행
+    pipeline = Pipeline([
+        Stage('fetch', fetch, fetch_workers),
+        Stage('parse', parse, parse_workers),
+        Stage('write', write, max(output.workers for output in outputs)),
+    ], metrics=metrics, trace_key=item_url)
+
+    done_count = 0
+
+    def on_result(post_data):
+        nonlocal done_count
+        done_count += 1
+        print(f"[{done_count}/{len(post_links)}] ✅ 저장 완료: {post_data['title'][:30]}...")
+
+        # 10개마다 진행 상황 출력
+        if done_count % 10 == 0:
+            rate = f", {limiter.status()}" if limiter else ""
+            print(f"\n📊 진행 상황: {done_count} 성공, 큐 대기 {pipeline.queue_depths()}{rate}\n")
+
+    pipeline.run(post_links, on_result)
+    for post_data, canonical in linked:
+        if save(post_data, canonical) is not None:
+            done_count += 1
+            print(f"🔗 중복 글 링크: {post_data['title'][:30]} → {canonical['title'][:30]}")
+    pipeline.print_stats()
+    if state:
+        print(f"   상태별 글 수: {state.counts()}")
+    return done_count
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 글 상세 페이지 파서 - 동기 / 비동기 크롤러가 같이 사용
+
+반환하는 글 데이터(dict):
+    title, date, url
+    content       - 문단 텍스트 ('\\n\\n'으로 연결, save_as_text용)
+    content_html  - 문단 HTML ('<p>...</p>', create_beautiful_pdf용)
+
+본문은 post div를 한 번만 훑으면서 문단마다 텍스트와 HTML을 같이 만듭니다.
+HTML은 정리된 형태: 주석 / <script> / <style> / on* 이벤트 속성 제거, 속성 이름순 정렬.
+
+파싱 백엔드 (모두 같은 글 데이터를 반환, test_post_parser.py의 골든 파일로 확인):
+    html.parser  - BeautifulSoup 전체 트리 (기준 구현)
+    strainer     - BeautifulSoup + SoupStrainer: 제목 / 글 본문 / 날짜 태그만 트리로 만듦
+    lxml         - lxml(libxml2) + XPath, 가장 빠름 (lxml 설치 필요)
+"""
+
+from html import escape
+
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit, Tag, CData
+from bs4.element import PreformattedString
+
+try:
+    from bs4.filter import ElementFilter  # bs4 4.13+
+except ImportError:
+    ElementFilter = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# 기본 백엔드 (lxml이 없으면 strainer)
+DEFAULT_BACKEND = 'lxml' if lxml else 'strainer'
+
+
+def _post_record(url, title_text, content_paragraphs, date_text):
+    """(문단 텍스트, 문단 안쪽 HTML) 목록 → 글 데이터"""
+    # 첫번째와 마지막 p 태그는 제외 (제목과 관련 글 링크)
+    if len(content_paragraphs) > 2:
+        content_paragraphs = content_paragraphs[1:-1]
+    content_paragraphs = [(text, inner) for text, inner in content_paragraphs if text]
+
+    return {
+        'title': title_text,
+        'content': '\n\n'.join(text for text, _ in content_paragraphs),
+        'content_html': '\n'.join(f'<p>{inner}</p>' for _, inner in content_paragraphs),
+        'date': date_text,
+        'url': url
+    }
+
+
+# --- 본문 문단 추출 (한 번 훑기) ---
+
+# 본문 HTML에서 통째로 버리는 태그 (get_text도 이 안의 글자는 건너뜀)
+_DROP_TAGS = frozenset(['script', 'style', 'template'])
+
+# HTML에는 남기지만 텍스트에서는 빠지는 태그 (루비 주석)
+_NO_TEXT_TAGS = frozenset(['rt', 'rp'])
+
+# <br/>처럼 닫는 태그 없이 출력하는 태그
+_VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+    'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+    'image', 'isindex', 'nextid', 'spacer',
+])
+
+# 공백으로 나눠 다시 합치는 속성 (class="a  b" → class="a b")
+_LIST_ATTRS = frozenset(['class', 'accesskey', 'dropzone', 'rel', 'rev', 'headers', 'accept-charset',
+                         'archive', 'sizes', 'sandbox', 'for'])
+
+# 값 없는 속성 (html.parser는 checked="", lxml은 checked="checked"로 읽음 → 빈 값으로 통일)
+_BOOLEAN_ATTRS = frozenset(['checked', 'disabled', 'selected', 'readonly', 'multiple', 'hidden',
+                            'required', 'autofocus', 'autoplay', 'controls', 'loop', 'muted',
+                            'open', 'reversed', 'ismap', 'default', 'allowfullscreen'])
+
+
+def _quote_attr(value):
+    """속성값 따옴표 처리 (BeautifulSoup minimal 포매터와 같은 규칙)"""
+    value = escape(value, quote=False)
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', '&quot;') + '"'
+        return f"'{value}'"
+    return f'"{value}"'
+
+
+def _start_tag(name, attrs):
+    """정리된 시작 태그 (on* 이벤트 속성 제거, 속성 이름순)"""
+    parts = [name]
+    for key, value in sorted(attrs.items()):
+        if key.startswith('on'):
+            continue
+        if key in _BOOLEAN_ATTRS:
+            value = ''
+        elif isinstance(value, list):
+            value = ' '.join(value)
+        elif key in _LIST_ATTRS:
+            value = ' '.join(value.split())
+        parts.append(f"{key}={_quote_attr(value or '')}")
+    return '<' + ' '.join(parts) + ('/>' if name in _VOID_TAGS else '>')
+
+
+class _Paragraphs:
+    """post div를 훑으면서 열려 있는 <p>마다 텍스트 조각 / HTML 조각을 모음
+
+    <p> 안에 <p>가 있으면(html.parser) 바깥 문단에도 안쪽 내용이 들어가므로
+    find_all('p') + get_text / decode_contents를 따로 부른 결과와 같습니다.
+    """
+
+    def __init__(self):
+        self.items = []  # (텍스트 조각, HTML 조각) - <p> 시작 순서
+
+    def open(self):
+        paragraph = ([], [])
+        self.items.append(paragraph)
+        return paragraph
+
+    @staticmethod
+    def markup(open_paragraphs, markup):
+        for _, html in open_paragraphs:
+            html.append(markup)
+
+    @staticmethod
+    def string(open_paragraphs, string, text_on):
+        escaped = escape(string, quote=False)
+        stripped = string.strip() if text_on else ''
+        for text, html in open_paragraphs:
+            html.append(escaped)
+            if stripped:
+                text.append(stripped)
+
+    def result(self):
+        """[(정리된 텍스트, 정리된 안쪽 HTML)] (get_text(strip=True)처럼 조각을 공백 없이 연결)"""
+        return [(''.join(text), ''.join(html)) for text, html in self.items]
+
+
+def _soup_paragraphs(post_div):
+    """BeautifulSoup post div → [(텍스트, HTML)] (트리를 한 번만 훑음)"""
+    paragraphs = _Paragraphs()
+
+    def walk(node, open_paragraphs, text_on):
+        for child in node.children:
+            if isinstance(child, Tag):
+                name = child.name
+                if name in _DROP_TAGS:
+                    continue
+                paragraphs.markup(open_paragraphs, _start_tag(name, child.attrs))
+                inner = open_paragraphs + [paragraphs.open()] if name == 'p' else open_paragraphs
+                if name not in _VOID_TAGS:
+                    walk(child, inner, text_on and name not in _NO_TEXT_TAGS)
+                    paragraphs.markup(open_paragraphs, f'</{name}>')
+            elif not isinstance(child, PreformattedString) or isinstance(child, CData):
+                # 주석 / doctype 등은 버림
+                paragraphs.string(open_paragraphs, child, text_on)
+
+    walk(post_div, [], True)
+    return paragraphs.result()
+
+
+def _lxml_paragraphs(post_div):
+    """lxml post div → [(텍스트, HTML)] (트리를 한 번만 훑음)"""
+    paragraphs = _Paragraphs()
+
+    def walk(element, open_paragraphs, text_on):
+        if element.text:
+            paragraphs.string(open_paragraphs, element.text, text_on)
+        for child in element:
+            name = child.tag
+            # 주석 / 처리 명령은 tag가 문자열이 아님 (꼬리 글자는 남김)
+            if isinstance(name, str) and name not in _DROP_TAGS:
+                paragraphs.markup(open_paragraphs, _start_tag(name, child.attrib))
+                inner = open_paragraphs + [paragraphs.open()] if name == 'p' else open_paragraphs
+                if name not in _VOID_TAGS:
+                    walk(child, inner, text_on and name not in _NO_TEXT_TAGS)
+                    paragraphs.markup(open_paragraphs, f'</{name}>')
+            if child.tail:
+                paragraphs.string(open_paragraphs, child.tail, text_on)
+
+    walk(post_div, [], True)
+    return paragraphs.result()
+
+
+# --- BeautifulSoup (html.parser / strainer) ---
+
+def _from_soup(url, soup):
+    # 제목 찾기 (dhamma.kr은 단순히 <h2> 사용)
+    title = soup.find('h2')
+    title_text = title.get_text(strip=True) if title else "제목 없음"
+
+    # 내용 찾기 (post div 안의 모든 p 태그)
+    post_div = soup.find('div', class_='post')
+    content_paragraphs = _soup_paragraphs(post_div) if post_div else []
+
+    # 날짜 찾기
+    date_span = soup.find('span', class_='date')
+    date_text = date_span.get_text(strip=True) if date_span else ""
+
+    return _post_record(url, title_text, content_paragraphs, date_text)
+
+
+def parse_post_soup(url, content):
+    """기준 구현: 페이지 전체를 BeautifulSoup 트리로"""
+    return _from_soup(url, BeautifulSoup(content, 'html.parser'))
+
+
+def _has_class(attrs, name):
+    value = attrs.get('class') or ''
+    return name in (value.split() if isinstance(value, str) else value)
+
+
+def _wanted_tag(name, attrs):
+    """트리로 만들 태그: <h2>, <div class="post">, <span class="date"> (그 안쪽은 전부)"""
+    if name == 'h2':
+        return True
+    if name == 'div':
+        return _has_class(attrs, 'post')
+    if name == 'span':
+        return _has_class(attrs, 'date')
+    return False
+
+
+if ElementFilter is not None:
+    class _PostStrainer(ElementFilter):
+        """bs4 4.13+: 태그 이름 + 속성으로 거르는 parse_only 필터"""
+
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            return _wanted_tag(name, attrs or {})
+
+        def allow_string_creation(self, string):
+            # 남길 태그 바깥의 문자열은 버림
+            return False
+
+    _POST_STRAINER = _PostStrainer()
+else:
+    # bs4 4.12 이하: 함수 하나로 (이름, 속성)을 받음
+    _POST_STRAINER = SoupStrainer(_wanted_tag)
+
+
+def parse_post_strained(url, content):
+    """html.parser는 그대로, 필요한 태그만 트리로 만들어 메모리 / 시간 절약"""
+    return _from_soup(url, BeautifulSoup(content, 'html.parser', parse_only=_POST_STRAINER))
+
+
+# --- lxml ---
+
+# BeautifulSoup의 class_='post' 와 같은 조건 (공백으로 나눈 class 중 하나)
+_POST_DIV = "(//div[contains(concat(' ', normalize-space(@class), ' '), ' post ')])[1]"
+_DATE_SPAN = "(//span[contains(concat(' ', normalize-space(@class), ' '), ' date ')])[1]"
+
+# get_text()가 건너뛰는 문자열 (스크립트 / 스타일 등)
+_TEXT = ".//text()[not(ancestor::script or ancestor::style or ancestor::template "\
+        "or ancestor::rt or ancestor::rp)]"
+
+
+def _lxml_text(element):
+    """get_text(strip=True)와 같은 결과"""
+    return ''.join(s.strip() for s in element.xpath(_TEXT))
+
+
+def parse_post_lxml(url, content):
+    """lxml + XPath (잘못 중첩된 HTML은 libxml2가 html.parser와 다르게 고칠 수 있음)"""
+    # 인코딩 판단은 BeautifulSoup과 동일하게 (<meta charset> → 추측)
+    if isinstance(content, bytes):
+        content = UnicodeDammit(content, is_html=True).unicode_markup
+    root = lxml.html.document_fromstring(content)
+
+    title = root.find('.//h2')
+    title_text = _lxml_text(title) if title is not None else "제목 없음"
+
+    post_div = root.xpath(_POST_DIV)
+    content_paragraphs = _lxml_paragraphs(post_div[0]) if post_div else []
+
+    date_span = root.xpath(_DATE_SPAN)
+    date_text = _lxml_text(date_span[0]) if date_span else ""
+
+    return _post_record(url, title_text, content_paragraphs, date_text)
+
+
+BACKENDS = {
+    'html.parser': parse_post_soup,
+    'strainer': parse_post_strained,
+    'lxml': parse_post_lxml,
+}
+
+
+def available_backends():
+    """지금 환경에서 쓸 수 있는 백엔드 이름"""
+    return [name for name in BACKENDS if name != 'lxml' or lxml]
+
+
+def parse_post(url, content, backend=None):
+    """글 HTML → 글 데이터 (backend를 주지 않으면 DEFAULT_BACKEND)"""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in available_backends():
+        raise ValueError(f"사용할 수 없는 파싱 백엔드: {backend} (가능: {', '.join(available_backends())})")
+    return BACKENDS[backend](url, content)
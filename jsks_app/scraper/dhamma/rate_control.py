@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 요청 속도 조절기 - 서버 응답에 맞춰 초당 요청 수를 올리고 내림 (AIMD)
+
+고정 간격 대신 응답 지연 시간과 오류를 보고 초당 요청 수를 정합니다:
+    - 응답이 빠르고 오류가 없으면 increase_every개마다 step만큼 올림 (가산 증가)
+    - 429 / 5xx / 연결 오류 / 느려짐이면 decrease배로 내림 (곱셈 감소, cooldown초에 1번)
+    - 429 / 503의 Retry-After가 있으면 그동안 새 요청을 보내지 않음
+    - 느려짐 = 지연 시간 이동평균이 기준(최근 응답 WINDOW개를 MIN_SAMPLES개씩 나눈 구간 중앙값의 최솟값)의
+      slow_factor배 이상. 서버가 계속 느려진 채로 있으면 기준도 그만큼 올라가서 다시 속도를 올림
+    - retries를 주면 429 / 5xx / 연결 오류는 조절기가 직접 재시도 (매 시도를 반영하고, 재시도도 초당 요청 수 안에서).
+      이때 FetchClient는 retries=0으로 만들어야 urllib3 안에서 몰래 재시도하지 않습니다
+
+글 목록 수집기와 본문 파이프라인이 같은 클래스를 쓰고, 실행 중 진행 상황에
+지금 초당 요청 수와 최근 지연 시간 p50 / p95가 같이 출력됩니다.
+
+    python3 -m dhamma fetch --rps 2 --max-rps 8     # 초당 2회로 시작해 최대 8회까지
+    python3 -m dhamma fetch --fixed-rate            # 예전처럼 고정 간격
+"""
+
+from collections import deque
+import threading
+import time
+
+import requests
+
+from .http_client import DEFAULT_BACKOFF, CacheMiss, NotModified
+from .settings import MAX_RPS, MIN_RPS
+
+# 지연 시간 분위수 / 기준을 잡는 최근 응답 수
+WINDOW = 200
+# 지연 시간 판단 전에 모을 최소 응답 수
+MIN_SAMPLES = 10
+
+
+def retry_after(response):
+    """응답의 Retry-After(초), 없거나 날짜 형식이면 None"""
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_overload(status):
+    """서버가 힘들다는 신호: 연결 오류 / 타임아웃(None), 429, 5xx"""
+    return status is None or status == 429 or status >= 500
+
+
+class AdaptiveRateLimiter:
+    """AIMD 초당 요청 수 조절기 (모든 워커 스레드가 공유)
+
+    rps는 시작 값이고 min_rps ~ max_rps 사이에서 움직입니다 (min_rps = max_rps면 고정).
+    rps가 0 이하면 제한하지 않고 지연 시간만 집계합니다.
+    요청은 call(func, ...)로 보내거나, wait() 후 observe(지연 시간, 상태 코드)를 직접 부릅니다.
+    call()은 서버 과부하 실패(429 / 5xx / 연결 오류)를 retries번까지 다시 보냅니다 (backoff초부터 2배씩 대기).
+    """
+
+    def __init__(self, rps, min_rps=MIN_RPS, max_rps=MAX_RPS, step=0.25, increase_every=10,
+                 decrease=0.5, slow_factor=3.0, cooldown=1.0, window=WINDOW, retries=0, backoff=DEFAULT_BACKOFF):
+        self.unlimited = not rps or rps <= 0
+        self.min_rps = min(min_rps, rps) if not self.unlimited else 0.0
+        self.max_rps = max(max_rps, rps) if not self.unlimited else 0.0
+        self.rate = rps if not self.unlimited else 0.0
+        self.step = step
+        self.increase_every = increase_every
+        self.decrease = decrease
+        self.slow_factor = slow_factor
+        self.cooldown = cooldown
+        self.retries = retries
+        self.backoff = backoff
+        self.latencies = deque(maxlen=window)
+        # 최근 구간(MIN_SAMPLES개)별 지연 시간 중앙값 → 기준은 이 중 최솟값
+        self._medians = deque(maxlen=max(1, window // MIN_SAMPLES))
+        self.requests = 0
+        self.errors = 0
+        self.retried = 0
+        self.slowdowns = 0
+        self.backoffs = 0
+        self.peak_rate = self.rate
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+        self._streak = 0
+        self._ewma = None
+        self._baseline = None
+        self._samples = 0
+
+    @property
+    def adaptive(self):
+        return not self.unlimited and self.min_rps < self.max_rps
+
+    def wait(self):
+        """다음 요청 슬롯까지 대기 (Retry-After로 멈춘 동안은 그 뒤로)"""
+        if self.unlimited:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, self._paused_until, now)
+            self._next_slot = slot + 1.0 / self.rate
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def observe(self, seconds, status=200, retry_after=None):
+        """요청 1개 결과 반영 (status None = 연결 오류 / 타임아웃)"""
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+            if is_overload(status):
+                self.errors += 1
+                self._slow_down(now)
+                return
+
+            self.latencies.append(seconds)
+            self._ewma = seconds if self._ewma is None else 0.8 * self._ewma + 0.2 * seconds
+            self._samples += 1
+            if self._samples % MIN_SAMPLES == 0:
+                recent = sorted(list(self.latencies)[-MIN_SAMPLES:])
+                self._medians.append(recent[len(recent) // 2])
+                # 오래된 빠른 구간이 밀려나면 기준이 올라감 (서버가 계속 느려진 경우)
+                self._baseline = min(self._medians)
+
+            if self._baseline is not None and self._ewma > self._baseline * self.slow_factor:
+                self.slowdowns += 1
+                self._slow_down(now)
+                return
+
+            self._streak += 1
+            if self._streak >= self.increase_every:
+                self._streak = 0
+                if self.adaptive:
+                    self.rate = min(self.max_rps, self.rate + self.step)
+                    self.peak_rate = max(self.peak_rate, self.rate)
+
+    def _slow_down(self, now):
+        self._streak = 0
+        if not self.adaptive or now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.rate = max(self.min_rps, self.rate * self.decrease)
+        self.backoffs += 1
+
+    def call(self, func, *args, **kwargs):
+        """슬롯을 기다린 뒤 func(요청) 실행 → func 반환값 (응답 / 예외를 보고 속도 조절)
+
+        func는 requests 응답을 돌려주거나(FetchClient.get), 200이 아니면 HTTPError를
+        던지는(FetchClient.fetch / get_content) 요청 함수입니다. 304(NotModified)는 정상 응답입니다.
+        429 / 5xx / 연결 오류는 retries번까지 다시 보내고, 마지막 응답 / 예외를 그대로 돌려줍니다.
+        CacheMiss(304인데 캐시 항목 없음)는 재시도 횟수와 별개로 한 번 더 슬롯을 기다려 다시 부릅니다.
+        """
+        refetched = False
+        attempt = 0
+        while attempt <= self.retries:
+            last = attempt == self.retries
+            self.wait()
+            started = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except NotModified:
+                self.observe(time.monotonic() - started, 304)
+                raise
+            except CacheMiss:
+                self.observe(time.monotonic() - started, 304)
+                if refetched:
+                    raise
+                refetched = True
+                continue
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                self.observe(time.monotonic() - started, status, retry_after(e.response))
+                if last or not is_overload(status):
+                    raise
+                self._retry_sleep(attempt, e.response)
+                attempt += 1
+                continue
+            except requests.RequestException:
+                self.observe(time.monotonic() - started, None)
+                if last:
+                    raise
+                self._retry_sleep(attempt)
+                attempt += 1
+                continue
+
+            if isinstance(result, requests.Response):
+                self.observe(time.monotonic() - started, result.status_code, retry_after(result))
+                if not last and is_overload(result.status_code):
+                    self._retry_sleep(attempt, result)
+                    attempt += 1
+                    continue
+            else:
+                self.observe(time.monotonic() - started)
+            return result
+
+    def _retry_sleep(self, attempt, response=None):
+        """재시도 전 지수 백오프 (Retry-After가 있으면 observe가 모든 워커를 그만큼 멈춤)"""
+        with self._lock:
+            self.retried += 1
+        if retry_after(response) is None:
+            time.sleep(self.backoff * (2 ** attempt))
+
+    def _percentile(self, p):
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    def percentiles(self):
+        """최근 응답 지연 시간(초) {'p50', 'p95', 'p99'} (응답이 없으면 빈 dict)"""
+        with self._lock:
+            if not self.latencies:
+                return {}
+            return {f"p{round(p * 100)}": self._percentile(p) for p in (0.5, 0.95, 0.99)}
+
+    def status(self):
+        """진행 상황용 한 줄: 지금 초당 요청 수 + 최근 지연 시간"""
+        rate = "제한 없음" if self.unlimited else f"초당 {self.rate:.2f}회"
+        percentiles = self.percentiles()
+        if not percentiles:
+            return rate
+        return f"{rate} | 지연 p50 {percentiles['p50']:.2f}초 p95 {percentiles['p95']:.2f}초"
+
+    def print_stats(self, label):
+        """요청 속도 조절 통계 출력"""
+        if not self.requests:
+            return
+        print(f"\n🚦 {label} 요청 {self.requests}회 (오류 {self.errors}, 재시도 {self.retried}, "
+              f"느려짐 {self.slowdowns}, 감속 {self.backoffs}회) | {self.status()}")
+        if self.adaptive:
+            print(f"   초당 요청 수 범위 {self.min_rps:g} ~ {self.max_rps:g}회, 최고 {self.peak_rate:.2f}회")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 글 데이터 저장소 - posts/ 폴더에 글마다 JSON 1개
+
+재크롤링 없이 다른 형식으로 다시 출력(render-pdf / export-txt)할 때 읽습니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from .link_index import normalize_url, post_id
+
+# 내용 해시에 넣는 필드 (출력 파일 내용을 정하는 값)
+HASHED_FIELDS = ('url', 'title', 'date', 'content', 'content_html')
+
+
+def stable_id(url):
+    """글의 안정적인 ID: ?p= 번호, 없으면 정규화 URL 해시 12자리 (제목이 바뀌어도 그대로)"""
+    number = post_id(url)
+    if number is not None:
+        return str(number)
+    return hashlib.blake2b(normalize_url(url).encode('utf-8'), digest_size=6).hexdigest()
+
+
+def safe_filename(title):
+    """제목 → 파일명 (특수문자 제거, 50자)"""
+    return re.sub(r'[^\w\s-]', '', title)[:50]
+
+
+def output_filename(post_data, extension):
+    """출력 파일명 "제목 (글 ID).확장자" - 앞 50자가 같은 제목도 서로 덮어쓰지 않음
+
+    제목이 비었거나 특수문자뿐이면 "글 ID.확장자"입니다.
+    """
+    title = safe_filename(post_data['title']).strip()
+    if not title:
+        return f"{stable_id(post_data['url'])}{extension}"
+    return f"{title} ({stable_id(post_data['url'])}){extension}"
+
+
+def content_hash(post_data):
+    """글 데이터 내용 해시 (같으면 출력 파일도 같음)"""
+    payload = json.dumps([post_data.get(field, '') for field in HASHED_FIELDS], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def post_record_path(post_data, posts_dir):
+    """글 데이터 JSON 저장 경로 (stable_id: ?p=번호, 없으면 정규화 URL 해시 - 제목과 무관)"""
+    return os.path.join(posts_dir, f"{stable_id(post_data['url'])}.json")
+
+
+def save_post_record(post_data, posts_dir):
+    """수집한 글 데이터를 JSON으로 저장 (나중에 재렌더링용)"""
+    filepath = post_record_path(post_data, posts_dir)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(post_data, f, ensure_ascii=False)
+    return filepath
+
+
+def load_post_records(posts_dir):
+    """저장된 글 데이터(JSON) 폴더 읽기"""
+    for name in sorted(os.listdir(posts_dir)):
+        if name.endswith('.json'):
+            with open(os.path.join(posts_dir, name), encoding='utf-8') as f:
+                yield json.load(f)
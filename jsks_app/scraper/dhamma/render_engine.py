@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr PDF 렌더링 엔진 - WeasyPrint(또는 fpdf2 빠른 렌더러)를 프로세스 풀에서 병렬 실행
+
+WeasyPrint 렌더링은 CPU를 쓰고 GIL을 잡고 있어서 스레드로는 코어 1개만
+사용합니다. 이 엔진은 이미 수집한 글 데이터(dict)를 워커 프로세스에 나눠
+렌더링하고, 문서별 렌더링 시간과 워커 최대 메모리(peak RSS)를 집계합니다.
+
+긴 글(여러 경전을 모은 글)도 워커 메모리가 일정하도록:
+    - 부모 프로세스가 HTML 문서를 템플릿 앞부분 / 본문 / 뒷부분 순서로 임시 파일에 흘려 쓰고,
+      워커에는 파일 경로만 넘김 (글 데이터 dict나 문서 전체 문자열을 워커로 보내지 않음)
+    - 워커는 문서 max_tasks개마다 새 프로세스로 바뀜 (큰 글을 렌더링하며 늘어난 메모리 반환)
+
+저장된 글(JSON) 폴더 재렌더링은 CLI로 (재크롤링 없음):
+    python3 -m dhamma render-pdf posts/ pdfs/ --workers 8
+    python3 -m dhamma render-pdf --dry-run     # 다시 렌더링할 글 수 / 예상 시간만
+    python3 -m dhamma render-pdf --fast        # fpdf2 단순 레이아웃 (dhamma/fast_pdf.py)
+
+PDF마다 템플릿 지문(STYLESHEET + HTML_TEMPLATE + 폰트 파일)을 매니페스트에 남기므로,
+CSS나 폰트를 바꾼 뒤 render-pdf를 실행하면 지문이 다른 PDF만 다시 렌더링합니다.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import contextlib
+import hashlib
+import html
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .records import output_filename
+from .settings import FONT_PATH, RENDER_MAX_TASKS
+
+# build_html / PdfRenderer 코드를 바꾸면 올림 (템플릿 문자열 / 폰트는 지문에 자동 포함)
+TEMPLATE_VERSION = '2'
+
+STYLESHEET = """
+@font-face {{
+    font-family: 'NanumGothic';
+    src: url('file://{font_path}');
+}}
+
+body {{
+    font-family: 'NanumGothic', serif;
+    font-size: 12pt;
+    line-height: 1.8;
+    color: #333;
+    margin: 2cm;
+    max-width: 800px;
+}}
+
+h1 {{
+    font-size: 24pt;
+    font-weight: bold;
+    color: #2c3e50;
+    border-bottom: 3px solid #3498db;
+    padding-bottom: 10px;
+    margin-bottom: 20px;
+}}
+
+.meta {{
+    font-size: 10pt;
+    color: #7f8c8d;
+    margin-bottom: 30px;
+    padding: 10px;
+    background-color: #ecf0f1;
+    border-left: 4px solid #3498db;
+}}
+
+.content {{
+    text-align: justify;
+    word-break: keep-all;
+}}
+
+.content p {{
+    margin-bottom: 1em;
+    text-indent: 1em;
+}}
+
+.footer {{
+    margin-top: 50px;
+    padding-top: 20px;
+    border-top: 1px solid #bdc3c7;
+    font-size: 9pt;
+    color: #95a5a6;
+    text-align: center;
+}}
+
+@page {{
+    size: A4;
+    margin: 2cm;
+
+    @bottom-right {{
+        content: counter(page) " / " counter(pages);
+        font-family: 'NanumGothic';
+        font-size: 9pt;
+        color: #7f8c8d;
+    }}
+}}
+"""
+
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+</head>
+<body>
+    <h1>{title}</h1>
+
+    <div class="meta">
+        <strong>날짜:</strong> {date}<br>
+        <strong>출처:</strong> {url}
+    </div>
+
+    <div class="content">
+        {content_html}
+    </div>
+
+    <div class="footer">
+        본 문서는 dhamma.kr에서 수집한 내용입니다.
+    </div>
+</body>
+</html>
+"""
+
+# 본문 앞 / 뒤 (본문은 그 사이에 그대로 흘려 씀)
+HTML_HEAD, _, HTML_TAIL = HTML_TEMPLATE.partition('{content_html}')
+
+# 묶음(권) PDF: 글마다 새 페이지, <h1> 제목이 그대로 책갈피가 됨
+VOLUME_STYLESHEET = """
+.post {
+    break-before: page;
+}
+
+.post:first-of-type {
+    break-before: auto;
+}
+
+h1 {
+    bookmark-level: 1;
+}
+"""
+
+VOLUME_HEAD = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+</head>
+<body>
+"""
+
+VOLUME_SECTION = """
+<section class="post">
+    <h1>{title}</h1>
+
+    <div class="meta">
+        <strong>날짜:</strong> {date}<br>
+        <strong>출처:</strong> {url}
+    </div>
+
+    <div class="content">
+        {content_html}
+    </div>
+</section>
+"""
+
+VOLUME_TAIL = """
+<div class="footer">
+    본 문서는 dhamma.kr에서 수집한 내용입니다.
+</div>
+</body>
+</html>
+"""
+
+# 렌더링 백엔드: weasyprint (HTML / CSS 레이아웃) / fpdf (단순 레이아웃, 시스템 라이브러리 불필요 - dhamma/fast_pdf.py)
+BACKENDS = ('weasyprint', 'fpdf')
+
+# 워커 프로세스별 렌더러 (프로세스 시작 시 1회 생성)
+_worker_state = {}
+
+
+def html_meta(post_data):
+    """제목 / 날짜 / URL을 HTML로 이스케이프 (content_html은 이미 HTML)"""
+    return {field: html.escape(post_data[field]) for field in ('title', 'date', 'url')}
+
+
+def build_html(post_data):
+    """글 데이터 → PDF용 HTML 문서 (스타일은 PdfRenderer가 따로 적용)"""
+    return HTML_TEMPLATE.format(content_html=post_data['content_html'], **html_meta(post_data))
+
+
+def write_html(f, post_data):
+    """글 1개 HTML 문서를 파일에 씀 (build_html과 같은 문서, 본문을 다른 문자열에 복사하지 않음)"""
+    f.write(HTML_HEAD.format(**html_meta(post_data)))
+    f.write(post_data['content_html'])
+    f.write(HTML_TAIL)
+
+
+def write_volume_html(f, title, posts):
+    """묶음 HTML을 글 1개씩 파일에 이어 씀 (문서 전체를 문자열로 만들지 않음)"""
+    f.write(VOLUME_HEAD.format(title=html.escape(title)))
+    for post_data in posts:
+        f.write(VOLUME_SECTION.format(content_html=post_data['content_html'], **html_meta(post_data)))
+    f.write(VOLUME_TAIL)
+
+
+def fingerprint(version, parts, font_path):
+    """지문: 버전 + 템플릿 문자열들 + 폰트 파일 내용 해시 → "버전-해시" 문자열"""
+    digest = hashlib.blake2b(digest_size=8)
+    for part in (version,) + tuple(parts):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    try:
+        with open(font_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        # 폰트가 없으면 경로만 (폰트를 넣으면 지문이 바뀌어 다시 렌더링)
+        digest.update(font_path.encode('utf-8'))
+    return f"{version}-{digest.hexdigest()}"
+
+
+def template_fingerprint(font_path=FONT_PATH, volume=False):
+    """템플릿 지문: TEMPLATE_VERSION + STYLESHEET + HTML_TEMPLATE(묶음이면 묶음 템플릿) + 폰트 파일 내용 해시"""
+    parts = (STYLESHEET, HTML_TEMPLATE)
+    if volume:
+        parts = (STYLESHEET, VOLUME_STYLESHEET, VOLUME_HEAD, VOLUME_SECTION, VOLUME_TAIL)
+    return fingerprint(TEMPLATE_VERSION, parts, font_path)
+
+
+def pdf_path(post_data, output_dir):
+    """PDF 파일 경로 ("제목 (글 ID).pdf")"""
+    return os.path.join(output_dir, output_filename(post_data, '.pdf'))
+
+
+class PdfRenderer:
+    """스타일시트와 폰트를 한 번만 준비해서 여러 문서에 재사용하는 렌더러
+
+    문서마다 <style>을 넣으면 WeasyPrint가 CSS 파싱과 @font-face 폰트 등록을
+    매번 다시 합니다. 여기서는 CSS 객체와 FontConfiguration을 한 번 만들어
+    모든 문서에 같이 넘깁니다.
+
+    RenderEngine은 부모 프로세스에서 write_document로 문서 파일(suffix)을 쓰고,
+    워커에서 render_file로 렌더링합니다 (FastPdfRenderer도 같은 인터페이스).
+    """
+
+    suffix = '.html'
+    write_document = staticmethod(write_html)
+
+    def __init__(self, font_path=FONT_PATH):
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.font_path = font_path
+        self.font_config = FontConfiguration()
+        self.stylesheet = CSS(string=STYLESHEET.format(font_path=font_path), font_config=self.font_config)
+        self.volume_stylesheet = CSS(string=VOLUME_STYLESHEET, font_config=self.font_config)
+
+    def render(self, post_data, filepath):
+        """글 1개를 PDF 파일로 렌더링 (HTML은 임시 파일에 흘려 씀)"""
+        fd, html_path = tempfile.mkstemp(suffix='.html', dir=os.path.dirname(filepath) or None)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                write_html(f, post_data)
+            return self.render_file(html_path, filepath)
+        finally:
+            os.remove(html_path)
+
+    def render_file(self, html_path, filepath, volume=False):
+        """HTML 파일 → PDF (volume이면 묶음 스타일 추가: 글마다 새 페이지 + 책갈피)"""
+        from weasyprint import HTML
+
+        stylesheets = [self.stylesheet, self.volume_stylesheet] if volume else [self.stylesheet]
+        HTML(filename=html_path, encoding='utf-8').write_pdf(
+            filepath,
+            stylesheets=stylesheets,
+            font_config=self.font_config,
+        )
+        return filepath
+
+
+def renderer_class(backend):
+    """백엔드 이름 → 렌더러 클래스 (없으면 ValueError)"""
+    if backend == 'weasyprint':
+        return PdfRenderer
+    if backend == 'fpdf':
+        from .fast_pdf import FastPdfRenderer
+
+        return FastPdfRenderer
+    raise ValueError(f"알 수 없는 렌더링 백엔드: {backend} (사용 가능: {', '.join(BACKENDS)})")
+
+
+def _init_worker(font_path, backend='weasyprint'):
+    """워커 프로세스 초기화: 스타일시트 파싱 + 폰트 등록 (프로세스당 1회)"""
+    _worker_state['renderer'] = renderer_class(backend)(font_path)
+
+
+def peak_rss_mb():
+    """이 프로세스의 최대 메모리 사용량(MB), 알 수 없으면 None"""
+    if resource is None:
+        return None
+    # Linux는 KB, macOS는 바이트 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if peak > 1 << 30 else peak / 1024
+
+
+def _render_in_worker(document_path, filepath, volume=False):
+    """워커 프로세스에서 문서 파일(HTML) 렌더링 → (경로, 렌더링 시간, 워커 최대 메모리 MB)"""
+    started = time.perf_counter()
+    filepath = _worker_state['renderer'].render_file(document_path, filepath, volume)
+    return filepath, time.perf_counter() - started, peak_rss_mb()
+
+
+def _remove(path):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+class RenderEngine:
+    """프로세스 풀 기반 PDF 렌더링 엔진
+
+    저장 경로는 부모 프로세스에서 path(post_data)로 정합니다 (기본 pdf_path).
+    max_tasks(기본 settings.RENDER_MAX_TASKS)개를 렌더링한 워커는 새 프로세스로 바뀌고,
+    0 / None이면 끝까지 같은 워커를 씁니다. backend는 BACKENDS 중 하나입니다 (기본 weasyprint).
+    """
+
+    def __init__(self, output_dir, workers=None, font_path=FONT_PATH, path=None, max_tasks=RENDER_MAX_TASKS,
+                 backend='weasyprint'):
+        self.output_dir = output_dir
+        self.backend = backend
+        self.renderer_class = renderer_class(backend)
+        self.path = path or (lambda post_data: pdf_path(post_data, output_dir))
+        self.workers = workers or os.cpu_count() or 1
+        self.latencies = []
+        self.failed = 0
+        self.peak_rss = None
+        self._lock = threading.Lock()
+        options = {}
+        if max_tasks:
+            # Python 3.11+ (워커는 spawn으로 시작)
+            options['max_tasks_per_child'] = max_tasks
+        try:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                initargs=(font_path, backend), **options)
+        except TypeError:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                initargs=(font_path, backend))
+        os.makedirs(output_dir, exist_ok=True)
+        # 렌더링 대기 중인 문서 파일 (tmpfs일 수 있는 /tmp 대신 저장 폴더 아래): Future → 경로
+        self._spool_dir = tempfile.mkdtemp(prefix='.render-', dir=output_dir)
+        self._spooled = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+        shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+    def _record(self, seconds, peak_rss=None):
+        """렌더링 결과 집계 (None이면 실패)"""
+        with self._lock:
+            if seconds is None:
+                self.failed += 1
+            else:
+                self.latencies.append(seconds)
+            if peak_rss is not None and (self.peak_rss is None or peak_rss > self.peak_rss):
+                self.peak_rss = peak_rss
+
+    def submit(self, post_data, filepath=None):
+        """렌더링 작업 제출 → Future[(경로, 렌더링 시간, 워커 최대 메모리 MB)]
+
+        문서 파일(HTML)은 여기서(부모 프로세스) 임시 파일로 쓰고, 렌더링이 끝나면 지웁니다.
+        """
+        fd, document_path = tempfile.mkstemp(suffix=self.renderer_class.suffix, dir=self._spool_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            self.renderer_class.write_document(f, post_data)
+        future = self.executor.submit(_render_in_worker, document_path, filepath or self.path(post_data))
+        with self._lock:
+            self._spooled[future] = document_path
+        return future
+
+    def submit_volume(self, html_path, filepath):
+        """묶음 HTML 파일 렌더링 작업 제출 → Future[(경로, 렌더링 시간, 워커 최대 메모리 MB)]"""
+        return self.executor.submit(_render_in_worker, html_path, filepath, True)
+
+    def _finish(self, future, label):
+        """작업 결과 기다리기 → 저장 경로, 실패 시 None (집계 포함, 임시 문서 파일 삭제)"""
+        try:
+            filepath, seconds, peak_rss = future.result()
+        except Exception as e:
+            print(f"⚠️  PDF 생성 오류 ({label}): {e}")
+            self._record(None)
+            return None
+        finally:
+            with self._lock:
+                document_path = self._spooled.pop(future, None)
+            if document_path:
+                _remove(document_path)
+
+        self._record(seconds, peak_rss)
+        return filepath
+
+    def render(self, post_data, filepath=None):
+        """글 1개 렌더링 (완료까지 대기) → 저장 경로, 실패 시 None
+
+        여러 스레드에서 동시에 호출하면 워커 프로세스 수만큼 병렬로 렌더링됩니다.
+        """
+        return self._finish(self.submit(post_data, filepath), post_data.get('url'))
+
+    def render_async(self, post_data, filepath=None):
+        """글 1개 렌더링 제출 → Future[저장 경로 또는 None] (기다리지 않음, 비동기 크롤러용)
+
+        결과는 프로세스 풀 완료 콜백에서 집계하므로 asyncio.wrap_future로 바로 기다릴 수 있습니다.
+        """
+        result = Future()
+
+        def finish(future):
+            result.set_result(self._finish(future, post_data.get('url')))
+
+        self.submit(post_data, filepath).add_done_callback(finish)
+        return result
+
+    def render_all(self, posts, current=None):
+        """여러 글을 병렬 렌더링 → (글, 경로 또는 None, 이번에 렌더링했는지) 순서대로 반환
+
+        current(post_data)가 경로를 돌려주는 글(이미 최신 PDF가 있는 글)은 렌더링하지 않습니다.
+        제출해 둔 작업은 워커 수의 4배까지만 유지해서 큰 폴더도 메모리가 일정합니다.
+        """
+        window = deque()
+        posts = iter(posts)
+
+        while True:
+            while len(window) < self.workers * 4:
+                post_data = next(posts, None)
+                if post_data is None:
+                    break
+                existing = current(post_data) if current else None
+                window.append((post_data, existing, None if existing else self.submit(post_data)))
+
+            if not window:
+                return
+
+            post_data, existing, future = window.popleft()
+            if future is None:
+                yield post_data, existing, False
+                continue
+            filepath = self._finish(future, post_data.get('url'))
+            yield post_data, filepath, filepath is not None
+
+    def render_volumes(self, volumes):
+        """묶음 병렬 렌더링: (키, HTML 경로, PDF 경로) → (키, PDF 경로 또는 None) 순서대로
+
+        묶음 HTML은 크므로 제출해 둔 작업을 워커 수만큼만 유지합니다
+        (volumes가 생성기면 HTML도 그때그때 만들어짐).
+        """
+        window = deque()
+        volumes = iter(volumes)
+
+        while True:
+            while len(window) < self.workers:
+                volume = next(volumes, None)
+                if volume is None:
+                    break
+                key, html_path, filepath = volume
+                window.append((key, self.submit_volume(html_path, filepath)))
+
+            if not window:
+                return
+
+            key, future = window.popleft()
+            yield key, self._finish(future, f"묶음 {key}")
+
+    def print_stats(self):
+        """문서별 렌더링 시간 통계 출력"""
+        if not self.latencies:
+            print(f"\n🖨️  렌더링 통계: 성공 0, 실패 {self.failed}")
+            return
+
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+
+        def percentile(p):
+            return latencies[min(count - 1, int(count * p))]
+
+        print(f"\n🖨️  렌더링 통계 ({self.backend}, 워커 {self.workers}개): 성공 {count}, 실패 {self.failed}")
+        print(f"   문서당 평균 {sum(latencies) / count:.2f}초 | p50 {percentile(0.5):.2f}초 | "
+              f"p95 {percentile(0.95):.2f}초 | 최대 {latencies[-1]:.2f}초")
+        if self.peak_rss is not None:
+            print(f"   워커 최대 메모리 (peak RSS) {self.peak_rss:.0f}MB")
+
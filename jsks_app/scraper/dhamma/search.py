@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 전문 검색 색인 - 한글 2글자(bigram) 역색인 (SQLite 파일 1개, 외부 서비스 없음)
+
+형태소 분석기 없이 단어를 두 글자씩 겹쳐 자릅니다 ("법구경" → 법구, 구경 + 끝 글자 경).
+단어의 끝 글자는 한 글자 토큰으로도 넣어서, 한 글자 검색("법")과 여러 단어 구(phrase)의
+단어 경계를 확인할 수 있습니다. 토큰 위치는 정규화한 본문(소문자, 공백 1칸)의 글자 위치입니다.
+
+    docs      글 1개 = 1행 (key = 글 URL, 없으면 파일 경로), 글자 수 대신 토큰 수(BM25 길이)
+    postings  (토큰, 세그먼트) → 압축된 게시 목록 BLOB
+              글마다 [글 번호 차이, 등장 횟수, 위치 바이트 수, 위치 차이...] 를 varint로 이어 붙임
+              (한 번만 나온 토큰은 위치 바이트 수 생략)
+
+색인 추가는 새 세그먼트로만 씁니다 (기존 BLOB은 고치지 않음). 바뀐 글은 새 글 번호로 다시
+넣고 예전 행은 docs에서 지우기만 하며, 세그먼트가 MAX_SEGMENTS개를 넘으면 지워진 글을 빼고
+하나로 합칩니다. 글 번호는 계속 커지므로 세그먼트 순서대로 이으면 항상 글 번호 순입니다.
+
+검색어:
+    자비 마음          두 단어가 모두 있는 글 (AND)
+    "자비로운 마음"    붙어 있는 구
+    자비 OR 연민       둘 중 하나
+    자비 -분노         분노가 없는 글
+결과는 BM25 점수 순입니다.
+"""
+
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+# 세그먼트를 몇 개 쌓으면 합칠지
+MAX_SEGMENTS = 8
+# 색인에 넣는 중인 글을 몇 개마다 세그먼트로 쓸지
+FLUSH_DOCS = 500
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SNIPPET_CHARS = 40
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT UNIQUE NOT NULL,
+    signature TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT,
+    path TEXT,
+    stamp TEXT,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_path ON docs (path);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (term, segment)
+) WITHOUT ROWID;
+"""
+
+_WORD = re.compile(r'\w+')
+_QUERY_PART = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+
+# --- 토큰 ---
+
+def normalize_text(text):
+    """검색용 정규화: NFKC + 소문자, 글자(\\w)가 아닌 부분은 공백 1칸"""
+    return ' '.join(_WORD.findall(unicodedata.normalize('NFKC', text).lower()))
+
+
+def tokenize(normalized):
+    """정규화한 본문 → {토큰: [위치...]} (두 글자씩 + 단어 끝 글자)"""
+    terms = {}
+    for position, pair in enumerate(map(str.__add__, normalized, normalized[1:] + ' ')):
+        if pair[1] == ' ':
+            pair = pair[0]
+        elif pair[0] == ' ':
+            continue
+        positions = terms.get(pair)
+        if positions is None:
+            terms[pair] = [position]
+        else:
+            positions.append(position)
+    return terms
+
+
+def query_tokens(text):
+    """검색 구 → [(상대 위치, 토큰, 앞글자 일치 여부)]
+
+    마지막 단어가 두 글자 이상이면 끝 글자 토큰을 넣지 않아 "법구"가 "법구경"에도 걸리고,
+    마지막 단어가 한 글자면 그 글자로 시작하는 모든 토큰과 맞춥니다.
+    """
+    words = list(_WORD.finditer(normalize_text(text)))
+    tokens = []
+    for n, match in enumerate(words):
+        start, word = match.start(), match.group()
+        last = n == len(words) - 1
+        for i in range(len(word) - 1):
+            tokens.append((start + i, word[i:i + 2], False))
+        if len(word) == 1 or not last:
+            tokens.append((match.end() - 1, word[-1], last))
+    return tokens
+
+
+def parse_query(query):
+    """검색어 → [(꼭 있어야 할 구 목록, 없어야 할 구 목록)] (OR로 나뉜 묶음마다 1개)"""
+    clauses = [([], [])]
+    for match in _QUERY_PART.finditer(query):
+        negate, quoted, word = match.groups()
+        if word == 'OR':
+            clauses.append(([], []))
+            continue
+        if word == 'AND':
+            continue
+        if word is not None:
+            negate = word.startswith('-') and len(word) > 1
+            quoted = word[1:] if negate else word
+        tokens = query_tokens(quoted)
+        if tokens:
+            clauses[-1][1 if negate else 0].append(tokens)
+    return [clause for clause in clauses if clause[0]]
+
+
+# --- 게시 목록 압축 (varint + 차이값) ---
+
+def encode_varints(numbers, out):
+    for n in numbers:
+        while n >= 0x80:
+            out.append((n & 0x7f) | 0x80)
+            n >>= 7
+        out.append(n)
+
+
+def decode_positions(data):
+    """위치 차이 varint → 위치 목록"""
+    positions = []
+    n = shift = 0
+    position = 0
+    for byte in data:
+        if byte & 0x80:
+            n |= (byte & 0x7f) << shift
+            shift += 7
+        else:
+            position += n | (byte << shift)
+            positions.append(position)
+            n = shift = 0
+    return positions
+
+
+def _read_varint(data, i):
+    n = shift = 0
+    while True:
+        byte = data[i]
+        i += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return n, i
+        shift += 7
+
+
+def encode_postings(entries):
+    """[(글 번호, 등장 횟수, 위치 바이트)] (글 번호 순) → BLOB"""
+    out = bytearray()
+    previous = 0
+    for doc, tf, raw in entries:
+        # 한 번만 나온 토큰(대부분)은 위치 varint 1개뿐이라 바이트 수를 생략
+        encode_varints((doc - previous, tf) if tf == 1 else (doc - previous, tf, len(raw)), out)
+        out += raw
+        previous = doc
+    return bytes(out)
+
+
+def iter_postings(data):
+    """BLOB → (글 번호, 등장 횟수, 위치 바이트) - 위치는 필요할 때만 풀도록 바이트 그대로"""
+    i = 0
+    doc = 0
+    end = len(data)
+    while i < end:
+        delta, i = _read_varint(data, i)
+        tf, i = _read_varint(data, i)
+        if tf == 1:
+            start = i
+            _, i = _read_varint(data, i)
+        else:
+            size, start = _read_varint(data, i)
+            i = start + size
+        doc += delta
+        yield doc, tf, data[start:i]
+
+
+def position_bytes(positions):
+    """위치 목록 → 차이 varint (encode_varints를 글자마다 부르지 않도록 풀어 씀)"""
+    out = bytearray()
+    previous = 0
+    for position in positions:
+        n = position - previous
+        previous = position
+        while n >= 0x80:
+            out.append((n & 0x7f) | 0x80)
+            n >>= 7
+        out.append(n)
+    return bytes(out)
+
+
+def _positions(value):
+    """게시 목록 값 → 위치 목록 (앞글자 일치 토큰은 여러 토큰의 위치를 합침)"""
+    raw = value[1]
+    if isinstance(raw, list):
+        return sorted(position for chunk in raw for position in decode_positions(chunk))
+    return decode_positions(raw)
+
+
+def _first_position(value):
+    raw = value[1]
+    if isinstance(raw, list):
+        return min(_read_varint(chunk, 0)[0] for chunk in raw)
+    return _read_varint(raw, 0)[0]
+
+
+# --- 텍스트 파일 (texts/) ---
+
+def read_text_file(path):
+    """save_as_text 형식 파일 → 글 데이터 (제목 / 날짜 / URL 헤더 + 본문)"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    post_data = {'title': os.path.splitext(os.path.basename(path))[0], 'date': '', 'url': '', 'content': text}
+    header, separator, body = text.partition("\n" + "=" * 80 + "\n\n")
+    if separator:
+        fields = {'제목': 'title', '날짜': 'date', 'URL': 'url'}
+        for line in header.splitlines():
+            name, _, value = line.partition(': ')
+            if name in fields:
+                post_data[fields[name]] = value.strip()
+        post_data['content'] = body
+    return post_data
+
+
+def document_text(post_data):
+    """색인하는 글자: 제목 + 본문"""
+    return f"{post_data['title']}\n{post_data['content']}"
+
+
+def content_signature(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# --- 색인 ---
+
+class SearchHit:
+    """검색 결과 1개"""
+
+    __slots__ = ('doc', 'score', 'title', 'url', 'path', 'position')
+
+    def __init__(self, doc, score, title, url, path, position):
+        self.doc = doc
+        self.score = score
+        self.title = title
+        self.url = url
+        self.path = path
+        self.position = position
+
+    def snippet(self, width=SNIPPET_CHARS):
+        """처음 일치한 곳 앞뒤 본문 (텍스트 파일이 있을 때만)"""
+        if not self.path or not os.path.exists(self.path):
+            return ''
+        normalized = normalize_text(document_text(read_text_file(self.path)))
+        start = max(0, self.position - width)
+        end = self.position + width * 2
+        return ('…' if start else '') + normalized[start:end] + ('…' if end < len(normalized) else '')
+
+
+class SearchIndex:
+    """검색 색인 (with로 사용, 여러 스레드에서 add 가능)"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        # 세그먼트로 쓰기 전인 글: [(글 번호, {토큰: [위치...]})]
+        self._pending = []
+        self._live = None
+        self.added = 0
+        self.removed = 0
+        self.unchanged = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self.conn is None:
+                return
+            self.flush()
+            # fetch는 출력 형식을 모두 닫은 뒤 통계를 출력하므로 닫기 전에 기억
+            self._closed_stats = self.stats()
+            self.conn.close()
+            self.conn = None
+
+    def __len__(self):
+        return len(self._live_docs())
+
+    # --- 추가 / 삭제 ---
+
+    def add(self, key, post_data, path=None, stamp=None):
+        """글 1개 색인 → 새로 넣었으면 True (내용이 같으면 건너뜀)
+
+        key가 이미 있으면 예전 글은 지우고 새 글 번호로 넣습니다.
+        """
+        text = document_text(post_data)
+        signature = content_signature(text)
+        normalized = normalize_text(text)
+
+        with self._lock:
+            row = self.conn.execute("SELECT doc, signature FROM docs WHERE key = ?", (key,)).fetchone()
+            if row and row[1] == signature:
+                self.conn.execute("UPDATE docs SET path = COALESCE(?, path), stamp = COALESCE(?, stamp) WHERE doc = ?",
+                                  (path, stamp, row[0]))
+                self.unchanged += 1
+                return False
+            if row:
+                self.conn.execute("DELETE FROM docs WHERE doc = ?", (row[0],))
+
+            terms = tokenize(normalized)
+            length = sum(map(len, terms.values()))
+            cursor = self.conn.execute(
+                "INSERT INTO docs (key, signature, title, url, path, stamp, length) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, signature, post_data['title'], post_data.get('url') or None, path, stamp, length),
+            )
+            self._pending.append((cursor.lastrowid, terms))
+            self._live = None
+            self.added += 1
+            if len(self._pending) >= FLUSH_DOCS:
+                self.flush()
+            return True
+
+    def remove(self, key):
+        """글 삭제 (게시 목록에서는 다음 세그먼트 합치기 때 빠짐)"""
+        with self._lock:
+            cursor = self.conn.execute("DELETE FROM docs WHERE key = ?", (key,))
+            if cursor.rowcount:
+                self._live = None
+                self.removed += 1
+
+    def flush(self):
+        """쌓인 글을 새 세그먼트로 쓰고 커밋 (세그먼트가 많으면 합치기)"""
+        with self._lock:
+            self._write_segment()
+            if self.conn.execute("SELECT COUNT(DISTINCT segment) FROM postings").fetchone()[0] > MAX_SEGMENTS:
+                self.compact()
+
+    def _write_segment(self):
+        if self._pending:
+            segment = self.conn.execute("SELECT COALESCE(MAX(segment) + 1, 0) FROM postings").fetchone()[0]
+            postings = {}
+            for doc, terms in self._pending:
+                for term, positions in terms.items():
+                    postings.setdefault(term, []).append((doc, len(positions), position_bytes(positions)))
+            self.conn.executemany(
+                "INSERT INTO postings (term, segment, data) VALUES (?, ?, ?)",
+                ((term, segment, encode_postings(entries)) for term, entries in postings.items()),
+            )
+            self._pending = []
+        self.conn.commit()
+
+    def compact(self):
+        """모든 세그먼트를 세그먼트 0 하나로 합침 (지워진 글은 버림)"""
+        with self._lock:
+            self._write_segment()
+            live = self._live_docs()
+            merged = []
+            current = None
+            entries = []
+            for term, data in self.conn.execute("SELECT term, data FROM postings ORDER BY term, segment"):
+                if term != current:
+                    if entries:
+                        merged.append((current, encode_postings(entries)))
+                    current = term
+                    entries = []
+                entries.extend(entry for entry in iter_postings(data) if entry[0] in live)
+            if entries:
+                merged.append((current, encode_postings(entries)))
+
+            self.conn.execute("DELETE FROM postings")
+            self.conn.executemany("INSERT INTO postings (term, segment, data) VALUES (?, 0, ?)", merged)
+            self.conn.commit()
+            self.conn.execute("VACUUM")
+
+    def _live_docs(self):
+        """살아 있는 글 번호 → 토큰 수 (색인이 바뀔 때만 다시 읽음)"""
+        with self._lock:
+            if self._live is None:
+                self._live = dict(self.conn.execute("SELECT doc, length FROM docs"))
+            return self._live
+
+    # --- 텍스트 파일 폴더 ---
+
+    def index_text_files(self, texts_dir):
+        """texts/ 폴더 증분 색인: 수정 시각 / 크기가 같은 파일은 읽지 않고, 없어진 파일은 삭제 → 새로 넣은 글 수"""
+        texts_dir = os.path.abspath(texts_dir)
+        with self._lock:
+            stamps = dict(self.conn.execute("SELECT path, stamp FROM docs WHERE path IS NOT NULL"))
+        seen = set()
+        added = 0
+        for name in sorted(os.listdir(texts_dir)):
+            if not name.endswith('.txt'):
+                continue
+            path = os.path.join(texts_dir, name)
+            stat = os.stat(path)
+            stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+            seen.add(path)
+            if stamps.get(path) == stamp:
+                self.unchanged += 1
+                continue
+            post_data = read_text_file(path)
+            if self.add(post_data['url'] or path, post_data, path, stamp):
+                added += 1
+
+        with self._lock:
+            gone = [key for key, path in self.conn.execute("SELECT key, path FROM docs WHERE path IS NOT NULL")
+                    if os.path.dirname(path) == texts_dir and path not in seen]
+        for key in gone:
+            self.remove(key)
+        self.flush()
+        return added
+
+    # --- 검색 ---
+
+    def _postings(self, term, prefix, cache):
+        """토큰 → {글 번호: (등장 횟수, 위치 바이트 또는 (앞글자 일치) 위치 바이트 목록)}"""
+        if (term, prefix) in cache:
+            return cache[term, prefix]
+        with self._lock:
+            if prefix:
+                rows = self.conn.execute(
+                    "SELECT data FROM postings WHERE term >= ? AND term <= ? ORDER BY term, segment",
+                    (term, term + '\U0010ffff')).fetchall()
+            else:
+                rows = self.conn.execute(
+                    "SELECT data FROM postings WHERE term = ? ORDER BY segment", (term,)).fetchall()
+
+        result = {}
+        for (data,) in rows:
+            for doc, tf, raw in iter_postings(data):
+                if not prefix:
+                    result[doc] = (tf, raw)
+                elif doc in result:
+                    old_tf, chunks = result[doc]
+                    chunks.append(raw)
+                    result[doc] = (old_tf + tf, chunks)
+                else:
+                    result[doc] = (tf, [raw])
+        cache[term, prefix] = result
+        return result
+
+    def _match_phrase(self, tokens, live, cache):
+        """구 1개 → {글 번호: (일치 횟수, 처음 일치 위치)}"""
+        lists = [(rel, self._postings(term, prefix, cache)) for rel, term, prefix in tokens]
+        lists.sort(key=lambda item: len(item[1]))
+        docs = [doc for doc in lists[0][1] if doc in live]
+        for _, postings in lists[1:]:
+            docs = [doc for doc in docs if doc in postings]
+
+        matches = {}
+        if len(lists) == 1:
+            rel, postings = lists[0]
+            for doc in docs:
+                matches[doc] = (postings[doc][0], _first_position(postings[doc]) - rel)
+            return matches
+
+        for doc in docs:
+            starts = None
+            for rel, postings in lists:
+                shifted = {position - rel for position in _positions(postings[doc])}
+                starts = shifted if starts is None else starts & shifted
+                if not starts:
+                    break
+            if starts:
+                matches[doc] = (len(starts), min(starts))
+        return matches
+
+    def search(self, query, limit=10):
+        """검색어 → [SearchHit] (BM25 점수 순) - 아직 쓰지 않은 글도 먼저 세그먼트로 씀"""
+        with self._lock:
+            if self._pending:
+                self.flush()
+        live = self._live_docs()
+        if not live:
+            return []
+        total = len(live)
+        average_length = sum(live.values()) / total
+        cache = {}
+
+        scores = {}
+        first_positions = {}
+        for must, must_not in parse_query(query):
+            clause = None
+            clause_scores = {}
+            for tokens in must:
+                matches = self._match_phrase(tokens, live, cache)
+                idf = math.log(1 + (total - len(matches) + 0.5) / (len(matches) + 0.5))
+                for doc, (count, first) in matches.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * live[doc] / average_length)
+                    clause_scores[doc] = clause_scores.get(doc, 0.0) + idf * count * (BM25_K1 + 1) / (count + norm)
+                    first_positions.setdefault(doc, first)
+                clause = set(matches) if clause is None else clause & matches.keys()
+            for tokens in must_not:
+                clause -= self._match_phrase(tokens, live, cache).keys()
+            for doc in clause:
+                scores[doc] = scores.get(doc, 0.0) + clause_scores[doc]
+
+        top = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        hits = []
+        with self._lock:
+            for doc, score in top:
+                title, url, path = self.conn.execute(
+                    "SELECT title, url, path FROM docs WHERE doc = ?", (doc,)).fetchone()
+                hits.append(SearchHit(doc, score, title, url, path, first_positions[doc]))
+        return hits
+
+    def stats(self):
+        """(글 수, 토큰 수, 세그먼트 수, 게시 목록 바이트)"""
+        with self._lock:
+            if self.conn is None:
+                return self._closed_stats
+            terms, segments, size = self.conn.execute(
+                "SELECT COUNT(DISTINCT term), COUNT(DISTINCT segment), COALESCE(SUM(LENGTH(data)), 0) FROM postings"
+            ).fetchone()
+            return len(self), terms, segments, size
+
+    def print_stats(self):
+        docs, terms, segments, size = self.stats()
+        print(f"🔎 검색 색인: 글 {docs:,}개 | 토큰 {terms:,}개 | 세그먼트 {segments}개 | "
+              f"게시 목록 {size / 1024 / 1024:.1f}MB | 이번 실행 추가 {self.added}개, "
+              f"그대로 {self.unchanged}개, 삭제 {self.removed}개")
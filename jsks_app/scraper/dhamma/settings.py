@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 크롤러 기본 설정 - CLI 옵션을 주지 않았을 때 사용하는 값
+"""
+
+import os
+
+BASE_URL = "http://www.dhamma.kr/wp/"
+
+# 목록 페이지 수 (2025년 기준) - 마지막 페이지 찾기의 시작점 / 찾기에 실패했을 때의 상한
+MAX_PAGES = 3368
+
+# scraper/ 폴더 (패키지 바로 위) 기준 경로
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POSTS_DIR = os.path.join(SCRAPER_DIR, "posts")
+STATE_DB = os.path.join(SCRAPER_DIR, "crawl_state.db")
+CACHE_DB = os.path.join(SCRAPER_DIR, "http_cache.db")
+# 중복 글 찾기용 MinHash 서명
+DEDUP_DB = os.path.join(SCRAPER_DIR, "dedup.db")
+# 받은 글 HTML 원본 보관소 (.warc.zst로 바꾸면 zstd 압축)
+ARCHIVE_PATH = os.path.join(SCRAPER_DIR, "raw", "posts.warc.gz")
+# 시리즈별 묶음 PDF (render-volumes)
+VOLUMES_DIR = os.path.join(SCRAPER_DIR, "volumes")
+FONT_PATH = os.path.join(SCRAPER_DIR, "fonts", "NanumGothic.ttf")
+# 전문 검색 색인 (search-index / search, fetch --format index)
+SEARCH_DB = os.path.join(SCRAPER_DIR, "search", "index.db")
+
+# 글 목록 수집 동시성 / 초당 요청 수 (서버 부하 예산)
+LISTING_WORKERS = 8
+LISTING_RPS = 5.0
+
+# 글 본문 파이프라인: 스테이지별 워커 수 / 본문 요청 초당 예산
+FETCH_WORKERS = 4
+PARSE_WORKERS = 2
+RENDER_WORKERS = os.cpu_count() or 1
+# PDF 렌더링 워커는 문서 이만큼마다 새 프로세스로 (긴 글로 늘어난 메모리 반환, 0이면 안 바꿈)
+RENDER_MAX_TASKS = 200
+POST_RPS = 2.0
+# 위 초당 요청 수는 시작 값: 응답이 빠르면 MAX_RPS까지 올리고, 느려지거나 429 / 5xx면 MIN_RPS까지 내림
+MIN_RPS = 0.5
+MAX_RPS = 10.0
+
+# 지표 JSON lines(--metrics)에 전체 스냅숏을 쓰는 간격 (초)
+METRICS_INTERVAL = 10.0
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Dhamma.kr 묶음(권) PDF - 시리즈 1개(잡아함, 오늘의 법구 …)를 PDF 파일 1개로
+
+글마다 PDF를 만들면 파일마다 NanumGothic 부분집합이 따로 들어가 용량이 크고, 모아 보기도
+느립니다. 여기서는 제목의 번호 앞부분으로 시리즈를 나누고("잡아함 133. 생사유전경" → 잡아함),
+번호 순으로 글을 이어 붙인 HTML을 WeasyPrint로 한 번에 렌더링합니다.
+
+    - 글 제목(<h1>)이 PDF 책갈피가 되고, 폰트 부분집합은 묶음마다 1개
+    - 글 데이터는 임시 파일(JSONL)에 흘려 쓰고 오프셋만 기억 → 글 수와 무관하게 메모리 일정
+    - 묶음 HTML도 글 1개씩 파일에 이어 씀 (완성된 PDF를 메모리에서 합치지 않음)
+    - 묶음마다 글 내용 해시 + 템플릿 지문을 매니페스트에 남겨, 바뀐 묶음만 다시 렌더링
+
+    python3 -m dhamma render-volumes posts/ volumes/ --series 잡아함
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+
+from .link_index import post_id
+from .manifest import Manifest
+from .records import content_hash, safe_filename
+from .render_engine import RenderEngine, template_fingerprint, write_volume_html
+
+OUTPUT_NAME = 'volume'
+# 제목에 번호가 없는 글
+OTHER = '기타'
+
+# 제목 맨 앞의 "시리즈 이름 + 번호" ("잡아함3. 무지경 1" → 잡아함, 3)
+_SERIES = re.compile(r'\s*(.*?)\W*(\d+)')
+
+
+def series_key(title):
+    """제목 → (시리즈 이름, 번호 또는 None)"""
+    match = _SERIES.match(title)
+    if not match or not match.group(1):
+        return OTHER, None
+    return match.group(1), int(match.group(2))
+
+
+class VolumeBuilder:
+    """글을 시리즈별로 모아 묶음 PDF를 만드는 빌더 (with로 사용)
+
+    add()로 글을 넣고 build()로 렌더링합니다. 같은 글(URL)을 다시 넣으면 마지막 내용을 씁니다.
+    """
+
+    def __init__(self, output_dir, workers=None):
+        self.output_dir = output_dir
+        self.workers = workers
+        os.makedirs(output_dir, exist_ok=True)
+        self.manifest = Manifest(output_dir)
+        self.template = template_fingerprint(volume=True)
+        self.unchanged = 0
+        # 글 데이터 / 묶음 HTML 임시 파일 (tmpfs일 수 있는 /tmp 대신 저장 폴더 아래, RenderEngine과 같은 방식)
+        self._spool_dir = tempfile.mkdtemp(prefix='.render-', dir=output_dir)
+        self._spool = open(os.path.join(self._spool_dir, 'posts.jsonl'), 'w+b')
+        # 시리즈 → {URL: (정렬 키, 임시 파일 오프셋, 내용 해시)}
+        self._members = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._spool.close()
+        shutil.rmtree(self._spool_dir, ignore_errors=True)
+        self.manifest.close()
+
+    def add(self, post_data):
+        """글 1개를 시리즈에 추가"""
+        series, number = series_key(post_data['title'])
+        offset = self._spool.seek(0, os.SEEK_END)
+        self._spool.write(json.dumps(post_data, ensure_ascii=False).encode('utf-8') + b'\n')
+        key = (number is None, number or 0, post_id(post_data['url']) or 0, post_data['url'])
+        self._members.setdefault(series, {})[post_data['url']] = (key, offset, content_hash(post_data))
+
+    def series(self):
+        """시리즈 이름 → 글 수"""
+        return {name: len(members) for name, members in sorted(self._members.items())}
+
+    def path(self, series):
+        return os.path.join(self.output_dir, f"{safe_filename(series).strip() or OTHER}.pdf")
+
+    def digest(self, series):
+        """묶음 내용 해시 (글 순서 + 글별 내용 해시)"""
+        digest = hashlib.blake2b(digest_size=16)
+        for _, _, post_hash in sorted(self._members[series].values()):
+            digest.update(post_hash.encode('ascii'))
+        return digest.hexdigest()
+
+    def posts(self, series):
+        """시리즈의 글 데이터를 번호 순으로 하나씩 (임시 파일에서 읽음)"""
+        for _, offset, _ in sorted(self._members[series].values()):
+            self._spool.seek(offset)
+            yield json.loads(self._spool.readline())
+
+    def write_html(self, series, html_path):
+        """시리즈 묶음 HTML 파일 쓰기"""
+        self._spool.flush()
+        with open(html_path, 'w', encoding='utf-8') as f:
+            write_volume_html(f, series, self.posts(series))
+        return html_path
+
+    def build(self, names=None):
+        """묶음 렌더링 → (시리즈, PDF 경로 또는 None, 글 수, 이번에 렌더링했는지) 순서대로
+
+        names가 있으면 그 시리즈만. 내용 / 템플릿이 그대로인 묶음은 렌더링하지 않습니다.
+        """
+        names = [name for name in self.series() if names is None or name in names]
+        pending = []
+        for name in names:
+            existing = self.manifest.current_path(OUTPUT_NAME, name, self.digest(name), self.template)
+            if existing:
+                self.unchanged += 1
+                yield name, existing, len(self._members[name]), False
+            else:
+                pending.append(name)
+        if not pending:
+            return
+
+        html_paths = {name: os.path.join(self._spool_dir, f"{i}.html") for i, name in enumerate(pending)}
+
+        def jobs():
+            for name in pending:
+                # 렌더링이 끝난 뒤에만 제자리로 (중단돼도 예전 묶음은 그대로)
+                yield name, self.write_html(name, html_paths[name]), self.path(name) + '.part'
+
+        with RenderEngine(self.output_dir, self.workers) as engine:
+            for name, partial in engine.render_volumes(jobs()):
+                os.remove(html_paths[name])
+                filepath = None
+                if partial is None and os.path.exists(self.path(name) + '.part'):
+                    os.remove(self.path(name) + '.part')
+                if partial:
+                    filepath = self.path(name)
+                    os.replace(partial, filepath)
+                    self.manifest.record(OUTPUT_NAME, name, name, filepath, self.digest(name), self.template)
+                yield name, filepath, len(self._members[name]), True
+            engine.print_stats()
@@ -1,6 +1,6 @@
 #!/bin/bash
 
-# Dhamma.kr 크롤러 실행 스크립트
+# Dhamma.kr 크롤러 실행 스크립트 (옵션은 그대로 전달, 예: ./run.sh --new-only)
 
 echo "🚀 Dhamma.kr 크롤러 시작"
 echo ""
@@ -8,5 +8,6 @@ echo ""
 # 라이브러리 경로 설정
 export DYLD_LIBRARY_PATH="/opt/homebrew/lib:$DYLD_LIBRARY_PATH"
 
-# Python 스크립트 실행
-python3 full_scraper.py
+# 스크립트 폴더에서 CLI 실행 (입력 대기 없음)
+cd "$(dirname "$0")"
+python3 -m dhamma fetch --format pdf "$@"
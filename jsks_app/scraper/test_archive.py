@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+원본 HTML 보관소 테스트 - 추가 / URL로 바로 읽기 / 다시 열기 / 중단 후 색인 복구 / 순차 읽기
+(testdata/posts/*.html 사용, dhamma.kr에 접속하지 않음)
+"""
+
+import glob
+import gzip
+import os
+
+import requests
+
+from dhamma import archive as archive_module
+from dhamma.archive import HtmlArchive, parse_http
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+
+def saved_pages():
+    """(글 URL, HTML bytes) 목록"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(TESTDATA_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append((f"http://www.dhamma.kr/wp/?p={os.path.basename(path)[:-5]}", f.read()))
+    return pages
+
+
+def archive_paths(directory):
+    """테스트할 보관소 파일 (zstandard가 있으면 zstd도)"""
+    paths = [os.path.join(directory, 'posts.warc.gz')]
+    if archive_module.zstandard is not None:
+        paths.append(os.path.join(directory, 'posts.warc.zst'))
+    return paths
+
+
+def test_get_by_url(tmp_path):
+    for path in archive_paths(tmp_path):
+        with HtmlArchive(path) as archive:
+            for url, content in saved_pages():
+                archive.append(url, content)
+            for url, content in saved_pages():
+                assert archive.get(url) == content, f"{os.path.basename(path)} {url}"
+            # 같은 글의 다른 URL 형태
+            assert archive.get("https://dhamma.kr/wp/?p=17762&replytocom=5#comments") == archive.get(
+                "http://www.dhamma.kr/wp/?p=17762")
+            assert archive.get("http://www.dhamma.kr/wp/?p=1") is None
+
+
+def test_reopen_uses_index(tmp_path):
+    for path in archive_paths(tmp_path):
+        with HtmlArchive(path) as archive:
+            for url, content in saved_pages():
+                archive.append(url, content)
+
+        with HtmlArchive(path) as archive:
+            assert len(archive) == len(saved_pages())
+            assert not archive._pending, "다시 열 때 색인에 있는 레코드는 복구하지 않음"
+            for url, content in saved_pages():
+                assert archive.get(url) == content
+
+
+def test_latest_record_wins(tmp_path):
+    path = archive_paths(tmp_path)[0]
+    with HtmlArchive(path) as archive:
+        archive.append("http://www.dhamma.kr/wp/?p=5", b"<p>v1</p>")
+        archive.append("http://www.dhamma.kr/wp/?p=6", b"<p>other</p>")
+    with HtmlArchive(path) as archive:
+        archive.append("http://www.dhamma.kr/wp/?p=5", b"<p>v2</p>")
+        assert archive.get("http://www.dhamma.kr/wp/?p=5") == b"<p>v2</p>"
+    with HtmlArchive(path) as archive:
+        assert archive.get("http://www.dhamma.kr/wp/?p=5") == b"<p>v2</p>"
+        assert len(archive) == 2
+        assert [content for _, content in archive.iter_records()] == [b"<p>other</p>", b"<p>v2</p>"]
+        assert len(list(archive.iter_records(latest_only=False))) == 3
+
+
+def test_recover_after_interrupted_run(tmp_path):
+    for path in archive_paths(tmp_path):
+        pages = saved_pages()
+        with HtmlArchive(path) as archive:
+            archive.append(*pages[0])
+
+        # close() 없이 종료 + 쓰다 만 레코드
+        archive = HtmlArchive(path)
+        for url, content in pages[1:]:
+            archive.append(url, content)
+        archive._file.close()
+        with open(path, 'ab') as f:
+            f.write(archive._compress(b"WARC/1.1\r\n" * 100)[:20])
+        size = os.path.getsize(path)
+
+        with HtmlArchive(path) as archive:
+            assert os.path.getsize(path) < size, "잘린 레코드 삭제"
+            assert len(archive) == len(pages)
+            for url, content in pages:
+                assert archive.get(url) == content
+            archive.append("http://www.dhamma.kr/wp/?p=1", b"<p>after</p>")
+
+        with HtmlArchive(path) as archive:
+            assert archive.get("http://www.dhamma.kr/wp/?p=1") == b"<p>after</p>"
+
+
+def test_gzip_file_is_plain_warc(tmp_path):
+    path = archive_paths(tmp_path)[0]
+    with HtmlArchive(path) as archive:
+        for url, content in saved_pages():
+            archive.append(url, content)
+
+    # 레코드마다 gzip 멤버 → 파일 전체를 gzip으로 풀면 WARC 레코드가 이어짐
+    with gzip.open(path) as f:
+        data = f.read()
+    assert data.count(b"WARC/1.1\r\nWARC-Type: resource\r\n") == len(saved_pages()), "응답이 없으면 본문만"
+    assert b"WARC-Target-URI: http://www.dhamma.kr/wp/?p=17762\r\n" in data
+
+
+def test_response_keeps_real_status_and_headers(tmp_path):
+    url, content = saved_pages()[0]
+    response = requests.Response()
+    response.status_code = 203
+    response.reason = 'Non-Authoritative Information'
+    response.headers['Content-Type'] = 'text/html; charset=UTF-8'
+    response.headers['ETag'] = '"abc"'
+    # requests가 압축을 푼 본문을 저장하므로 원래 전송 헤더는 빠지고 길이는 다시 씀
+    response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Content-Length'] = '12'
+
+    path = archive_paths(tmp_path)[0]
+    with HtmlArchive(path) as archive:
+        archive.append(url, content, response)
+        assert archive.get(url) == content
+
+    with gzip.open(path) as f:
+        data = f.read()
+    assert data.startswith(b"WARC/1.1\r\nWARC-Type: response\r\n")
+    assert b"\r\n\r\nHTTP/1.1 203 Non-Authoritative Information\r\n" in data
+    record_url, status, headers, body = parse_http(data)
+    assert (record_url, status, body) == (url, 203, content)
+    assert headers == {'Content-Type': 'text/html; charset=UTF-8', 'ETag': '"abc"',
+                       'Content-Length': str(len(content))}
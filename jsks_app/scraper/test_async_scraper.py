@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+비동기 크롤러 테스트 - 목록 → 본문 → TXT / fpdf PDF 저장을 스레드 없이 (로컬 가짜 서버만 사용)
+"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import os
+import threading
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from dhamma.async_scraper import AsyncScraper, scrape_to_outputs
+from dhamma.outputs import FpdfOutput, TextOutput
+from test_listing_crawler import ListingHandler, start_server
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+POST_IDS = ('16941', '16954', '17762')
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """목록 1페이지 = testdata 글 3개, ?p=ID = testdata HTML, 나머지는 404"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/wp/':
+            posts = ''.join(f'<div class="post"><a class="title" href="{self.base}?p={post_id}">t</a></div>'
+                            for post_id in POST_IDS)
+            return self.reply(200, f'<html><body>{posts}</body></html>'.encode())
+        post_id = self.path.rpartition('?p=')[2]
+        if post_id in POST_IDS:
+            with open(os.path.join(TESTDATA_DIR, f'{post_id}.html'), 'rb') as f:
+                return self.reply(200, f.read())
+        self.reply(404, b'not found')
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self.server.server_port}/wp/"
+
+    def reply(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class NoThreads(ThreadPoolExecutor):
+    """기본 스레드 풀을 쓰면 실패 (run_in_executor(None, ...) 감지)"""
+
+    def submit(self, *args, **kwargs):
+        raise AssertionError("비동기 경로가 스레드 풀을 사용함")
+
+
+async def scrape(base, outputs, posts_dir):
+    asyncio.get_running_loop().set_default_executor(NoThreads())
+    return await scrape_to_outputs(None, outputs, posts_dir, concurrency=4, rps=0, base_url=base)
+
+
+def test_scrape_to_outputs_without_threads(tmp_path):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}/wp/"
+    (tmp_path / 'posts').mkdir()
+    try:
+        with TextOutput(str(tmp_path / 'texts')) as text, FpdfOutput(str(tmp_path / 'pdfs')) as pdf:
+            assert asyncio.run(scrape(base, [text, pdf], str(tmp_path / 'posts'))) == 3
+        assert len([n for n in os.listdir(tmp_path / 'pdfs') if n.endswith('.pdf')]) == 3
+        assert len([n for n in os.listdir(tmp_path / 'texts') if n.endswith('.txt')]) == 3
+
+        # PDF 렌더링이 끝날 때 매니페스트에 기록됨 → 다시 실행하면 렌더링하지 않음
+        with FpdfOutput(str(tmp_path / 'pdfs')) as pdf:
+            assert asyncio.run(scrape(base, [pdf], str(tmp_path / 'posts'))) == 3
+            assert pdf.unchanged == 3 and not pdf.engine.latencies
+    finally:
+        server.shutdown()
+
+
+class SlowOutput:
+    """저장에 delay초 걸리는 출력 형식 - 동시에 진행 중인 저장 수의 최댓값(peak) 기록"""
+
+    label = '느린 출력'
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def submit(self, post_data):
+        future = Future()
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+        def finish():
+            with self._lock:
+                self.running -= 1
+            future.set_result(True)
+
+        threading.Timer(self.delay, finish).start()
+        return future
+
+
+def test_scrape_to_outputs_caps_pending_writes(tmp_path):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}/wp/"
+    slow = SlowOutput()
+    try:
+        saved = asyncio.run(scrape_to_outputs(None, [slow], str(tmp_path), concurrency=4, rps=0,
+                                              base_url=base, max_writes=1))
+        assert saved == 3
+        assert slow.peak == 1, "저장은 max_writes개까지만 동시에"
+    finally:
+        server.shutdown()
+
+
+def test_listing_server_error_is_not_the_end():
+    async def crawl(base):
+        async with AsyncScraper(concurrency=4, rps=0, retries=0) as scraper:
+            return await scraper.get_all_post_links(base)
+
+    server, base = start_server()
+    ListingHandler.FAIL = 3
+    try:
+        assert len(asyncio.run(crawl(base))) == 36 * 3, "500인 페이지만 빠지고 뒤쪽 페이지는 그대로"
+    finally:
+        ListingHandler.FAIL = None
+        server.shutdown()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+JSONL 글 묶음 테스트 - 한 줄에 글 1개 / 안정적인 id / 중복 정리 / 순차 읽기 / Parquet 변환
+(testdata/posts/*.json 기준 결과 사용, dhamma.kr에 접속하지 않음)
+"""
+
+import glob
+import json
+import os
+
+from dhamma import corpus as corpus_module
+from dhamma.corpus import FIELDS, iter_corpus, jsonl_to_parquet
+from dhamma.outputs import JsonlOutput
+from dhamma.records import post_record_path, stable_id
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+
+def saved_posts():
+    """?p= 번호가 있는 글 데이터 목록 (번호 역순 - 정렬 확인용)"""
+    posts = []
+    for path in sorted(glob.glob(os.path.join(TESTDATA_DIR, '*.json')), reverse=True):
+        with open(path, encoding='utf-8') as f:
+            post_data = json.load(f)
+        if os.path.basename(path)[:-5].isdigit():
+            post_data['url'] = f"http://www.dhamma.kr/wp/?p={os.path.basename(path)[:-5]}"
+            posts.append(post_data)
+    return posts
+
+
+def write_corpus(directory, posts):
+    with JsonlOutput(directory) as output:
+        for post_data in posts:
+            assert output.write(post_data) == output.corpus_path
+    return output.corpus_path
+
+
+def test_one_line_per_post(tmp_path):
+    posts = saved_posts()
+    path = write_corpus(tmp_path, posts)
+
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert len(lines) == len(posts)
+    rows = [json.loads(line) for line in lines]
+    assert [row['id'] for row in rows] == sorted((row['id'] for row in rows), key=int), "?p= 번호 순으로 정렬"
+    assert all(list(row) == list(FIELDS) for row in rows)
+
+    by_id = {row['id']: row for row in iter_corpus(path)}
+    for post_data in posts:
+        row = by_id[post_data['url'].rsplit('=', 1)[1]]
+        assert {field: row[field] for field in FIELDS[1:]} == post_data
+
+
+def test_rewrite_keeps_latest_line(tmp_path):
+    posts = saved_posts()
+    write_corpus(tmp_path, posts)
+
+    changed = dict(posts[0], title="바뀐 제목")
+    extra = {'url': "http://www.dhamma.kr/wp/?p=1", 'title': "새 글", 'date': "", 'content': "본문",
+             'content_html': "<p>본문</p>"}
+    path = write_corpus(tmp_path, [changed, extra])
+
+    rows = list(iter_corpus(path))
+    assert len(rows) == len(posts) + 1
+    assert rows[0]['id'] == '1'
+    assert [row['title'] for row in rows if row['url'] == changed['url']] == ["바뀐 제목"]
+
+
+def test_post_without_number_goes_last(tmp_path):
+    posts = saved_posts()
+    odd = {'url': "http://www.dhamma.kr/wp/about", 'title': "소개", 'date': "", 'content': "",
+           'content_html': ""}
+    path = write_corpus(tmp_path, [odd] + posts + [dict(odd, title="소개 2")])
+
+    rows = list(iter_corpus(path))
+    assert len(rows) == len(posts) + 1
+    assert rows[-1]['id'] == stable_id(odd['url']) and rows[-1]['title'] == "소개 2"
+    # 글 데이터 파일명과 같은 ID (번호 없는 글도 None이 아님)
+    assert os.path.basename(post_record_path(odd, str(tmp_path))) == f"{rows[-1]['id']}.json"
+
+
+def test_parquet_matches_jsonl(tmp_path):
+    if corpus_module.pyarrow is None:
+        return
+    path = write_corpus(tmp_path, saved_posts())
+    parquet_path = os.path.join(tmp_path, 'dhamma.parquet')
+
+    assert jsonl_to_parquet(path, parquet_path, batch_size=2) == len(saved_posts())
+    table = corpus_module.pyarrow.parquet.read_table(parquet_path)
+    assert table.to_pylist() == list(iter_corpus(path))
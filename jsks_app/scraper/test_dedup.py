@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+중복 글 찾기 테스트 - MinHash 유사도 / LSH 후보 / 다시 열기 / 파이프라인 link·skip
+(testdata/posts/17762.json 본문 사용, dhamma.kr에 접속하지 않음)
+"""
+
+import json
+import os
+
+from dhamma.dedup import LINK, SKIP, DuplicateIndex, minhash, similarity
+from dhamma.outputs import Output
+from dhamma.pipeline import run_post_pipeline
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+
+def sutta():
+    with open(os.path.join(TESTDATA_DIR, '17762.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def repost(post_data, number, title):
+    """같은 본문을 문장부호 / 줄바꿈만 바꿔 다시 올린 글"""
+    content = post_data['content'].replace('.', '. ').replace('\n\n', '\n').replace('“', '"')
+    return dict(post_data, url=f"http://www.dhamma.kr/wp/?p={number}", title=title, content=content)
+
+
+def other_post(number):
+    content = " ".join(f"다른 경전 {number}의 {i}번째 문장은 서로 다른 내용을 담고 있다." for i in range(30))
+    return {'url': f"http://www.dhamma.kr/wp/?p={number}", 'title': f"다른 글 {number}", 'date': '',
+            'content': content, 'content_html': ''}
+
+
+def test_similarity_estimates():
+    original = sutta()
+    a = minhash(original['content'])
+    assert similarity(a, minhash(repost(original, 1, "x")['content'])) >= 0.8
+    half = original['content'][:len(original['content']) // 2]
+    assert 0.3 < similarity(a, minhash(half)) < 0.8
+    assert similarity(a, minhash(other_post(2)['content'])) < 0.2
+    assert minhash("짧은 글") is None
+
+
+def test_reposts_cluster():
+    original = sutta()
+    with DuplicateIndex(':memory:') as index:
+        assert index.check(original) is None
+        assert index.check(other_post(1)) is None
+        assert index.check(repost(original, 2, "잡아함 133. 생사유전경 2")) == {
+            'url': original['url'], 'title': original['title']}
+        # 중복의 중복도 처음 글로
+        assert index.check(repost(repost(original, 3, "?"), 3, "생사유전경 다시"))['url'] == original['url']
+        assert index.check(other_post(4)) is None
+        assert index.clusters() == {original['url']: [original['url'], repost(original, 2, '')['url'],
+                                                      repost(original, 3, '')['url']]}
+        assert index.duplicates == 2
+
+
+def test_persisted_signatures(tmp_path):
+    path = os.path.join(tmp_path, 'dedup.db')
+    original = sutta()
+    with DuplicateIndex(path) as index:
+        index.check(original)
+        index.check(repost(original, 2, "재게시"))
+
+    with DuplicateIndex(path) as index:
+        assert len(index) == 2
+        assert index.check(original) is None, "대표 글은 다시 확인해도 대표"
+        assert index.check(repost(original, 2, "재게시"))['url'] == original['url']
+        assert index.check(repost(original, 3, "또 재게시"))['url'] == original['url']
+        # 내용이 바뀐 글은 다시 비교
+        assert index.check(dict(other_post(5), url=repost(original, 2, '')['url'])) is None
+
+
+def test_changed_canonical_regroups_duplicates(tmp_path):
+    path = os.path.join(tmp_path, 'dedup.db')
+    original = sutta()
+    first, second = repost(original, 2, "재게시 1"), repost(original, 3, "재게시 2")
+    with DuplicateIndex(path) as index:
+        index.check(original)
+        index.check(first)
+        index.check(second)
+        # 대표 글이 전혀 다른 내용으로 바뀜 → 남은 글 중 먼저 들어온 글이 새 대표
+        index.check(dict(other_post(5), url=original['url']))
+        assert index.clusters() == {first['url']: [first['url'], second['url']]}
+
+    with DuplicateIndex(path) as index:
+        assert index.check(first) is None, "새 대표는 다시 열어도 대표"
+        assert index.check(second)['url'] == first['url']
+
+
+class FileOutput(Output):
+    """글마다 파일 1개 (PDF처럼 중복 글은 링크)"""
+
+    name = 'file'
+    extension = '.txt'
+    link_duplicates = True
+
+    def __init__(self, output_dir, workers=1):
+        super().__init__(output_dir, workers)
+        self.written = []
+
+    def save(self, post_data, filepath):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(post_data['content'])
+        self.written.append(post_data['title'])
+        return filepath
+
+
+def run_with_duplicates(directory, mode):
+    original = sutta()
+    posts = {p['url']: p for p in [original, other_post(1), repost(original, 2, "재게시 1"),
+                                   repost(original, 3, "재게시 2")]}
+    posts_dir = os.path.join(directory, 'posts')
+    os.makedirs(posts_dir)
+    output = FileOutput(os.path.join(directory, 'texts'))
+    done = run_post_pipeline(
+        list(posts), lambda url: (url, b'html'), lambda url, html: posts[url], [output],
+        posts_dir, fetch_workers=1, parse_workers=1,
+        duplicates=DuplicateIndex(':memory:'), duplicate_mode=mode,
+    )
+    return output, done, original
+
+
+def test_pipeline_links_duplicates(tmp_path):
+    output, done, original = run_with_duplicates(tmp_path, LINK)
+    assert done == 4
+    assert sorted(output.written) == sorted([original['title'], "다른 글 1"]), "중복 글은 렌더링하지 않음"
+    canonical = os.stat(output.path(original))
+    for number, title in ((2, "재게시 1"), (3, "재게시 2")):
+        linked = os.stat(output.path(repost(original, number, title)))
+        assert (linked.st_ino, linked.st_dev) == (canonical.st_ino, canonical.st_dev)
+
+
+def test_pipeline_skips_duplicates(tmp_path):
+    output, done, original = run_with_duplicates(tmp_path, SKIP)
+    assert done == 2
+    assert sorted(os.listdir(output.output_dir)) == sorted([os.path.basename(output.path(original)),
+                                                          "다른 글 1 (1).txt"])
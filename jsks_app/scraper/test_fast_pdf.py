@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+빠른 PDF(fpdf2) 테스트 - 글마다 새 문서 / 렌더링 엔진 fpdf 백엔드 / pdf ↔ fpdf 형식 바꾸기
+(testdata/posts/17762.json 사용, WeasyPrint 없이 실행)
+"""
+
+import json
+import os
+
+from dhamma.fast_pdf import DhammaPDF, FastPdfRenderer
+from dhamma.manifest import TEMPLATE
+from dhamma.outputs import FpdfOutput, PdfOutput, plan_changes
+from dhamma.render_engine import RenderEngine
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+
+def sutta():
+    with open(os.path.join(TESTDATA_DIR, '17762.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_renderer_renders_posts_in_a_row(tmp_path):
+    # 글마다 새 문서 + add_font: 앞 글이 잘라낸 폰트 부분집합을 다음 글이 쓰지 않음
+    renderer = FastPdfRenderer()
+    first = renderer.render(sutta(), os.path.join(tmp_path, 'first.pdf'))
+    other = dict(sutta(), title="다른 글", content="오늘의 법구: 마음이 모든 것에 앞선다. 0123456789")
+    second = renderer.render(other, os.path.join(tmp_path, 'second.pdf'))
+    for filepath in (first, second):
+        with open(filepath, 'rb') as f:
+            assert f.read(5) == b'%PDF-'
+
+
+def test_fast_backend_renders_post(tmp_path):
+    post_data = sutta()
+    directory = str(tmp_path)
+    with RenderEngine(directory, workers=1, max_tasks=1, backend='fpdf') as engine:
+        spool_dir = engine._spool_dir
+        filepath = engine.render(post_data)
+        assert filepath == engine.path(post_data)
+        assert os.listdir(spool_dir) == []
+    with open(filepath, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+
+    pdf = DhammaPDF()
+    pdf.write_post(post_data)
+    assert pdf.page_no() >= 1
+
+
+def test_switching_backend_rerenders(tmp_path):
+    post_data = sutta()
+    directory = str(tmp_path)
+    with FpdfOutput(directory) as output:
+        filepath = output.write(post_data)
+    assert filepath and os.path.exists(filepath)
+    assert sum(plan_changes(FpdfOutput, directory, [post_data])[0].values()) == 0
+    # 같은 파일을 WeasyPrint로 만들려면 지문이 달라 다시 렌더링
+    assert plan_changes(PdfOutput, directory, [post_data])[0] == {TEMPLATE: 1}
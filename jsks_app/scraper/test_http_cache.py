@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+HTTP 캐시 테스트 - 로컬 가짜 서버로 ETag / Last-Modified 조건부 GET, LRU 삭제 확인
+(dhamma.kr에 접속하지 않음)
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import os
+import threading
+
+from dhamma.http_cache import HttpCache
+from dhamma.http_client import CacheMiss, FetchClient, NotModified
+from dhamma.rate_control import AdaptiveRateLimiter
+
+LAST_MODIFIED = 'Mon, 19 May 2025 00:00:00 GMT'
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    """/etag/*은 ETag, /date/*는 Last-Modified, /plain/*은 검증 헤더 없음"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+        body = f'글 {self.path} '.encode() * 50
+
+        if self.path.startswith('/etag/'):
+            etag = f'"{self.path}-v{server.version}"'
+            if self.headers.get('If-None-Match') == etag:
+                return self.reply(304, b'', {'ETag': etag})
+            return self.reply(200, body, {'ETag': etag})
+        if self.path.startswith('/date/'):
+            if self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+                return self.reply(304, b'')
+            return self.reply(200, body, {'Last-Modified': LAST_MODIFIED})
+        self.reply(200, body)
+
+    def reply(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ConditionalHandler)
+    server.hits = {}
+    server.version = 1
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def new_cache(directory):
+    return HttpCache(os.path.join(directory, 'http_cache.db'))
+
+
+def expect_not_modified(client, url):
+    try:
+        client.get_content(url)
+    except NotModified as e:
+        return e.content
+    raise AssertionError(f"304가 와야 합니다: {url}")
+
+
+def test_etag_round_trip(tmp_path):
+    server, base = start_server()
+    client = FetchClient(cache=new_cache(tmp_path))
+    first = client.get_content(f"{base}/etag/1")
+    assert expect_not_modified(client, f"{base}/etag/1") == first
+    assert client.cache.hits == 1 and client.cache.misses == 1
+
+    # 서버 내용이 바뀌면 다시 200
+    server.version = 2
+    assert client.get_content(f"{base}/etag/1") == first
+    assert client.cache.misses == 2
+    server.shutdown()
+
+
+def test_last_modified_round_trip(tmp_path):
+    server, base = start_server()
+    client = FetchClient(cache=new_cache(tmp_path))
+    first = client.get_content(f"{base}/date/1")
+    assert expect_not_modified(client, f"{base}/date/1") == first
+    assert client.cache.hit_ratio() == 0.5
+    server.shutdown()
+
+
+def test_without_validators_not_cached(tmp_path):
+    server, base = start_server()
+    client = FetchClient(cache=new_cache(tmp_path))
+    client.get_content(f"{base}/plain/1")
+    client.get_content(f"{base}/plain/1")
+    assert client.cache.hits == 0 and len(client.cache) == 0
+    server.shutdown()
+
+
+def test_cache_survives_restart(tmp_path):
+    server, base = start_server()
+    cache = new_cache(tmp_path)
+    FetchClient(cache=cache).get_content(f"{base}/etag/1")
+    cache.close()
+
+    reopened = HttpCache(cache.db_path)
+    assert reopened.total_bytes == cache.total_bytes
+    expect_not_modified(FetchClient(cache=reopened), f"{base}/etag/1")
+    server.shutdown()
+
+
+def test_lru_eviction(tmp_path):
+    server, base = start_server()
+    cache = new_cache(tmp_path)
+    client = FetchClient(cache=cache)
+    client.get_content(f"{base}/etag/1")
+    one_entry = cache.total_bytes
+
+    # 항목 3개 크기 제한: 1을 다시 사용했으므로 4를 넣을 때 2가 삭제되어야 함
+    cache.max_bytes = one_entry * 3
+    client.get_content(f"{base}/etag/2")
+    client.get_content(f"{base}/etag/3")
+    expect_not_modified(client, f"{base}/etag/1")
+    client.get_content(f"{base}/etag/4")
+
+    assert len(cache) == 3 and cache.evicted == 1
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.conditional_headers(f"{base}/etag/2") == {}
+    expect_not_modified(client, f"{base}/etag/1")
+    server.shutdown()
+
+
+class EvictedBeforeReply(HttpCache):
+    """조건부 요청을 보낸 뒤 304가 오기 전에 항목이 LRU로 지워진 캐시"""
+
+    def not_modified(self, url):
+        with self._lock:
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self.conn.commit()
+        return super().not_modified(url)
+
+
+def test_evicted_entry_is_refetched_through_limiter(tmp_path):
+    server, base = start_server()
+    url = f"{base}/etag/1"
+    client = FetchClient(cache=EvictedBeforeReply(os.path.join(tmp_path, 'http_cache.db')))
+    first = client.get_content(url)
+
+    # 클라이언트는 혼자 다시 요청하지 않음 (속도 조절을 거치지 않는 요청 없음)
+    try:
+        client.get_content(url)
+        assert False, "304인데 캐시 항목이 없으면 CacheMiss"
+    except CacheMiss:
+        pass
+    assert server.hits['/etag/1'] == 2
+
+    # 항목을 다시 저장한 뒤 조절기로: 304 → CacheMiss → 슬롯을 기다려 조건 없는 GET으로 본문
+    assert client.get_content(url) == first
+    limiter = AdaptiveRateLimiter(0, retries=0)
+    try:
+        assert limiter.call(client.get_content, url) == first
+        assert limiter.requests == 2, "304와 다시 보낸 요청 모두 조절기를 거침"
+        assert server.hits['/etag/1'] == 5
+    finally:
+        server.shutdown()
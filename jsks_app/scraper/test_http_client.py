@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+공용 HTTP 클라이언트 테스트 - 로컬 가짜 서버로 재시도 / Retry-After / keep-alive 확인
+(dhamma.kr에 접속하지 않음)
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import threading
+import time
+
+from dhamma.http_client import FetchClient
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """경로별로 정해진 횟수만큼 실패한 뒤 200을 돌려주는 가짜 서버"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.client_ports.add(self.client_address[1])
+            hit = server.hits[self.path]
+
+        if self.path == '/flaky' and hit <= 2:
+            return self.reply(503, b'busy')
+        if self.path == '/retry-after' and hit == 1:
+            return self.reply(429, b'slow down', {'Retry-After': '1'})
+        if self.path == '/slow' and hit == 1:
+            time.sleep(0.5)
+        if self.path == '/broken':
+            return self.reply(500, b'broken')
+        self.reply(200, f'ok {self.path}'.encode())
+
+    def reply(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 타임아웃으로 먼저 끊은 경우
+            pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    server.hits = {}
+    server.client_ports = set()
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_retries_5xx_then_succeeds():
+    server, base = start_server()
+    client = FetchClient(backoff=0.01)
+    response = client.get(f"{base}/flaky")
+    assert response.status_code == 200
+    assert server.hits['/flaky'] == 3
+    server.shutdown()
+
+
+def test_honours_retry_after():
+    server, base = start_server()
+    client = FetchClient(backoff=0.01)
+    started = time.monotonic()
+    response = client.get(f"{base}/retry-after")
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.9
+    server.shutdown()
+
+
+def test_retries_read_timeout():
+    server, base = start_server()
+    client = FetchClient(backoff=0.01, timeout=0.2)
+    assert client.get(f"{base}/slow").status_code == 200
+    assert server.hits['/slow'] == 2
+    server.shutdown()
+
+
+def test_gives_up_and_raises():
+    server, base = start_server()
+    client = FetchClient(retries=2, backoff=0.01)
+    try:
+        client.get_content(f"{base}/broken")
+    except Exception:
+        pass
+    else:
+        raise AssertionError("500 응답에서 예외가 발생해야 합니다")
+    assert server.hits['/broken'] == 3
+    server.shutdown()
+
+
+def test_reuses_connections():
+    server, base = start_server()
+    client = FetchClient(pool_size=2)
+    for i in range(20):
+        assert client.get(f"{base}/page{i}").status_code == 200
+    # 순차 요청 20개가 연결 1개로 처리되어야 함
+    assert len(server.client_ports) == 1
+    server.shutdown()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+글 링크 색인 테스트 - 같은 글의 여러 URL 형태는 키 하나로, 다른 글(?p= 번호)은 다른 키로
+"""
+
+from dhamma.link_index import LinkIndex, normalize_url, post_id
+
+# 같은 글로 봐야 하는 URL 묶음 (묶음마다 키 1개)
+SAME_POST = (
+    (
+        'http://www.dhamma.kr/wp/?p=17762',
+        'https://www.dhamma.kr/wp/?p=17762',
+        'https://dhamma.kr/wp/?p=17762',
+        'http://DHAMMA.KR/wp/?p=17762',
+        'http://www.dhamma.kr/wp?p=17762',
+        'http://www.dhamma.kr/wp/?p=17762#comments',
+        'http://www.dhamma.kr/wp/?p=17762&replytocom=5#comment-5',
+        'http://www.dhamma.kr/wp/?utm_source=feed&p=17762',
+        'http://www.dhamma.kr/wp/?p=017762',
+        '  http://www.dhamma.kr/wp/?p=17762\n',
+    ),
+    (
+        'http://www.dhamma.kr/wp/about/',
+        'https://dhamma.kr/wp/about',
+        'http://www.dhamma.kr/wp/about/#top',
+    ),
+    (
+        'http://www.dhamma.kr/wp/?cat=3&paged=2',
+        'https://dhamma.kr/wp/?paged=2&cat=3',
+    ),
+)
+
+# 서로 다른 글로 남아야 하는 URL
+DISTINCT = (
+    'http://www.dhamma.kr/wp/?p=17762',
+    'http://www.dhamma.kr/wp/?p=1776',
+    'http://www.dhamma.kr/wp/?p=17763',
+    'http://www.dhamma.kr/wp/?p=177620',
+    'http://www.dhamma.kr/wp/?pp=17762',
+    'http://www.dhamma.kr/wp/?cat=3&paged=2',
+    'http://www.dhamma.kr/wp/?cat=3&paged=3',
+    'http://www.dhamma.kr/wp/about',
+)
+
+
+def test_variants_collapse_to_one_key():
+    for group in SAME_POST:
+        keys = {normalize_url(url) for url in group}
+        assert len(keys) == 1, f"{group[0]} → {sorted(keys)}"
+
+
+def test_distinct_posts_keep_distinct_keys():
+    keys = [normalize_url(url) for url in DISTINCT]
+    assert len(set(keys)) == len(DISTINCT), keys
+
+
+def test_post_id():
+    for url, expected in (
+        ('http://www.dhamma.kr/wp/?p=17762', 17762),
+        ('http://www.dhamma.kr/wp/?replytocom=5&p=17762#comments', 17762),
+        ('http://www.dhamma.kr/wp/?pp=17762', None),
+        ('http://www.dhamma.kr/wp/about/', None),
+    ):
+        assert post_id(url) == expected, url
+
+
+def test_index_keeps_first_url_in_order():
+    index = LinkIndex()
+    for group in SAME_POST:
+        assert index.add(group[0])
+        for url in group[1:]:
+            assert not index.add(url), url
+            assert url in index
+
+    assert index.urls() == [group[0] for group in SAME_POST], "처음 발견한 원래 URL, 발견 순서대로"
+    assert len(LinkIndex(DISTINCT)) == len(DISTINCT)
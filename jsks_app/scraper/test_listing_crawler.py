@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+글 목록 수집기 테스트 - 마지막 목록 페이지 찾기 (지수 탐색 + 이진 탐색) / 찾은 범위로 전체 수집
+(로컬 가짜 서버만 사용, dhamma.kr에 접속하지 않음)
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import math
+import os
+import threading
+from urllib.parse import parse_qs, urlparse
+
+from dhamma.crawl_state import CrawlState
+from dhamma.http_client import FetchClient
+from dhamma.listing_crawler import (discover_last_page, find_last_page, get_all_post_links, get_new_post_links,
+                                    last_page_search)
+from dhamma.rate_control import AdaptiveRateLimiter
+
+
+def run_search(last_page, hint):
+    """last_page_search를 가짜 사이트(1 ~ last_page에 글 있음)로 진행 → (찾은 값, 확인한 페이지들)"""
+    search = last_page_search(hint)
+    probed = []
+    try:
+        page = next(search)
+        while True:
+            probed.append(page)
+            page = search.send(1 <= page <= last_page)
+    except StopIteration as done:
+        return done.value, probed
+
+
+def test_search_finds_last_page():
+    for last_page in (0, 1, 2, 3, 7, 8, 9, 100, 3368, 3401, 5000):
+        for hint in (None, 1, 2, 50, 3368, 10000):
+            found, _ = run_search(last_page, hint)
+            assert found == last_page, f"마지막 {last_page}, 예상 {hint} → {found}"
+
+
+def test_search_uses_log_requests():
+    for last_page in (1, 100, 3368, 50000):
+        _, probed = run_search(last_page, None)
+        assert len(probed) <= 2 * math.log2(last_page) + 3, f"{last_page}페이지에 {len(probed)}회"
+        assert len(set(probed)) == len(probed), "같은 페이지를 두 번 확인하지 않음"
+
+    # 지난 실행 값 근처면 몇 번이면 됨 (새 글로 5페이지 늘어남 / 그대로)
+    assert len(run_search(3373, 3368)[1]) <= 8
+    assert len(run_search(3368, 3368)[1]) == 2
+    # 예상이 너무 크면 1 ~ 예상 사이 이진 탐색
+    assert len(run_search(3000, 3368)[1]) <= math.log2(3368) + 2
+
+
+class ListingHandler(BaseHTTPRequestHandler):
+    """?paged=1 ~ LAST는 글 3개씩, 그 뒤는 404 (?paged=FAIL만 500, NEWEST는 1페이지 맨 앞 새 글)"""
+
+    LAST = 37
+    FAIL = None
+    NEWEST = None
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        page = int(parse_qs(urlparse(self.path).query).get('paged', ['1'])[0])
+        self.requests.append(page)
+        if page == self.FAIL:
+            return self.reply(500, b'broken')
+        if page > self.LAST:
+            return self.reply(404, b'<html><body>Not Found</body></html>')
+        hrefs = [f"/wp/?p={page * 10 + i}" for i in range(3)]
+        if page == 1 and self.NEWEST:
+            hrefs.insert(0, self.NEWEST)
+        posts = ''.join(f'<div class="post"><a class="title" href="{href}">{i}</a></div>'
+                        for i, href in enumerate(hrefs))
+        self.reply(200, f'<html><body>{posts}</body></html>'.encode())
+
+    def reply(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server():
+    ListingHandler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ListingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/wp/"
+
+
+def test_find_last_page_against_server():
+    server, base = start_server()
+    client = FetchClient(retries=0)
+    try:
+        assert find_last_page(base, 3368, client, AdaptiveRateLimiter(0)) == 37
+        assert len(ListingHandler.requests) <= 2 * math.log2(3368) + 2
+
+        ListingHandler.FAIL = 26
+        try:
+            find_last_page(base, 3368, client, AdaptiveRateLimiter(0))
+            assert False, "500을 빈 페이지로 보면 안 됨"
+        except RuntimeError:
+            pass
+    finally:
+        ListingHandler.FAIL = None
+        server.shutdown()
+
+
+def test_full_crawl_requests_only_discovered_range():
+    server, base = start_server()
+    try:
+        links = get_all_post_links(base, workers=4, client=FetchClient(retries=0), limiter=AdaptiveRateLimiter(0))
+        assert len(links) == 37 * 3
+        crawl = ListingHandler.requests[-37:]
+        assert sorted(crawl) == list(range(1, 38)), "1 ~ 마지막 페이지만, 빈 페이지 요청 없이"
+    finally:
+        server.shutdown()
+
+
+def test_resume_reuses_found_last_page(tmp_path):
+    server, base = start_server()
+    state = CrawlState(os.path.join(tmp_path, 'state.db'))
+    client = FetchClient(retries=0)
+    try:
+        assert discover_last_page(base, state, client, AdaptiveRateLimiter(0)) == 37
+        # 1페이지만 받고 중단된 실행
+        state.save_page(1, [f"/wp/?p={10 + i}" for i in range(3)])
+
+        ListingHandler.requests = []
+        links = get_all_post_links(base, workers=4, state=state, client=client, limiter=AdaptiveRateLimiter(0))
+        assert len(links) == 37 * 3
+        assert sorted(ListingHandler.requests) == list(range(2, 38)), "마지막 페이지 탐색 없이 남은 페이지만"
+
+        assert state.page_links() == {}, "목록을 다 받으면 저장한 페이지를 비움"
+
+        # 수집이 끝난 뒤에는 새 글로 늘었는지 다시 확인 (지난 값 근처 탐색) + 목록을 처음부터
+        ListingHandler.NEWEST = "/wp/?p=9999"
+        ListingHandler.requests = []
+        links = get_all_post_links(base, workers=4, state=state, client=client, limiter=AdaptiveRateLimiter(0))
+        assert links[0].endswith("?p=9999"), "1페이지에 새로 올라온 글"
+        assert len(links) == 37 * 3 + 1
+        assert ListingHandler.requests[:2] == [37, 38]
+        assert sorted(ListingHandler.requests[2:]) == list(range(1, 38))
+    finally:
+        ListingHandler.NEWEST = None
+        state.close()
+        server.shutdown()
+
+
+def test_server_error_is_not_the_end(tmp_path):
+    server, base = start_server()
+    state = CrawlState(os.path.join(tmp_path, 'state.db'))
+    ListingHandler.FAIL = 3
+    try:
+        links = get_all_post_links(base, workers=4, state=state, client=FetchClient(retries=0),
+                                   limiter=AdaptiveRateLimiter(0))
+        assert len(links) == 36 * 3, "500인 페이지만 빠지고 뒤쪽 페이지는 그대로"
+        assert sorted(state.page_links()) == [page for page in range(1, 38) if page != 3]
+
+        # 다음 실행: 빠진 페이지만 다시 요청
+        ListingHandler.FAIL = None
+        ListingHandler.requests = []
+        links = get_all_post_links(base, workers=4, state=state, client=FetchClient(retries=0),
+                                   limiter=AdaptiveRateLimiter(0))
+        assert len(links) == 37 * 3
+        assert ListingHandler.requests == [3]
+        assert state.page_links() == {}
+    finally:
+        ListingHandler.FAIL = None
+        state.close()
+        server.shutdown()
+
+
+def new_links(base, known, max_pages=None, workers=2):
+    return get_new_post_links(base, known, max_pages, workers, client=FetchClient(retries=0),
+                              limiter=AdaptiveRateLimiter(0))
+
+
+def test_new_links_stop_at_known_page():
+    server, base = start_server()
+    try:
+        known = [f"/wp/?p={page * 10 + i}" for page in range(3, 38) for i in range(3)]
+        links = new_links(base, known)
+        assert links == [f"/wp/?p={page * 10 + i}" for page in (1, 2) for i in range(3)]
+        # 워커 2개: 1 ~ 2, 3 ~ 4페이지를 묶어 요청하고 3페이지(모두 아는 글)에서 멈춤
+        assert sorted(ListingHandler.requests) == [1, 2, 3, 4]
+
+        # 아는 글이 섞인 페이지는 새 글만 넘기고 계속
+        ListingHandler.requests = []
+        links = new_links(base, known + ["/wp/?p=20"])
+        assert [link.rpartition('=')[2] for link in links] == ['10', '11', '12', '21', '22']
+    finally:
+        server.shutdown()
+
+
+def test_new_links_stop_at_error_and_end(capsys):
+    server, base = start_server()
+    try:
+        # 5xx: 어디까지 새 글인지 알 수 없으므로 앞 페이지까지만
+        ListingHandler.FAIL = 2
+        assert len(new_links(base, [])) == 3
+        assert "페이지 2 접근 실패 (status: 500)" in capsys.readouterr().out
+
+        # max_pages가 없으면 마지막 페이지 뒤의 404까지
+        ListingHandler.FAIL = None
+        assert len(new_links(base, [], workers=4)) == 37 * 3
+        assert "페이지 38 없음 (status: 404)" in capsys.readouterr().out
+    finally:
+        ListingHandler.FAIL = None
+        server.shutdown()
+
+
+def test_new_links_respect_max_pages():
+    server, base = start_server()
+    try:
+        links = new_links(base, [], max_pages=5)
+        assert len(links) == 5 * 3
+        assert sorted(ListingHandler.requests) == [1, 2, 3, 4, 5], "마지막 묶음은 max_pages에서 자름"
+    finally:
+        server.shutdown()
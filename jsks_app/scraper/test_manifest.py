@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+출력 매니페스트 테스트 - 제목이 같은 글 / 빈 제목 / 글 데이터 경로 / 바뀌지 않은 글 건너뛰기 /
+제목 변경 / 템플릿 버전 / --dry-run 집계 / 템플릿 지문
+(testdata/posts/17762.json 사용, dhamma.kr에 접속하지 않음)
+"""
+
+import json
+import os
+
+from dhamma.manifest import CONTENT, FILENAME, MISSING, NEW, TEMPLATE
+from dhamma.outputs import PdfOutput, TextOutput, plan_changes
+from dhamma.records import post_record_path
+from dhamma.render_engine import template_fingerprint
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+
+def sutta():
+    with open(os.path.join(TESTDATA_DIR, '17762.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def files(directory):
+    return sorted(name for name in os.listdir(directory) if not name.startswith(FILENAME))
+
+
+def test_same_title_does_not_overwrite(tmp_path):
+    original = sutta()
+    title = "아주 긴 제목 " * 10
+    first = dict(original, title=title + "1")
+    second = dict(original, url="http://www.dhamma.kr/wp/?p=17763", title=title + "2", content="다른 본문")
+    directory = str(tmp_path)
+    with TextOutput(directory) as output:
+        paths = [output.write(first), output.write(second)]
+    assert paths[0] != paths[1], "앞 50자가 같은 제목"
+    assert files(directory) == sorted(os.path.basename(path) for path in paths)
+    assert paths[0].endswith(" (17762).txt") and paths[1].endswith(" (17763).txt")
+
+
+def test_empty_title_uses_id(tmp_path):
+    directory = str(tmp_path)
+    with TextOutput(directory) as output:
+        assert os.path.basename(output.write(dict(sutta(), title=""))) == "17762.txt"
+        assert os.path.basename(output.write(dict(sutta(), title="???"))) == "17762.txt"
+
+
+def test_record_path_follows_url_not_title(tmp_path):
+    about = dict(sutta(), url="http://www.dhamma.kr/wp/about/", title="소개")
+    path = post_record_path(about, tmp_path)
+    assert path == post_record_path(dict(about, title="바뀐 소개"), tmp_path), "제목이 바뀌어도 같은 파일"
+    assert path == post_record_path(dict(about, url="https://dhamma.kr/wp/about"), tmp_path), "정규화 URL"
+    assert path != post_record_path(dict(about, url="http://www.dhamma.kr/wp/contact/"), tmp_path), \
+        "제목이 같은 다른 글"
+    assert post_record_path(sutta(), tmp_path) == os.path.join(tmp_path, "17762.json")
+
+
+def test_rerun_skips_unchanged(tmp_path):
+    post_data = sutta()
+    directory = str(tmp_path)
+    with TextOutput(directory) as output:
+        filepath = output.write(post_data)
+    os.utime(filepath, (0, 0))
+
+    with TextOutput(directory) as output:
+        assert output.write(post_data) == filepath
+        assert output.unchanged == 1
+    assert os.stat(filepath).st_mtime == 0, "바뀌지 않은 글은 다시 쓰지 않음"
+
+    with TextOutput(directory) as output:
+        output.write(dict(post_data, content=post_data['content'] + "\n\n덧붙인 문단"))
+        assert output.unchanged == 0
+    with open(filepath, encoding='utf-8') as f:
+        assert f.read().endswith("덧붙인 문단")
+
+
+def test_deleted_file_is_written_again(tmp_path):
+    post_data = sutta()
+    directory = str(tmp_path)
+    with TextOutput(directory) as output:
+        filepath = output.write(post_data)
+    os.remove(filepath)
+    with TextOutput(directory) as output:
+        assert output.write(post_data) == filepath
+        assert output.unchanged == 0
+    assert os.path.exists(filepath)
+
+
+def test_title_change_removes_old_file(tmp_path):
+    post_data = sutta()
+    directory = str(tmp_path)
+    with TextOutput(directory) as output:
+        old_path = output.write(post_data)
+    with TextOutput(directory) as output:
+        new_path = output.write(dict(post_data, title="잡아함 133. 생사유전경 (개정)"))
+    assert new_path != old_path
+    assert files(directory) == [os.path.basename(new_path)]
+
+
+def test_template_version_change_rewrites(tmp_path):
+    post_data = sutta()
+    directory = str(tmp_path)
+    with TextOutput(directory) as output:
+        output.write(post_data)
+
+    class NewTemplate(TextOutput):
+        template_version = '2'
+
+    with NewTemplate(directory) as output:
+        output.write(post_data)
+        assert output.unchanged == 0
+    with NewTemplate(directory) as output:
+        output.write(post_data)
+        assert output.unchanged == 1
+
+
+def test_legacy_text_file_is_replaced(tmp_path):
+    post_data = sutta()
+    other = dict(post_data, url="http://www.dhamma.kr/wp/?p=1")
+    directory = str(tmp_path)
+    legacy = os.path.join(directory, "잡아함 133 생사유전경.txt")
+    with TextOutput(directory) as output:
+        # 예전 파일명이 같아도 다른 글의 파일은 그대로
+        with open(legacy, 'w', encoding='utf-8') as f:
+            f.write(f"제목: {other['title']}\nURL: {other['url']}\n")
+        output.write(post_data)
+        assert os.path.exists(legacy)
+
+        with open(legacy, 'w', encoding='utf-8') as f:
+            f.write(f"제목: {post_data['title']}\nURL: {post_data['url']}\n")
+        output.write(dict(post_data, content="바뀐 본문"))
+        assert not os.path.exists(legacy)
+
+
+def test_pdf_skips_current_posts_without_rendering(tmp_path):
+    post_data = sutta()
+    directory = str(tmp_path)
+    with PdfOutput(directory) as output:
+        filepath = output.path(post_data)
+        with open(filepath, 'wb') as f:
+            f.write(b'%PDF-1.7')
+        output.record(post_data, filepath)
+
+    with PdfOutput(directory) as output:
+        assert list(output.write_all([post_data])) == [(post_data, filepath)]
+        assert output.unchanged == 1
+        assert output.engine.latencies == [] and output.engine.failed == 0
+
+
+def test_plan_counts_changes(tmp_path):
+    original = sutta()
+    posts = [dict(original, url=f"http://www.dhamma.kr/wp/?p={i}", title=f"글 {i}") for i in range(4)]
+    directory = str(tmp_path)
+    with TextOutput(directory) as output:
+        paths = [output.write(post_data) for post_data in posts[:3]]
+    os.remove(paths[1])
+    posts[2] = dict(posts[2], content="바뀐 본문")
+
+    changes, total, seconds = plan_changes(TextOutput, directory, posts)
+    assert (changes, total) == ({MISSING: 1, CONTENT: 1, NEW: 1}, 4)
+    assert seconds is not None, "지난 실행의 문서당 저장 시간"
+
+    class NewTemplate(TextOutput):
+        template_version = '2'
+
+    changes, total, _ = plan_changes(NewTemplate, directory, posts[:1])
+    assert changes == {TEMPLATE: 1}
+
+    empty = os.path.join(tmp_path, 'empty', 'texts')
+    assert plan_changes(TextOutput, empty, posts) == ({NEW: 4}, 4, None)
+    assert not os.path.exists(empty), "--dry-run은 폴더를 만들지 않음"
+
+
+def test_template_fingerprint_follows_font(tmp_path):
+    directory = str(tmp_path)
+    font = os.path.join(directory, 'font.ttf')
+    with open(font, 'wb') as f:
+        f.write(b'font v1')
+    first = template_fingerprint(font)
+    assert template_fingerprint(font) == first
+    with open(font, 'wb') as f:
+        f.write(b'font v2')
+    assert template_fingerprint(font) != first
+    assert template_fingerprint(os.path.join(directory, 'missing.ttf')) != first
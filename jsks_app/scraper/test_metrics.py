@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+크롤링 지표 테스트 - 히스토그램 / 오류 분류 / 파이프라인 스팬 / JSON lines / Prometheus 엔드포인트
+(로컬 가짜 서버만 사용, dhamma.kr에 접속하지 않음)
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import json
+import os
+import threading
+import urllib.request
+
+import requests
+
+from dhamma.http_client import FetchClient
+from dhamma.metrics import Histogram, Metrics, error_kind
+from dhamma.pipeline import SKIPPED, Pipeline, Stage, item_url
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """/missing은 404, 나머지는 본문 1000바이트"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        status, body = (404, b'gone') if self.path == '/missing' else (200, b'x' * 1000)
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def counter(metrics, name, **labels):
+    return metrics.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+
+def test_histogram_buckets():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float('inf'), 4)], "상한 이하(le) 누적"
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.count == 4 and abs(histogram.sum - 3.65) < 1e-9
+
+
+def test_error_kind():
+    response = requests.Response()
+    response.status_code = 503
+    assert error_kind(requests.HTTPError(response=response)) == 'http_503'
+    assert error_kind(requests.ConnectTimeout()) == 'timeout'
+    assert error_kind(requests.ConnectionError()) == 'connection'
+    assert error_kind(FileNotFoundError()) == 'io'
+    assert error_kind(ValueError()) == 'valueerror'
+
+
+def test_client_counts_bytes_and_statuses():
+    server, base = start_server()
+    metrics = Metrics()
+    client = FetchClient(retries=0, metrics=metrics)
+    try:
+        client.get_content(f"{base}/a")
+        client.get_content(f"{base}/b")
+        try:
+            client.get_content(f"{base}/missing")
+        except requests.HTTPError:
+            pass
+    finally:
+        server.shutdown()
+
+    assert counter(metrics, 'http_bytes_total') == 2004
+    assert counter(metrics, 'http_responses_total', status='200') == 2
+    assert counter(metrics, 'http_responses_total', status='404') == 1
+    assert metrics.histograms[('http_request_seconds', ())].count == 3
+
+
+def test_stats_keep_stage_and_request_errors_apart(capsys):
+    metrics = Metrics()
+    metrics.span('fetch', 0.5, 'failed')
+    metrics.error('fetch', 'timeout')
+    # 같은 실패의 시도 3번 (재시도 2번)
+    metrics.inc('http_errors_total', 3, kind='timeout')
+    metrics.print_stats()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert "   오류 분류: timeout 1" in lines, "스테이지 실패는 항목당 1번"
+    assert "   요청 오류 (재시도 포함): timeout 3" in lines
+
+
+def test_pipeline_spans_and_jsonl(tmp_path):
+    def fetch(url):
+        if url.endswith('404'):
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError(response=response)
+        return url, '<html>'
+
+    def parse(item):
+        url, _ = item
+        if url.endswith('skip'):
+            return SKIPPED
+        return {'url': url} if not url.endswith('empty') else None
+
+    path = os.path.join(tmp_path, 'logs', 'metrics.jsonl')
+    with Metrics(path) as metrics:
+        pipeline = Pipeline([Stage('fetch', fetch, 2), Stage('parse', parse)], metrics=metrics,
+                            trace_key=item_url)
+        pipeline.run(['/ok', '/404', '/empty', '/skip'])
+
+        assert counter(metrics, 'stage_items_total', stage='fetch', outcome='ok') == 3
+        assert counter(metrics, 'stage_errors_total', stage='fetch', kind='http_404') == 1
+        assert counter(metrics, 'stage_errors_total', stage='parse', kind='no_result') == 1
+        assert counter(metrics, 'stage_items_total', stage='parse', outcome='skipped') == 1
+
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+
+    spans = [r for r in records if r['type'] == 'span']
+    assert len(spans) == 7, "fetch 4 + parse 3"
+    failed = [r for r in spans if r['outcome'] == 'failed']
+    assert {(r['stage'], r['url'], r['error']) for r in failed} == {('fetch', '/404', 'http_404'),
+                                                                   ('parse', '/empty', 'no_result')}
+    snapshot = records[-1]
+    assert snapshot['type'] == 'snapshot', "닫을 때 마지막 스냅숏"
+    depths = {g['labels']['stage']: g['value'] for g in snapshot['gauges'] if g['name'] == 'queue_depth'}
+    assert depths == {'fetch': 0, 'parse': 0}
+    assert any(h['name'] == 'stage_seconds' and h['count'] == 4 for h in snapshot['histograms'])
+
+
+def test_prometheus_endpoint():
+    with Metrics(port=0) as metrics:
+        metrics.inc('http_bytes_total', 1234)
+        metrics.observe('stage_seconds', 0.3, stage='write')
+        metrics.add_collector(lambda m: m.set('rate_limit_rps', 2.5, limiter='post'))
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{metrics.port}/metrics") as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            text = response.read().decode('utf-8')
+
+    lines = text.splitlines()
+    assert '# TYPE dhamma_http_bytes_total counter' in lines
+    assert 'dhamma_http_bytes_total 1234' in lines
+    assert 'dhamma_rate_limit_rps{limiter="post"} 2.5' in lines
+    assert 'dhamma_stage_seconds_bucket{stage="write",le="0.25"} 0' in lines
+    assert 'dhamma_stage_seconds_bucket{stage="write",le="0.5"} 1' in lines
+    assert 'dhamma_stage_seconds_bucket{stage="write",le="+Inf"} 1' in lines
+    assert 'dhamma_stage_seconds_count{stage="write"} 1' in lines
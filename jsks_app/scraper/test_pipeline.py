@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+스테이지 파이프라인 테스트 - 느린 뒤 스테이지에서 앞 스테이지가 큐 크기만큼만 앞서 가는지 (backpressure),
+실패한 항목은 집계만 하고 파이프라인은 계속 도는지
+"""
+
+import threading
+import time
+
+from dhamma.pipeline import Pipeline, Stage
+
+QUEUE_SIZE = 2
+
+
+def run_in_thread(pipeline, items):
+    """파이프라인을 별도 스레드로 실행 → (스레드, 결과 리스트)"""
+    results = []
+    thread = threading.Thread(target=pipeline.run, args=(items, results.append), daemon=True)
+    thread.start()
+    return thread, results
+
+
+def test_slow_stage_blocks_upstream():
+    gate = threading.Event()
+
+    def slow(item):
+        gate.wait()
+        return item
+
+    fast = Stage('fast', lambda item: item)
+    pipeline = Pipeline([fast, Stage('slow', slow)], queue_size=QUEUE_SIZE)
+    thread, results = run_in_thread(pipeline, range(50))
+    try:
+        time.sleep(0.3)
+        # 느린 스테이지가 1개를 붙잡고, 사이 큐에 QUEUE_SIZE개, 앞 스테이지가 1개를 넣으려고 대기
+        assert fast.processed <= QUEUE_SIZE + 2, f"앞 스테이지가 {fast.processed}개나 처리함"
+        assert pipeline.queue_depths()['fast'] == QUEUE_SIZE, "입력 큐도 가득 찬 채 멈춤"
+    finally:
+        gate.set()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert results == list(range(50))
+    assert fast.processed == 50
+
+
+def test_failures_are_counted_and_pipeline_continues():
+    def check(item):
+        if item % 5 == 0:
+            raise ValueError(f"깨진 항목 {item}")
+        if item == 7:
+            return None
+        return item
+
+    def slow_double(item):
+        time.sleep(0.001)
+        return item * 2
+
+    first = Stage('check', check, workers=2)
+    second = Stage('double', slow_double, workers=2)
+    pipeline = Pipeline([first, second], queue_size=QUEUE_SIZE)
+    thread, results = run_in_thread(pipeline, range(40))
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    failed = {item for item in range(40) if item % 5 == 0 or item == 7}
+    assert first.failed == len(failed), "예외 / None 모두 실패로 집계"
+    assert first.processed == 40 - len(failed)
+    assert second.processed == 40 - len(failed) and second.failed == 0
+    assert sorted(results) == [item * 2 for item in range(40) if item not in failed]
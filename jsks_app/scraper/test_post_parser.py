@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+글 파서 골든 파일 테스트 - 저장해 둔 글 HTML(testdata/posts/*.html)을 모든 백엔드로 파싱해
+기준 결과(*.json)와 한 글자도 다르지 않은지 확인 (dhamma.kr에 접속하지 않음)
+
+    python3 -m pytest test_post_parser.py  # 테스트
+    python3 test_post_parser.py --update   # 기준 결과를 html.parser 백엔드로 다시 생성
+"""
+
+import glob
+import json
+import os
+import sys
+
+from dhamma.post_parser import available_backends, parse_post
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+# 기준 결과를 만드는 백엔드
+REFERENCE_BACKEND = 'html.parser'
+
+
+def saved_pages():
+    """(글 URL, HTML bytes, 기준 결과 경로) 목록"""
+    pages = []
+    for html_path in sorted(glob.glob(os.path.join(TESTDATA_DIR, '*.html'))):
+        name = os.path.splitext(os.path.basename(html_path))[0]
+        with open(html_path, 'rb') as f:
+            content = f.read()
+        pages.append((f"http://www.dhamma.kr/wp/?p={name}", content, os.path.join(TESTDATA_DIR, f"{name}.json")))
+    return pages
+
+
+def load_golden(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_backend(backend):
+    for url, content, golden_path in saved_pages():
+        expected = load_golden(golden_path)
+        actual = parse_post(url, content, backend)
+        for key in expected:
+            assert actual[key] == expected[key], f"[{backend}] {os.path.basename(golden_path)} '{key}' 불일치"
+        assert set(actual) == set(expected), f"[{backend}] 글 데이터 키 불일치: {sorted(actual)}"
+
+
+def test_saved_pages_exist():
+    assert len(saved_pages()) >= 3
+
+
+def test_html_parser_matches_golden():
+    check_backend('html.parser')
+
+
+def test_strainer_matches_golden():
+    check_backend('strainer')
+
+
+def test_lxml_matches_golden():
+    if 'lxml' not in available_backends():
+        return  # lxml 미설치
+    check_backend('lxml')
+
+
+def test_default_backend_matches_golden():
+    check_backend(None)
+
+
+def test_unknown_backend_rejected():
+    try:
+        parse_post("http://www.dhamma.kr/wp/?p=1", b"", 'html5lib')
+    except ValueError:
+        return
+    raise AssertionError("알 수 없는 백엔드는 ValueError")
+
+
+def update_golden():
+    for url, content, golden_path in saved_pages():
+        with open(golden_path, 'w', encoding='utf-8') as f:
+            json.dump(parse_post(url, content, REFERENCE_BACKEND), f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"✅ {os.path.basename(golden_path)}")
+
+
+if __name__ == "__main__":
+    # 테스트는 pytest로 실행 (python3 -m pytest test_post_parser.py)
+    if '--update' not in sys.argv:
+        sys.exit("기준 결과를 다시 만들려면: python3 test_post_parser.py --update")
+    print(f"♻️  기준 결과 다시 생성 ({REFERENCE_BACKEND})\n")
+    update_golden()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+요청 속도 조절기 테스트 - 빠른 응답이면 올림 / 429·5xx·느려짐이면 내림 / Retry-After / 고정 속도
+(로컬 가짜 서버만 사용, dhamma.kr에 접속하지 않음)
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import threading
+import time
+
+import requests
+
+from dhamma.http_client import FetchClient
+from dhamma.rate_control import AdaptiveRateLimiter
+
+
+class OverloadedHandler(BaseHTTPRequestHandler):
+    """/busy는 항상 429 (Retry-After: 1), /broken은 항상 500, /flaky는 503 두 번 뒤 200, 나머지는 200"""
+
+    flaky = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/busy':
+            return self.reply(429, b'slow down', {'Retry-After': '1'})
+        if self.path == '/broken':
+            return self.reply(500, b'broken')
+        if self.path == '/flaky':
+            OverloadedHandler.flaky += 1
+            if OverloadedHandler.flaky <= 2:
+                return self.reply(503, b'busy')
+        self.reply(200, b'ok')
+
+    def reply(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OverloadedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_fast_responses_increase_rate():
+    limiter = AdaptiveRateLimiter(2.0, max_rps=3.0, step=0.5, increase_every=5)
+    for _ in range(50):
+        limiter.observe(0.05)
+    assert limiter.rate == 3.0, "max_rps까지만"
+    assert set(limiter.percentiles()) == {'p50', 'p95', 'p99'}
+    assert "초당 3.00회" in limiter.status()
+
+
+def test_errors_halve_rate_once_per_cooldown():
+    limiter = AdaptiveRateLimiter(4.0, min_rps=0.5, cooldown=60)
+    limiter.observe(0.1, 503)
+    limiter.observe(0.1, 429)
+    limiter.observe(0.1, None)
+    assert limiter.rate == 2.0, "같은 순간의 실패 여러 개로 연달아 줄이지 않음"
+    assert limiter.errors == 3 and limiter.backoffs == 1
+
+    limiter = AdaptiveRateLimiter(4.0, min_rps=0.5, cooldown=0)
+    for _ in range(10):
+        limiter.observe(0.1, 500)
+    assert limiter.rate == 0.5, "min_rps 아래로는 내리지 않음"
+    limiter.observe(0.1, 404)
+    assert limiter.errors == 10, "404는 서버 과부하가 아님"
+
+
+def test_slowdown_reduces_rate():
+    limiter = AdaptiveRateLimiter(4.0, cooldown=0)
+    for _ in range(20):
+        limiter.observe(0.1)
+    rate = limiter.rate
+    for _ in range(5):
+        limiter.observe(2.0)
+    assert limiter.slowdowns > 0
+    assert limiter.rate < rate
+
+
+def test_baseline_follows_lasting_slowdown():
+    limiter = AdaptiveRateLimiter(4.0, cooldown=0)
+    for _ in range(50):
+        limiter.observe(0.1)
+    for _ in range(200):
+        limiter.observe(1.0)
+    assert limiter.slowdowns > 0
+    lowest = limiter.rate
+
+    # 서버가 계속 느린 채로 안정되면 기준이 올라가 다시 가산 증가
+    for _ in range(100):
+        limiter.observe(1.0)
+    assert limiter.rate > lowest, "느려진 서버를 기준으로 다시 속도를 올림"
+
+
+def test_call_retries_overload_within_budget():
+    server, base = start_server()
+    OverloadedHandler.flaky = 0
+    client = FetchClient(retries=0)
+    limiter = AdaptiveRateLimiter(50.0, cooldown=0, retries=3, backoff=0.01)
+    try:
+        assert limiter.call(client.get_content, f"{base}/flaky") == b'ok'
+        assert limiter.requests == 3 and limiter.errors == 2 and limiter.retried == 2, "매 시도를 조절기가 봄"
+        assert limiter.rate < 50.0, "중간의 503에도 감속"
+
+        try:
+            limiter.call(client.get_content, f"{base}/broken")
+            assert False, "재시도 후에도 500이면 HTTPError"
+        except requests.HTTPError:
+            pass
+        assert limiter.requests == 7
+    finally:
+        server.shutdown()
+
+
+def test_call_observes_status_and_retry_after():
+    server, base = start_server()
+    client = FetchClient(retries=0)
+    limiter = AdaptiveRateLimiter(50.0, cooldown=0)
+
+    assert limiter.call(client.get, f"{base}/busy").status_code == 429
+    assert limiter.rate == 25.0
+    started = time.monotonic()
+    assert limiter.call(client.get, f"{base}/ok").status_code == 200
+    assert time.monotonic() - started >= 0.9, "Retry-After 동안은 새 요청을 보내지 않음"
+
+    try:
+        limiter.call(client.get_content, f"{base}/broken")
+        assert False, "500이면 HTTPError"
+    except requests.HTTPError:
+        pass
+    assert limiter.errors == 2 and limiter.requests == 3
+    server.shutdown()
+
+
+def test_fixed_rate_does_not_adapt():
+    limiter = AdaptiveRateLimiter(2.0, min_rps=2.0, max_rps=2.0, cooldown=0)
+    for _ in range(30):
+        limiter.observe(0.05)
+    limiter.observe(0.05, 503)
+    assert limiter.rate == 2.0
+
+    unlimited = AdaptiveRateLimiter(0)
+    started = time.monotonic()
+    for _ in range(100):
+        unlimited.wait()
+    assert time.monotonic() - started < 0.5
+    assert unlimited.status() == "제한 없음"
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+렌더링 엔진 테스트 - 흘려 쓴 HTML 문서 / 임시 HTML 정리
+(testdata/posts/17762.json 사용, WeasyPrint를 불러올 수 없으면 렌더링 테스트는 건너뜀)
+"""
+
+import io
+import json
+import os
+
+import pytest
+
+from dhamma.render_engine import RenderEngine, build_html, write_html
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+
+def sutta():
+    with open(os.path.join(TESTDATA_DIR, '17762.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_streamed_document_matches_template():
+    post_data = sutta()
+    f = io.StringIO()
+    write_html(f, post_data)
+    assert f.getvalue() == build_html(post_data)
+
+
+def test_meta_is_escaped():
+    post_data = dict(sutta(), title="<계경> & 주석", date='2024-01-01 "수정"',
+                     url="http://www.dhamma.kr/wp/?p=17762&replytocom=5")
+    f = io.StringIO()
+    write_html(f, post_data)
+    document = f.getvalue()
+    assert document == build_html(post_data)
+    assert "<title>&lt;계경&gt; &amp; 주석</title>" in document
+    assert "&quot;수정&quot;" in document and "?p=17762&amp;replytocom=5" in document
+    assert "<계경>" not in document
+    assert post_data['content_html'] in document, "본문 HTML은 그대로"
+
+
+def weasyprint_loads():
+    """WeasyPrint와 시스템 라이브러리(Pango 등)를 불러올 수 있는지"""
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+@pytest.mark.skipif(not weasyprint_loads(), reason="WeasyPrint를 불러올 수 없음")
+def test_renders_post(tmp_path):
+    post_data = sutta()
+    with RenderEngine(str(tmp_path), workers=1, max_tasks=1) as engine:
+        filepath = engine.render(post_data)
+        assert filepath == engine.path(post_data)
+        assert engine.failed == 0
+    with open(filepath, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+
+
+def test_spooled_html_is_removed(tmp_path):
+    # 렌더링 성공 여부와 상관없이 임시 HTML은 지워야 함
+    post_data = sutta()
+    with RenderEngine(str(tmp_path), workers=1, max_tasks=1) as engine:
+        spool_dir = engine._spool_dir
+        engine.render(post_data)
+        assert os.listdir(spool_dir) == [], "렌더링이 끝난 HTML은 지움"
+    assert not os.path.exists(spool_dir)
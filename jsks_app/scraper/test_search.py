@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+전문 검색 색인 테스트 - 2글자 토큰 / 구 / AND·OR·제외 / 증분 색인 / 세그먼트 합치기
+(testdata/posts/*.json 기준 결과 사용, dhamma.kr에 접속하지 않음)
+"""
+
+import glob
+import json
+import os
+
+from dhamma import search as search_module
+from dhamma.outputs import SearchOutput, save_as_text
+from dhamma.search import SearchIndex, decode_positions, parse_query, position_bytes, tokenize
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+
+def make_post(number, title, content):
+    return {'url': f"http://www.dhamma.kr/wp/?p={number}", 'title': title, 'date': '', 'content': content,
+            'content_html': ''}
+
+
+SMALL_POSTS = [
+    make_post(1, "자비경", "자비로운 마음을 닦으라. 자비는 분노를 없앤다."),
+    make_post(2, "연민", "연민하는 마음으로 중생을 보라."),
+    make_post(3, "분노", "분노하는 마음은 괴로움을 부른다. 자비 없이는 평화도 없다."),
+    make_post(4, "법구경", "법구경 한 구절: 마음이 모든 것의 근본이다."),
+]
+
+
+def new_index(directory):
+    return SearchIndex(os.path.join(directory, 'index.db'))
+
+
+def titles(index, query):
+    return [hit.title for hit in index.search(query)]
+
+
+def test_bigram_tokens():
+    assert tokenize("법구경 법") == {'법구': [0], '구경': [1], '경': [2], '법': [4]}
+    assert tokenize("가가가") == {'가가': [0, 1], '가': [2]}
+    assert decode_positions(position_bytes([3, 200, 70000])) == [3, 200, 70000]
+
+
+def test_parse_query():
+    clauses = parse_query('자비 "자비로운 마음" -분노 OR 연민')
+    assert len(clauses) == 2
+    must, must_not = clauses[0]
+    assert len(must) == 2 and len(must_not) == 1
+    assert parse_query('OR') == []
+
+
+def test_boolean_and_phrase(tmp_path):
+    with new_index(tmp_path) as index:
+        for post_data in SMALL_POSTS:
+            index.add(post_data['url'], post_data)
+
+        assert sorted(titles(index, "자비")) == ["분노", "자비경"]
+        assert titles(index, "자비 -분노") == []
+        assert titles(index, "자비 평화") == ["분노"]
+        assert sorted(titles(index, "연민 OR 법구경")) == ["법구경", "연민"]
+        assert titles(index, '"자비로운 마음"') == ["자비경"]
+        assert titles(index, '"마음 자비로운"') == []
+        # 마지막 단어는 앞부분만 맞아도 됨, 한 글자 검색
+        assert titles(index, "법구") == ["법구경"]
+        assert len(titles(index, "마")) == 4
+        assert titles(index, "열반") == []
+
+
+def test_ranking_prefers_more_matches(tmp_path):
+    with new_index(tmp_path) as index:
+        index.add("a", make_post(10, "가", "보시 이야기. " + "다른 이야기. " * 20))
+        index.add("b", make_post(11, "나", "보시 보시 보시 이야기."))
+        index.add("c", make_post(12, "다", "아무 관계 없는 글."))
+        assert titles(index, "보시") == ["나", "가"]
+
+
+def test_incremental_text_files(tmp_path):
+    texts_dir = os.path.join(tmp_path, 'texts')
+    os.makedirs(texts_dir)
+    paths = [save_as_text(post_data, texts_dir) for post_data in SMALL_POSTS]
+    index_path = os.path.join(tmp_path, 'index.db')
+
+    with SearchIndex(index_path) as index:
+        assert index.index_text_files(texts_dir) == len(SMALL_POSTS)
+    with SearchIndex(index_path) as index:
+        assert index.index_text_files(texts_dir) == 0, "바뀌지 않은 파일은 건너뜀"
+        hit = index.search("연민")[0]
+        assert hit.url == SMALL_POSTS[1]['url'] and "연민하는" in hit.snippet()
+
+    save_as_text(dict(SMALL_POSTS[1], content="이제는 보시에 대한 글."), texts_dir)
+    os.utime(paths[1], ns=(1, 1))
+    os.remove(paths[3])
+    with SearchIndex(index_path) as index:
+        assert index.index_text_files(texts_dir) == 1
+        assert titles(index, "연민하는") == []
+        assert titles(index, "보시") == ["연민"]
+        assert titles(index, "법구경") == []
+        assert len(index) == 3
+
+
+def test_compact_keeps_results(tmp_path):
+    saved_limit, saved_flush = search_module.MAX_SEGMENTS, search_module.FLUSH_DOCS
+    search_module.MAX_SEGMENTS, search_module.FLUSH_DOCS = 3, 1
+    try:
+        with new_index(tmp_path) as index:
+            for post_data in SMALL_POSTS:
+                index.add(post_data['url'], post_data)
+            index.add(SMALL_POSTS[0]['url'], dict(SMALL_POSTS[0], content="자비 없는 글은 아님"))
+            index.flush()
+            segments = index.conn.execute("SELECT COUNT(DISTINCT segment) FROM postings").fetchone()[0]
+            assert segments <= 3
+            assert sorted(titles(index, "자비")) == ["분노", "자비경"]
+            assert titles(index, "자비로운") == []
+
+            index.compact()
+            assert index.conn.execute("SELECT COUNT(DISTINCT segment) FROM postings").fetchone()[0] == 1
+            assert sorted(titles(index, "자비")) == ["분노", "자비경"]
+            assert titles(index, '"연민하는 마음"') == ["연민"]
+    finally:
+        search_module.MAX_SEGMENTS, search_module.FLUSH_DOCS = saved_limit, saved_flush
+
+
+def test_output_plugin_with_saved_posts(tmp_path):
+    directory = str(tmp_path)
+    posts = []
+    for path in sorted(glob.glob(os.path.join(TESTDATA_DIR, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            posts.append(json.load(f))
+
+    with SearchOutput(directory) as output:
+        for post_data in posts:
+            assert output.write(post_data)
+    with SearchOutput(directory) as output:
+        for post_data in posts:
+            output.write(post_data)
+        assert output.index.added == 0 and output.index.unchanged == len(posts)
+
+        hits = output.index.search('"이와 같이 내가 들었다"')
+        assert hits and all(post_data['url'] for post_data in posts)
+        assert output.index.search("생사유전경")[0].title == "잡아함 133. 생사유전경"
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+묶음(권) PDF 테스트 - 시리즈 나누기 / 번호 순 묶음 HTML / 바뀐 묶음만 다시 렌더링
+(WeasyPrint 없이 HTML과 매니페스트만 확인, dhamma.kr에 접속하지 않음)
+"""
+
+import json
+import os
+
+from dhamma.volumes import OTHER, OUTPUT_NAME, VolumeBuilder, series_key
+
+TESTDATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'posts')
+
+
+def sutta():
+    with open(os.path.join(TESTDATA_DIR, '17762.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def numbered(title, number):
+    return dict(sutta(), url=f"http://www.dhamma.kr/wp/?p={number}", title=title)
+
+
+def test_series_key():
+    assert series_key("잡아함 133. 생사유전경") == ("잡아함", 133)
+    assert series_key("잡아함3. 무지경 1") == ("잡아함", 3)
+    assert series_key("오늘의 법구 2684") == ("오늘의 법구", 2684)
+    assert series_key("제목 없음") == (OTHER, None)
+
+
+def test_volume_html_in_series_order(tmp_path):
+    directory = str(tmp_path)
+    with VolumeBuilder(directory) as builder:
+        builder.add(numbered("잡아함 133. 생사유전경", 17762))
+        builder.add(numbered("오늘의 법구 2684", 16941))
+        builder.add(numbered("잡아함 2. 정사유경 <재게시>", 100))
+        builder.add(numbered("잡아함 10. 염리경", 50))
+        assert builder.series() == {"오늘의 법구": 1, "잡아함": 3}
+
+        html_path = builder.write_html("잡아함", os.path.join(directory, 'volume.html'))
+        with open(html_path, encoding='utf-8') as f:
+            html = f.read()
+        spool_dir = builder._spool_dir
+        assert os.path.dirname(spool_dir) == directory, "임시 파일은 저장 폴더 아래"
+    assert not os.path.exists(spool_dir)
+    titles = [line.strip()[4:-5] for line in html.splitlines() if line.strip().startswith('<h1>')]
+    assert titles == ["잡아함 2. 정사유경 &lt;재게시&gt;", "잡아함 10. 염리경", "잡아함 133. 생사유전경"]
+    assert html.count('<section class="post">') == 3
+    assert html.count("이와 같이 내가 들었다") == 3, "본문 HTML은 그대로"
+
+
+def test_unchanged_volume_is_not_rendered(tmp_path):
+    directory = str(tmp_path)
+    posts = [numbered("잡아함 1 무상경", 1), numbered("잡아함 2. 정사유경", 2)]
+    with VolumeBuilder(directory) as builder:
+        for post_data in posts:
+            builder.add(post_data)
+        digest = builder.digest("잡아함")
+        filepath = builder.path("잡아함")
+        with open(filepath, 'wb') as f:
+            f.write(b'%PDF-1.7')
+        builder.manifest.record(OUTPUT_NAME, "잡아함", "잡아함", filepath, digest, builder.template)
+
+    with VolumeBuilder(directory) as builder:
+        for post_data in posts:
+            builder.add(post_data)
+        assert list(builder.build()) == [("잡아함", filepath, 2, False)]
+        assert builder.unchanged == 1
+
+        # 글 1개가 바뀌면 묶음 해시도 바뀜
+        builder.add(dict(posts[1], content="바뀐 본문"))
+        assert builder.digest("잡아함") != digest
+        assert builder.series() == {"잡아함": 2}, "같은 글은 마지막 내용만"